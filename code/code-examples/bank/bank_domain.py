@@ -1,4 +1,7 @@
-import re
+import math
+from decimal import Decimal
+
+from bank_validation import account_error, dni_error, iban_error
 
 
 class InsufficientFundsError(Exception):
@@ -8,9 +11,37 @@ class InsufficientFundsError(Exception):
 
 # Function to validate Spanish DNI
 def validate_dni(dni: str) -> bool:
-    """Validate a Spanish DNI (8 digits followed by a letter)."""
-    pattern = r'^[0-9]{8}[A-Z]$'
-    return bool(re.match(pattern, dni))
+    """Validate a Spanish DNI (8 digits and the matching check letter)."""
+    return dni_error(dni) is None
+
+
+def to_cents(amount) -> int:
+    """
+    Convert an amount of money to an exact number of cents.
+
+    Floats are read by their shortest decimal representation, so 0.1
+    becomes 10 cents exactly. Amounts with fractions of a cent are
+    rejected rather than rounded.
+    """
+    if isinstance(amount, bool):
+        raise ValueError("Amount must be a number.")
+    if isinstance(amount, int):
+        return amount * 100
+    if isinstance(amount, float):
+        if math.isfinite(amount):
+            # Fast path: exact whenever the amount is a whole number of cents
+            cents = round(amount * 100)
+            if cents / 100 == amount and abs(cents) < 2**53:
+                return cents
+        amount = Decimal(repr(amount))
+    elif not isinstance(amount, Decimal):
+        raise ValueError("Amount must be a number.")
+    if not amount.is_finite():
+        raise ValueError("Amount must be a finite number.")
+    cents = amount * 100
+    if cents != cents.to_integral_value():
+        raise ValueError("Amount cannot have fractions of a cent.")
+    return int(cents)
 
 
 class BankAccount:
@@ -18,13 +49,12 @@ class BankAccount:
 
     def __init__(self, dni: str, iban: str, initial_balance: float = 0):
         """Initialize a new bank account."""
-        if not validate_dni(dni):
-            raise ValueError(
-                "Invalid DNI format. Must be 8 digits followed by a letter.")
-        if not self._validate_iban(iban):
-            raise ValueError(
-                "Invalid IBAN format. Must be a valid Spanish IBAN (ES + 22 digits)."
-            )
+        error = account_error(dni, iban)
+        if error is not None:
+            raise ValueError(error)
+        if isinstance(initial_balance, bool) or not isinstance(
+                initial_balance, (int, float)):
+            raise ValueError("Initial balance must be a number.")
         self._dni = dni
         self._iban = iban
         self._balance = initial_balance
@@ -43,9 +73,8 @@ class BankAccount:
 
     @staticmethod
     def _validate_iban(iban: str) -> bool:
-        """Validate a Spanish IBAN (starts with 'ES', 24 characters, alphanumeric)."""
-        pattern = r'^ES[0-9]{22}$'
-        return bool(re.match(pattern, iban))
+        """Validate a Spanish IBAN (ES + 22 digits, with valid check digits)."""
+        return iban_error(iban) is None
 
     def deposit(self, amount: float):
         """Add money to the account."""
@@ -61,6 +90,14 @@ class BankAccount:
             raise InsufficientFundsError("Insufficient funds.")
         self._balance -= amount
 
+    def _save_balance(self) -> float:
+        """Exact stored balance, for ``_restore_balance`` after a failure."""
+        return self._balance
+
+    def _restore_balance(self, saved: float):
+        """Put back a balance returned by ``_save_balance``."""
+        self._balance = saved
+
     def __str__(self):
         """Return account information as a string."""
         return (f"Account DNI: {self._dni}\n"
@@ -68,11 +105,79 @@ class BankAccount:
                 f"Balance: ${self._balance:.2f}")
 
 
+class CompactAccount:
+    """
+    A bank account with an exact integer balance in cents.
+
+    Same interface as BankAccount, but ``__slots__`` removes the
+    per-instance ``__dict__`` and the balance is kept as whole cents, so
+    repeated deposits and withdrawals never accumulate rounding drift.
+    ``balance`` is reported in currency units; ``balance_cents`` is exact.
+    """
+
+    __slots__ = ("_dni", "_iban", "_cents")
+
+    def __init__(self, dni: str, iban: str, initial_balance=0):
+        """Initialize a new bank account."""
+        error = account_error(dni, iban)
+        if error is not None:
+            raise ValueError(error)
+        self._dni = dni
+        self._iban = iban
+        self._cents = to_cents(initial_balance)
+
+    @property
+    def dni(self) -> str:
+        return self._dni
+
+    @property
+    def iban(self) -> str:
+        return self._iban
+
+    @property
+    def balance(self) -> float:
+        return self._cents / 100
+
+    @property
+    def balance_cents(self) -> int:
+        return self._cents
+
+    def deposit(self, amount):
+        """Add money to the account."""
+        cents = to_cents(amount)
+        if cents <= 0:
+            raise ValueError("Deposit amount must be positive.")
+        self._cents += cents
+
+    def withdraw(self, amount):
+        """Remove money from the account."""
+        cents = to_cents(amount)
+        if cents <= 0:
+            raise ValueError("Withdrawal amount must be positive.")
+        if cents > self._cents:
+            raise InsufficientFundsError("Insufficient funds.")
+        self._cents -= cents
+
+    def _save_balance(self) -> int:
+        """Exact stored balance, for ``_restore_balance`` after a failure."""
+        return self._cents
+
+    def _restore_balance(self, saved: int):
+        """Put back a balance returned by ``_save_balance``."""
+        self._cents = saved
+
+    def __str__(self):
+        """Return account information as a string."""
+        return (f"Account DNI: {self._dni}\n"
+                f"IBAN: {self._iban}\n"
+                f"Balance: ${self.balance:.2f}")
+
+
 # Example usage
 if __name__ == "__main__":
     # Basic testing
     print("Running basic tests...")
-    test_account = BankAccount("12345678A", "ES7620770024003102575766", 100.0)
+    test_account = BankAccount("12345678Z", "ES7620770024003102575766", 100.0)
     assert test_account.balance == 100.0
 
     test_account.deposit(50.0)
@@ -88,4 +193,9 @@ if __name__ == "__main__":
     except InsufficientFundsError:
         pass # Expected
 
+    compact = CompactAccount("12345678Z", "ES7620770024003102575766", 0)
+    for _ in range(1000):
+        compact.deposit(0.1)
+    assert compact.balance_cents == 10000 and compact.balance == 100.0
+
     print("All basic tests passed.")
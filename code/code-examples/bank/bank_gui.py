@@ -1,8 +1,119 @@
+import queue
+import threading
 import tkinter as tk
+import traceback
 from tkinter import messagebox, ttk
 from bank_domain import InsufficientFundsError
 from bank_manager import BankManager
 
+# Accounts loaded into the selector per request
+PAGE_SIZE = 50
+# How often the Tk thread collects finished manager calls (ms)
+POLL_INTERVAL = 30
+# Pause after the last keystroke before searching (ms)
+SEARCH_DELAY = 150
+MORE_ENTRY = "More..."
+
+
+class ManagerWorker:
+    """
+    Runs BankManager calls on a background thread.
+
+    The Tk main loop must never block on the manager (it may be large,
+    persistent or remote). ``submit`` queues a call for the worker
+    thread; ``poll``, scheduled with ``root.after``, runs the callbacks
+    of finished calls on the Tk thread, where widgets may be touched.
+    A callback that raises is reported and skipped, so the remaining
+    results are still delivered and polling goes on.
+    """
+
+    def __init__(self):
+        self._report = traceback.print_exception
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._thread = threading.Thread(target=self._run,
+                                        name="bank-manager-worker",
+                                        daemon=True)
+        self._thread.start()
+
+    def submit(self, func, *args, on_done=None, on_error=None):
+        """
+        Queue ``func(*args)`` for the worker thread.
+
+        Args:
+            func: Callable to run (usually a BankManager method)
+            on_done: Called on the Tk thread with the result
+            on_error: Called on the Tk thread with the exception
+        """
+        self._requests.put((func, args, on_done, on_error))
+
+    def _run(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            func, args, on_done, on_error = request
+            try:
+                outcome = (on_done, func(*args))
+            except Exception as exc:
+                outcome = (on_error, exc)
+            self._results.put(outcome)
+
+    def poll(self):
+        """Run the callbacks of every call finished so far."""
+        while True:
+            try:
+                callback, value = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if callback is None:
+                continue
+            try:
+                callback(value)
+            except Exception as exc:
+                self._report(type(exc), exc, exc.__traceback__)
+
+    def attach(self, root, interval: int = POLL_INTERVAL):
+        """
+        Poll from the Tk main loop every ``interval`` milliseconds.
+
+        Errors raised by callbacks go to ``root.report_callback_exception``,
+        as for any other Tk callback.
+        """
+        self._report = root.report_callback_exception
+
+        def tick():
+            try:
+                self.poll()
+            finally:
+                root.after(interval, tick)
+
+        root.after(interval, tick)
+
+    def stop(self):
+        """Let the worker thread finish the queued calls and exit."""
+        self._requests.put(None)
+
+
+def account_page(bank_manager: BankManager, prefix: str, after=None):
+    """
+    Fetch one page of the selector: (dni, iban) pairs matching a prefix.
+
+    Runs on the worker thread. One extra DNI is requested to find out
+    whether another page follows.
+
+    Returns:
+        (entries, has_more)
+    """
+    dnis = bank_manager.search_dni(prefix, PAGE_SIZE + 1, after)
+    entries = []
+    for dni in dnis[:PAGE_SIZE]:
+        try:
+            entries.append((dni, bank_manager.get_account(dni).iban))
+        except KeyError:
+            pass  # Deleted since the search
+    return entries, len(dnis) > PAGE_SIZE
+
 
 class BankGUI:
 
@@ -11,14 +122,19 @@ class BankGUI:
         self.root.title("Bank Account Manager")
         self.root.geometry("600x550")
 
-        # Use the bank manager service layer
+        # Use the bank manager service layer, always from the worker
         self.bank_manager = bank_manager
-        self.current_account = None
-
-        # Set default account if any exists
-        accounts = self.bank_manager.get_all_accounts()
-        if accounts:
-            self.current_account = list(accounts.values())[0]
+        self.worker = ManagerWorker()
+        self.worker.attach(root)
+        self.current_dni = None
+        self.current_balance = None
+        self.pending_calls = 0
+
+        # Selector state: the loaded page entries and the search prefix
+        self.page_entries = []
+        self.has_more = False
+        self.search_prefix = ""
+        self.search_job = None
 
         # Title label
         title_label = tk.Label(root,
@@ -33,13 +149,11 @@ class BankGUI:
                                         pady=10)
         selection_frame.pack(padx=10, pady=5, fill="x")
 
-        tk.Label(selection_frame, text="Select Account:").pack(side=tk.LEFT)
-        self.account_combo = ttk.Combobox(selection_frame,
-                                          width=25,
-                                          state="readonly")
+        tk.Label(selection_frame, text="Search DNI:").pack(side=tk.LEFT)
+        self.account_combo = ttk.Combobox(selection_frame, width=34)
         self.account_combo.pack(side=tk.LEFT, padx=5)
         self.account_combo.bind("<<ComboboxSelected>>", self.on_account_select)
-        self.update_account_list()
+        self.account_combo.bind("<KeyRelease>", self.on_search_key)
 
         # Create new account button
         create_btn = tk.Button(selection_frame,
@@ -50,10 +164,9 @@ class BankGUI:
         create_btn.pack(side=tk.LEFT, padx=5)
 
         # Balance display
-        self.balance_label = tk.Label(
-            root,
-            text=f"Balance: ${self.current_account.balance:.2f}",
-            font=("Arial", 14))
+        self.balance_label = tk.Label(root,
+                                      text="No account selected",
+                                      font=("Arial", 14))
         self.balance_label.pack(pady=10)
 
         # Amount entry
@@ -103,30 +216,124 @@ class BankGUI:
                              fg="white")
         exit_btn.pack(pady=5)
 
+        # Status line for calls still running on the worker
+        self.status_label = tk.Label(root, text="", fg="#757575")
+        self.status_label.pack(side=tk.BOTTOM, pady=5)
+
+        # Load the first page and select its first account by default
+        self.load_accounts("", select_first=True)
+
+    def call(self, func, *args, on_done=None, on_error=None):
+        """Run a manager call on the worker, showing a status meanwhile."""
+        self.pending_calls += 1
+        self.status_label.config(text="Working...")
+
+        def finish():
+            self.pending_calls -= 1
+            if not self.pending_calls:
+                self.status_label.config(text="")
+
+        def done(result):
+            finish()
+            if on_done is not None:
+                on_done(result)
+
+        def failed(exc):
+            finish()
+            if on_error is not None:
+                on_error(exc)
+            else:
+                messagebox.showerror("Error", str(exc))
+
+        self.worker.submit(func, *args, on_done=done, on_error=failed)
+
     def update_balance_display(self):
         """Update the balance label."""
-        if self.current_account:
+        if self.current_dni is not None:
             self.balance_label.config(
-                text=f"Balance: ${self.current_account.balance:.2f}")
+                text=f"Balance: ${self.current_balance:.2f}")
+
+    def load_accounts(self, prefix: str, select_first: bool = False):
+        """Replace the selector entries with the first page for a prefix."""
+        self.search_prefix = prefix
+
+        def loaded(page):
+            if prefix != self.search_prefix:
+                return  # A newer search has started
+            self.page_entries, self.has_more = page
+            self.refresh_selector()
+            if select_first and self.page_entries:
+                self.select_account(self.page_entries[0][0])
+
+        self.call(account_page, self.bank_manager, prefix, on_done=loaded)
+
+    def load_more_accounts(self):
+        """Append the next page for the current prefix to the selector."""
+        prefix = self.search_prefix
+        after = self.page_entries[-1][0] if self.page_entries else None
+
+        def loaded(page):
+            if prefix != self.search_prefix:
+                return
+            entries, self.has_more = page
+            self.page_entries.extend(entries)
+            self.refresh_selector()
+
+        self.call(account_page,
+                  self.bank_manager,
+                  prefix,
+                  after,
+                  on_done=loaded)
+
+    def refresh_selector(self):
+        """Show the loaded entries (plus a "More..." item) in the combobox."""
+        values = [f"{dni} - {iban}" for dni, iban in self.page_entries]
+        if self.has_more:
+            values.append(MORE_ENTRY)
+        self.account_combo['values'] = values
 
     def update_account_list(self):
-        """Update the account combobox with all accounts."""
-        accounts = self.bank_manager.get_all_accounts()
-        account_list = [f"{dni} - {acc.iban}" for dni, acc in accounts.items()]
-        self.account_combo['values'] = account_list
-        if self.current_account:
-            current_index = list(accounts.keys()).index(
-                self.current_account.dni)
-            self.account_combo.current(current_index)
+        """Reload the selector for the text currently typed in it."""
+        self.load_accounts(self.typed_prefix())
+
+    def typed_prefix(self) -> str:
+        """The DNI part of the text in the selector, upper-cased."""
+        return self.account_combo.get().split(" - ")[0].strip().upper()
+
+    def on_search_key(self, event):
+        """Search as the user types, once typing pauses."""
+        if event.keysym in ("Up", "Down", "Return", "Escape"):
+            return
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(SEARCH_DELAY, self.run_search)
+
+    def run_search(self):
+        self.search_job = None
+        prefix = self.typed_prefix()
+        if prefix != self.search_prefix:
+            self.load_accounts(prefix)
 
     def on_account_select(self, event):
         """Handle account selection from combobox."""
         selected = self.account_combo.get()
-        if selected:
-            dni = selected.split(" - ")[0]
-            self.current_account = self.bank_manager.get_account(dni)
+        if selected == MORE_ENTRY:
+            self.account_combo.set(self.search_prefix)
+            self.load_more_accounts()
+        elif selected:
+            self.select_account(selected.split(" - ")[0])
+
+    def select_account(self, dni: str):
+        """Make an account current, fetching its balance in the background."""
+
+        def loaded(account):
+            self.current_dni = account.dni
+            self.current_balance = account.balance
+            self.account_combo.set(f"{account.dni} - {account.iban}")
             self.update_balance_display()
 
+        self.call(self.bank_manager.get_account, dni, on_done=loaded)
+
     def show_create_account_dialog(self):
         """Show dialog to create a new account."""
         dialog = tk.Toplevel(self.root)
@@ -162,22 +369,30 @@ class BankGUI:
         balance_entry.insert(0, "0")
         balance_entry.grid(row=2, column=1, padx=10, pady=10)
 
+        def created(account):
+            self.current_dni = account.dni
+            self.current_balance = account.balance
+            self.account_combo.set(f"{account.dni} - {account.iban}")
+            self.update_balance_display()
+            self.load_accounts(account.dni)
+            messagebox.showinfo(
+                "Success",
+                f"Account created successfully!\nDNI: {account.dni}")
+            dialog.destroy()
+
         def create_account():
             try:
                 dni = dni_entry.get().strip().upper()
                 iban = iban_entry.get().strip().upper()
                 balance = float(balance_entry.get())
-
-                new_account = self.bank_manager.create_account(
-                    dni, iban, balance)
-                self.current_account = new_account
-                self.update_account_list()
-                self.update_balance_display()
-                messagebox.showinfo(
-                    "Success", f"Account created successfully!\nDNI: {dni}")
-                dialog.destroy()
             except ValueError as e:
                 messagebox.showerror("Error", str(e))
+                return
+            self.call(self.bank_manager.create_account,
+                      dni,
+                      iban,
+                      balance,
+                      on_done=created)
 
         # Buttons
         btn_frame = tk.Frame(dialog)
@@ -211,51 +426,71 @@ class BankGUI:
 
     def deposit(self):
         """Handle deposit operation."""
-        if not self.current_account:
+        if self.current_dni is None:
             messagebox.showerror("Error", "No account selected.")
             return
 
         amount = self.get_amount()
         if amount is not None:
-            try:
-                self.current_account.deposit(amount)
-                self.update_balance_display()
+            dni = self.current_dni
+
+            def deposited(balance):
+                if dni == self.current_dni:
+                    self.current_balance = balance
+                    self.update_balance_display()
                 self.amount_entry.delete(0, tk.END)
                 messagebox.showinfo(
                     "Success",
-                    f"Deposited ${amount:.2f}\nNew balance: ${self.current_account.balance:.2f}"
-                )
-            except ValueError as e:
-                messagebox.showerror("Error", str(e))
+                    f"Deposited ${amount:.2f}\nNew balance: ${balance:.2f}")
+
+            self.call(self.bank_manager.deposit,
+                      dni,
+                      amount,
+                      on_done=deposited)
 
     def withdraw(self):
         """Handle withdraw operation."""
-        if not self.current_account:
+        if self.current_dni is None:
             messagebox.showerror("Error", "No account selected.")
             return
 
         amount = self.get_amount()
         if amount is not None:
-            try:
-                self.current_account.withdraw(amount)
-                self.update_balance_display()
+            dni = self.current_dni
+
+            def withdrawn(balance):
+                if dni == self.current_dni:
+                    self.current_balance = balance
+                    self.update_balance_display()
                 self.amount_entry.delete(0, tk.END)
                 messagebox.showinfo(
                     "Success",
-                    f"Withdrew ${amount:.2f}\nNew balance: ${self.current_account.balance:.2f}"
-                )
-            except InsufficientFundsError as e:
-                messagebox.showerror("Insufficient Funds", str(e))
-            except ValueError as e:
-                messagebox.showerror("Error", str(e))
+                    f"Withdrew ${amount:.2f}\nNew balance: ${balance:.2f}")
+
+            def failed(exc):
+                if isinstance(exc, InsufficientFundsError):
+                    messagebox.showerror("Insufficient Funds", str(exc))
+                else:
+                    messagebox.showerror("Error", str(exc))
+
+            self.call(self.bank_manager.withdraw,
+                      dni,
+                      amount,
+                      on_done=withdrawn,
+                      on_error=failed)
 
     def show_account_info(self):
         """Display complete account information."""
-        if not self.current_account:
+        if self.current_dni is None:
             messagebox.showerror("Error", "No account selected.")
             return
-        info = str(self.current_account)
-        messagebox.showinfo("Account Information", info)
+
+        def loaded(account):
+            messagebox.showinfo("Account Information", str(account))
+
+        self.call(self.bank_manager.get_account,
+                  self.current_dni,
+                  on_done=loaded)
 
 
 def main():
@@ -264,7 +499,7 @@ def main():
 
     # Create a default account for demo purposes
     try:
-        bank_manager.create_account("12345678A", "ES7620770024003102575766",
+        bank_manager.create_account("12345678Z", "ES7620770024003102575766",
                                     1000.0)
     except ValueError:
         pass  # Account already exists
@@ -273,6 +508,7 @@ def main():
     root = tk.Tk()
     app = BankGUI(root, bank_manager)
     root.mainloop()
+    app.worker.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,229 @@
+"""
+Bank Index - Secondary Account Indexes
+Keeps lookups by IBAN, balance and DNI prefix fast without scanning.
+
+``AccountIndex`` holds three structures that BankManager updates on
+every change:
+
+- an IBAN hash index (IBAN -> DNIs; several accounts may share an IBAN)
+- a balance index of sorted (balance, dni) keys, for range and top-k
+  queries
+- a sorted DNI index, for prefix search (search-as-you-type)
+
+The sorted indexes use ``SortedList``, a list of bounded sorted buckets.
+Inserts and removals cost O(log n) plus a shift inside one bucket, and a
+query costs O(log n + k) for k results.
+"""
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterator, Optional
+
+DEFAULT_BUCKET_SIZE = 1000
+
+
+class SortedList:
+    """Sorted sequence stored as a list of bounded sorted buckets."""
+
+    def __init__(self, bucket_size: int = DEFAULT_BUCKET_SIZE):
+        self._buckets = []
+        self._maxes = []
+        self._bucket_size = bucket_size
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, value):
+        """Insert a value, keeping the order."""
+        self._len += 1
+        if not self._buckets:
+            self._buckets.append([value])
+            self._maxes.append(value)
+            return
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            i -= 1
+            bucket = self._buckets[i]
+            bucket.append(value)
+            self._maxes[i] = value
+        else:
+            bucket = self._buckets[i]
+            insort(bucket, value)
+        if len(bucket) > 2 * self._bucket_size:
+            half = bucket[self._bucket_size:]
+            del bucket[self._bucket_size:]
+            self._buckets.insert(i + 1, half)
+            self._maxes.insert(i + 1, half[-1])
+            self._maxes[i] = bucket[-1]
+
+    def remove(self, value):
+        """
+        Remove one occurrence of a value.
+
+        Raises:
+            ValueError: If the value is not present
+        """
+        i = bisect_left(self._maxes, value)
+        if i < len(self._maxes):
+            bucket = self._buckets[i]
+            j = bisect_left(bucket, value)
+            if j < len(bucket) and bucket[j] == value:
+                del bucket[j]
+                self._len -= 1
+                if bucket:
+                    self._maxes[i] = bucket[-1]
+                else:
+                    del self._buckets[i]
+                    del self._maxes[i]
+                return
+        raise ValueError(f"{value!r} not in list")
+
+    def iter_from(self, value=None, inclusive: bool = True) -> Iterator:
+        """
+        Iterate in ascending order, starting at ``value``.
+
+        Args:
+            value: First value to yield, or None to start at the smallest
+            inclusive: Whether a value equal to ``value`` is yielded
+        """
+        if value is None:
+            i = j = 0
+        else:
+            search = bisect_left if inclusive else bisect_right
+            i = search(self._maxes, value)
+            if i == len(self._maxes):
+                return
+            j = search(self._buckets[i], value)
+        while i < len(self._buckets):
+            bucket = self._buckets[i]
+            while j < len(bucket):
+                yield bucket[j]
+                j += 1
+            i += 1
+            j = 0
+
+    def iter_descending(self) -> Iterator:
+        """Iterate from the largest value down."""
+        for i in range(len(self._buckets) - 1, -1, -1):
+            bucket = self._buckets[i]
+            for j in range(len(bucket) - 1, -1, -1):
+                yield bucket[j]
+
+
+class AccountIndex:
+    """
+    Secondary indexes over a set of accounts.
+
+    The index is thread-safe: updates and queries take an internal lock,
+    and queries return lists, never live iterators. It records each
+    account's IBAN and indexed balance, so callers only pass the DNI and
+    the new values.
+    """
+
+    def __init__(self, bucket_size: int = DEFAULT_BUCKET_SIZE):
+        self._entries = {}
+        self._by_iban = {}
+        self._by_balance = SortedList(bucket_size)
+        self._by_dni = SortedList(bucket_size)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, dni: str, iban: str, balance: float):
+        """Index a new account."""
+        with self._lock:
+            if dni in self._entries:
+                raise ValueError(f"Account with DNI {dni} already indexed.")
+            self._entries[dni] = (iban, balance)
+            self._by_iban.setdefault(iban, {})[dni] = None
+            self._by_balance.add((balance, dni))
+            self._by_dni.add(dni)
+
+    def remove(self, dni: str):
+        """Drop an account from the index; unknown DNIs are ignored."""
+        with self._lock:
+            entry = self._entries.pop(dni, None)
+            if entry is None:
+                return
+            iban, balance = entry
+            holders = self._by_iban[iban]
+            del holders[dni]
+            if not holders:
+                del self._by_iban[iban]
+            self._by_balance.remove((balance, dni))
+            self._by_dni.remove(dni)
+
+    def update_balance(self, dni: str, balance: float):
+        """Move an account to its new position in the balance index."""
+        with self._lock:
+            iban, old = self._entries[dni]
+            if old == balance:
+                return
+            self._by_balance.remove((old, dni))
+            self._by_balance.add((balance, dni))
+            self._entries[dni] = (iban, balance)
+
+    def dnis_by_iban(self, iban: str) -> list[str]:
+        """DNIs of the accounts with this IBAN, in creation order."""
+        with self._lock:
+            return list(self._by_iban.get(iban, ()))
+
+    def dnis_by_balance(self,
+                        min_balance: Optional[float] = None,
+                        max_balance: Optional[float] = None,
+                        limit: Optional[int] = None) -> list[str]:
+        """
+        DNIs with ``min_balance <= balance <= max_balance``, ascending.
+
+        Ties are ordered by DNI. Either bound may be None (unbounded).
+        """
+        start = None if min_balance is None else (min_balance, "")
+        result = []
+        with self._lock:
+            for balance, dni in self._by_balance.iter_from(start):
+                if limit is not None and len(result) >= limit:
+                    break
+                if max_balance is not None and balance > max_balance:
+                    break
+                result.append(dni)
+        return result
+
+    def top_dnis(self, k: int, largest: bool = True) -> list[str]:
+        """DNIs of the ``k`` largest (or smallest) balances, in order."""
+        result = []
+        with self._lock:
+            keys = (self._by_balance.iter_descending()
+                    if largest else self._by_balance.iter_from())
+            for _, dni in keys:
+                if len(result) >= k:
+                    break
+                result.append(dni)
+        return result
+
+    def dnis_with_prefix(self,
+                         prefix: str,
+                         limit: Optional[int] = None,
+                         after: Optional[str] = None) -> list[str]:
+        """
+        DNIs starting with ``prefix``, in sorted order.
+
+        Args:
+            prefix: Leading characters to match ("" matches every DNI)
+            limit: Maximum number of DNIs to return
+            after: Return only DNIs sorted after this one (to fetch the
+                next page, pass the last DNI of the previous page)
+        """
+        if after is not None and after >= prefix:
+            start, inclusive = after, False
+        else:
+            start, inclusive = prefix, True
+        result = []
+        with self._lock:
+            for dni in self._by_dni.iter_from(start, inclusive):
+                if not dni.startswith(prefix):
+                    break
+                if limit is not None and len(result) >= limit:
+                    break
+                result.append(dni)
+        return result
@@ -0,0 +1,175 @@
+"""
+Bank I/O - Bulk Import and Export
+Streams accounts between BankManager and CSV or JSON Lines files.
+
+Files are read and written one record at a time, and imports are fed to
+``BankManager.create_accounts`` in chunks, so a 500k-account migration
+never holds the whole file in memory and costs one storage commit per
+chunk instead of one per account.
+
+CSV files have a header row ``dni,iban,balance``; JSON Lines files hold
+one ``{"dni": ..., "iban": ..., "balance": ...}`` object per line. The
+format is chosen from the file extension unless given explicitly.
+"""
+import csv
+import json
+from itertools import islice
+from typing import Iterator, Optional
+
+from bank_manager import BankManager
+
+FORMATS = ("csv", "jsonl")
+FIELDS = ("dni", "iban", "balance")
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    if fmt is None:
+        fmt = "jsonl" if str(path).endswith((".jsonl", ".ndjson")) else "csv"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}. Use 'csv' or 'jsonl'.")
+    return fmt
+
+
+def _read_records(path: str, fmt: Optional[str]) -> Iterator[tuple]:
+    # (line number, record, error): record is a (dni, iban, balance)
+    # tuple, or None with an error message when the line cannot be parsed
+    fmt = _detect_format(path, fmt)
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                # Short rows leave the trailing fields as None
+                missing = next((name for name in ("dni", "iban")
+                                if row.get(name) is None), None)
+                if missing is not None:
+                    yield reader.line_num, None, f"missing field '{missing}'"
+                else:
+                    yield (reader.line_num,
+                           (row["dni"].strip(), row["iban"].strip(),
+                            _to_number(row.get("balance") or 0)), None)
+        else:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    fields = (record["dni"], record["iban"],
+                              record.get("balance", 0))
+                except json.JSONDecodeError as exc:
+                    yield number, None, f"invalid JSON: {exc.msg}"
+                except KeyError as exc:
+                    yield number, None, f"missing field {exc}"
+                except TypeError:
+                    yield number, None, "record is not a JSON object"
+                else:
+                    yield number, fields, None
+
+
+def read_accounts(path: str, fmt: Optional[str] = None) -> Iterator[tuple]:
+    """
+    Lazily read account records from a file.
+
+    Args:
+        path: CSV or JSON Lines file
+        fmt: "csv" or "jsonl" (default: from the extension)
+
+    Yields:
+        (dni, iban, balance) tuples; a malformed balance is passed
+        through as text, for create_accounts to reject
+
+    Raises:
+        ValueError: If a line cannot be parsed (invalid JSON or a missing
+            field); import_accounts reports such lines instead
+    """
+    for number, record, error in _read_records(path, fmt):
+        if record is None:
+            raise ValueError(f"{path}, line {number}: {error}")
+        yield record
+
+
+def _to_number(text):
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def import_accounts(manager: BankManager,
+                    path: str,
+                    fmt: Optional[str] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    Create accounts from a file, streaming it in chunks.
+
+    Unparsable lines (invalid JSON, a missing field), invalid and
+    duplicate records are skipped and reported; the rest are created.
+
+    Args:
+        manager: Manager to create the accounts in
+        path: CSV or JSON Lines file
+        fmt: "csv" or "jsonl" (default: from the extension)
+        chunk_size: Records per create_accounts call (one commit each)
+
+    Returns:
+        Dictionary with "created", "failed" and "errors", a list of
+        (record number, message) with record numbers starting at 1;
+        messages for unparsable lines give the line number
+    """
+    records = _read_records(path, fmt)
+    created = 0
+    errors = []
+    position = 0
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        results = iter(manager.create_accounts(
+            [record for _, record, _ in chunk if record is not None]))
+        for number, record, error in chunk:
+            position += 1
+            if record is None:
+                errors.append((position, f"line {number}: {error}"))
+                continue
+            ok, value = next(results)
+            if ok:
+                created += 1
+            else:
+                errors.append((position, str(value)))
+    return {"created": created, "failed": len(errors), "errors": errors}
+
+
+def export_accounts(manager: BankManager,
+                    path: str,
+                    fmt: Optional[str] = None) -> int:
+    """
+    Write every account to a file without copying the registry.
+
+    Args:
+        manager: Manager whose accounts to export
+        path: Destination CSV or JSON Lines file (overwritten)
+        fmt: "csv" or "jsonl" (default: from the extension)
+
+    Returns:
+        The number of accounts written
+    """
+    fmt = _detect_format(path, fmt)
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        accounts = manager.accounts_view().values()
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            for account in accounts:
+                writer.writerow((account.dni, account.iban, account.balance))
+                written += 1
+        else:
+            for account in accounts:
+                f.write(json.dumps({
+                    "dni": account.dni,
+                    "iban": account.iban,
+                    "balance": account.balance
+                }))
+                f.write("\n")
+                written += 1
+    return written
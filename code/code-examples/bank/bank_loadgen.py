@@ -0,0 +1,121 @@
+"""
+Load generator for the bank service.
+
+Opens many concurrent client connections, each issuing deposits,
+withdrawals and transfers one after another, and reports throughput and
+latency percentiles. Without --port it starts a service in-process on a
+free port (optionally backed by a write-ahead log).
+
+Usage:
+    python bank_loadgen.py --clients 1000 --requests 20
+    python bank_loadgen.py --wal /tmp/bankwal       # durable storage
+    python bank_loadgen.py --port 8765              # external service
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from bank_domain import InsufficientFundsError
+from bank_manager import BankManager
+from bank_service import DEFAULT_HOST, BankClient, BankService
+from bank_validation import DNI_LETTERS
+
+IBAN = "ES7620770024003102575766"
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1,
+                max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def client_session(host: str, port: int, dnis: list, requests: int,
+                         seed: int, latencies: list):
+    """One client connection issuing ``requests`` sequential operations."""
+    rng = random.Random(seed)
+    client = await BankClient().connect(host, port)
+    try:
+        for _ in range(requests):
+            kind = rng.random()
+            amount = rng.randint(1, 50)
+            start = time.perf_counter()
+            try:
+                if kind < 0.4:
+                    await client.deposit(rng.choice(dnis), amount)
+                elif kind < 0.7:
+                    await client.withdraw(rng.choice(dnis), amount)
+                else:
+                    src, dst = rng.sample(dnis, 2)
+                    await client.transfer(src, dst, amount)
+            except InsufficientFundsError:
+                pass
+            latencies.append(time.perf_counter() - start)
+    finally:
+        await client.close()
+
+
+async def run(args):
+    service = None
+    manager = None
+    port = args.port
+    if port is None:
+        storage = None
+        if args.wal:
+            from bank_storage import WALStorage
+            storage = WALStorage(args.wal)
+        manager = BankManager(storage)
+        service = BankService(manager, args.host, 0)
+        await service.start()
+        port = service.port
+
+    dnis = [f"{i:08d}{DNI_LETTERS[i % 23]}" for i in range(args.accounts)]
+    setup = await BankClient().connect(args.host, port)
+    await asyncio.gather(*[
+        setup.call("create", dni=dni, iban=IBAN, initial_balance=1000)
+        for dni in dnis
+    ], return_exceptions=True)  # accounts may exist on a reused service
+    await setup.close()
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        client_session(args.host, port, dnis, args.requests, seed,
+                       latencies) for seed in range(args.clients)
+    ])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{args.clients} clients x {args.requests} requests "
+          f"({len(latencies)} total) in {elapsed:.2f}s")
+    print(f"  throughput {len(latencies) / elapsed:,.0f} req/s")
+    print(f"  p50 {percentile(latencies, 0.50) * 1000:.2f} ms   "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms   "
+          f"max {latencies[-1] * 1000:.2f} ms")
+    if service is not None:
+        print(f"  {service.requests} requests in {service.batches} batches "
+              f"(avg {service.requests / service.batches:.1f})")
+        await service.close()
+        manager.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port",
+                        type=int,
+                        default=None,
+                        help="existing service (default: start one)")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--wal",
+                        metavar="DIR",
+                        help="use a write-ahead log in DIR (in-process only)")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
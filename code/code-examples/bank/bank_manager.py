@@ -1,16 +1,85 @@
 """
 Bank Manager - Service Layer
 Handles business logic for managing multiple bank accounts.
+
+The manager is safe to share between threads. Each DNI maps to one of a
+fixed set of lock stripes, so operations on different accounts rarely
+contend, and ``transfer`` takes its two stripes in index order, which
+rules out deadlocks. Mutate accounts through the manager: calling
+``BankAccount.deposit``/``withdraw`` directly bypasses the locks and the
+storage log. If appending a change to the storage log fails, the
+balances saved before the change are put back exactly before the error
+propagates, so memory never holds a balance that storage did not accept.
+
+Besides the DNI registry, the manager maintains secondary indexes (see
+bank_index) for lookups by IBAN, balance ranges, top balances and DNI
+prefixes. They are updated under the same locks as the accounts, and so
+is each account's transaction history (see bank_ledger), which backs
+``balance_at`` and the paged ``statement`` queries.
 """
-from bank_domain import BankAccount
+import threading
+from contextlib import contextmanager
+from itertools import islice
+from types import MappingProxyType
+from typing import Iterable, Iterator, Mapping, MutableMapping, Optional
+
+from bank_domain import BankAccount, InsufficientFundsError
+from bank_index import AccountIndex
+from bank_ledger import (DEFAULT_PAGE_SIZE, DEPOSIT, KINDS, OPEN,
+                         TRANSFER_IN, TRANSFER_OUT, WITHDRAW, LedgerBook,
+                         LedgerEntry)
+from bank_storage import MemoryStorage, StorageBackend
+
+DEFAULT_LOCK_STRIPES = 64
 
 
 class BankManager:
     """Manages multiple bank accounts."""
 
-    def __init__(self):
-        """Initialize the bank manager with an empty account registry."""
-        self._accounts = {}
+    def __init__(self,
+                 storage: StorageBackend = None,
+                 lock_stripes: int = DEFAULT_LOCK_STRIPES,
+                 account_class: type = BankAccount,
+                 registry: MutableMapping = None,
+                 ledger: bool = True):
+        """
+        Initialize the bank manager.
+        
+        Args:
+            storage: Backend that persists every change (default: keep
+                accounts in memory only). Existing accounts are loaded
+                from it.
+            lock_stripes: Number of locks shared out among the accounts
+            account_class: Class used to validate and build accounts,
+                e.g. CompactAccount for exact integer-cent balances
+            registry: Empty mapping that holds the accounts (default: a
+                dict), e.g. a columnar bank_table.AccountTable
+            ledger: Keep a transaction history per account (16 bytes per
+                operation in memory). It is persisted only by storage
+                opened with ``history=True``, and then replayed from it
+                on start-up; otherwise it starts afresh at each account's
+                stored balance.
+        """
+        if lock_stripes < 1:
+            raise ValueError("lock_stripes must be positive.")
+        self._storage = storage if storage is not None else MemoryStorage()
+        self._locks = [threading.Lock() for _ in range(lock_stripes)]
+        self._checkpoint_lock = threading.Lock()
+        self._local = threading.local()
+        self._account_class = account_class
+        self._accounts = registry if registry is not None else {}
+        self._view = MappingProxyType(self._accounts)
+        self._index = AccountIndex()
+        self._ledger = LedgerBook() if ledger else None
+        state = self._storage.load()
+        if self._ledger is not None and self._storage.keeps_history:
+            self._ledger.replay(self._storage.load_history())
+        for dni, (iban, balance) in state.items():
+            account = account_class(dni, iban, balance)
+            self._accounts[dni] = account
+            self._index.add(dni, account.iban, account.balance)
+        if self._ledger is not None:
+            self._resume_ledgers()
 
     def create_account(self,
                        dni: str,
@@ -30,11 +99,26 @@ class BankManager:
         Raises:
             ValueError: If account with this DNI already exists or validation fails
         """
-        if dni in self._accounts:
-            raise ValueError(f"Account with DNI {dni} already exists.")
+        with self._lock_for(dni):
+            if dni in self._accounts:
+                raise ValueError(f"Account with DNI {dni} already exists.")
 
-        account = BankAccount(dni, iban, initial_balance)
-        self._accounts[dni] = account
+            account = self._account_class(dni, iban, initial_balance)
+            record = {
+                "op": "create",
+                "dni": dni,
+                "iban": iban,
+                "balance": account.balance
+            }
+            now = self._stamp(record)
+            ticket = self._storage.append(record)
+            self._accounts[dni] = account
+            self._index.add(dni, account.iban, account.balance)
+            if self._ledger is not None:
+                self._ledger.open(dni, account.balance, now)
+            # A columnar registry returns its own view of the stored row
+            account = self._accounts[dni]
+        self._commit(ticket)
         return account
 
     def get_account(self, dni: str) -> BankAccount:
@@ -63,6 +147,19 @@ class BankManager:
         """
         return self._accounts.copy()
 
+    def accounts_view(self) -> Mapping[str, BankAccount]:
+        """
+        Get a read-only, live view of all accounts without copying.
+        
+        The view reflects later changes. Iterating it while another
+        thread creates or deletes accounts can raise RuntimeError; use
+        ``get_all_accounts`` for a stable snapshot in that case.
+        
+        Returns:
+            Read-only mapping from DNI to BankAccount
+        """
+        return self._view
+
     def account_exists(self, dni: str) -> bool:
         """
         Check if an account exists with the given DNI.
@@ -75,6 +172,116 @@ class BankManager:
         """
         return dni in self._accounts
 
+    def find_by_iban(self, iban: str) -> list[BankAccount]:
+        """
+        Find the accounts with a given IBAN.
+        
+        Args:
+            iban: IBAN to look up
+            
+        Returns:
+            Matching accounts in creation order (empty if none)
+        """
+        return self._lookup(self._index.dnis_by_iban(iban))
+
+    def find_by_balance(self,
+                        min_balance: Optional[float] = None,
+                        max_balance: Optional[float] = None,
+                        limit: Optional[int] = None) -> list[BankAccount]:
+        """
+        Find the accounts whose balance lies in a range.
+        
+        Args:
+            min_balance: Lowest balance to include (None: no lower bound)
+            max_balance: Highest balance to include (None: no upper bound)
+            limit: Maximum number of accounts to return
+            
+        Returns:
+            Matching accounts by ascending balance, ties by DNI
+        """
+        return self._lookup(
+            self._index.dnis_by_balance(min_balance, max_balance, limit))
+
+    def top_accounts(self, k: int, largest: bool = True) -> list[BankAccount]:
+        """
+        Get the accounts with the highest (or lowest) balances.
+        
+        Args:
+            k: Number of accounts to return
+            largest: False to get the lowest balances instead
+            
+        Returns:
+            Up to k accounts, best first
+        """
+        return self._lookup(self._index.top_dnis(k, largest))
+
+    def search_dni(self,
+                   prefix: str,
+                   limit: Optional[int] = None,
+                   after: Optional[str] = None) -> list[str]:
+        """
+        List the DNIs that start with a prefix, in sorted order.
+        
+        Args:
+            prefix: Leading characters typed so far ("" matches all)
+            limit: Page size (default: every match)
+            after: Last DNI of the previous page, to fetch the next one
+            
+        Returns:
+            Matching DNIs
+        """
+        return self._index.dnis_with_prefix(prefix, limit, after)
+
+    def balance_at(self, dni: str, timestamp: float) -> Optional[float]:
+        """
+        Get the balance an account had at a past moment.
+        
+        Args:
+            dni: The DNI of the account
+            timestamp: Moment in seconds since the epoch (as time.time)
+            
+        Returns:
+            The balance at that moment, or None if the account did not
+            exist yet
+            
+        Raises:
+            KeyError: If no account exists with the given DNI
+            RuntimeError: If the manager keeps no ledger
+        """
+        return self._ledger_for(dni).balance_at(timestamp)
+
+    def statement(self,
+                  dni: str,
+                  start: Optional[float] = None,
+                  end: Optional[float] = None,
+                  page_size: int = DEFAULT_PAGE_SIZE
+                  ) -> Iterator[list[LedgerEntry]]:
+        """
+        Stream an account's transactions page by page.
+        
+        Pages are read from the ledger as they are requested; the full
+        history is never copied.
+        
+        Args:
+            dni: The DNI of the account
+            start: Include entries at or after this time (None: from the
+                opening of the account)
+            end: Include entries before this time (None: up to now)
+            page_size: Entries per page
+            
+        Returns:
+            Iterator of lists of LedgerEntry, oldest first
+            
+        Raises:
+            KeyError: If no account exists with the given DNI
+            ValueError: If page_size is not positive
+            RuntimeError: If the manager keeps no ledger
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be positive.")
+        entries = self._ledger_for(dni).entries(start, end)
+        return iter(lambda: list(islice(entries, page_size)), [])
+
     def delete_account(self, dni: str) -> bool:
         """
         Delete an account by DNI.
@@ -85,10 +292,83 @@ class BankManager:
         Returns:
             True if account was deleted, False if it didn't exist
         """
-        if dni in self._accounts:
+        with self._lock_for(dni):
+            if dni not in self._accounts:
+                return False
+            record = {"op": "delete", "dni": dni}
+            self._stamp(record)
+            ticket = self._storage.append(record)
             del self._accounts[dni]
-            return True
-        return False
+            self._index.remove(dni)
+            if self._ledger is not None:
+                self._ledger.close(dni)
+        self._commit(ticket)
+        return True
+
+    def deposit(self, dni: str, amount: float) -> float:
+        """
+        Deposit money into an account and persist the new balance.
+        
+        Args:
+            dni: The DNI of the account
+            amount: Amount to add (positive)
+            
+        Returns:
+            The new balance
+            
+        Raises:
+            KeyError: If no account exists with the given DNI
+            ValueError: If the amount is not positive
+        """
+        with self._lock_for(dni):
+            account = self.get_account(dni)
+            saved = account._save_balance()
+            account.deposit(amount)
+            balance = account.balance
+            record = {"op": "update", "balances": {dni: balance}}
+            now = self._stamp(record, {dni: DEPOSIT})
+            try:
+                ticket = self._storage.append(record)
+            except BaseException:
+                account._restore_balance(saved)
+                raise
+            self._index.update_balance(dni, balance)
+            self._record(dni, DEPOSIT, balance, now)
+        self._commit(ticket)
+        return balance
+
+    def withdraw(self, dni: str, amount: float) -> float:
+        """
+        Withdraw money from an account and persist the new balance.
+        
+        Args:
+            dni: The DNI of the account
+            amount: Amount to remove (positive)
+            
+        Returns:
+            The new balance
+            
+        Raises:
+            KeyError: If no account exists with the given DNI
+            ValueError: If the amount is not positive
+            InsufficientFundsError: If the balance is too low
+        """
+        with self._lock_for(dni):
+            account = self.get_account(dni)
+            saved = account._save_balance()
+            account.withdraw(amount)
+            balance = account.balance
+            record = {"op": "update", "balances": {dni: balance}}
+            now = self._stamp(record, {dni: WITHDRAW})
+            try:
+                ticket = self._storage.append(record)
+            except BaseException:
+                account._restore_balance(saved)
+                raise
+            self._index.update_balance(dni, balance)
+            self._record(dni, WITHDRAW, balance, now)
+        self._commit(ticket)
+        return balance
 
     def get_account_count(self) -> int:
         """
@@ -98,3 +378,244 @@ class BankManager:
             The number of registered accounts
         """
         return len(self._accounts)
+
+    def transfer(self,
+                 src: str,
+                 dst: str,
+                 amount: float) -> tuple[float, float]:
+        """
+        Move money between two accounts atomically.
+        
+        Both accounts are locked (in a fixed global order, so concurrent
+        transfers cannot deadlock) and both new balances are written in
+        a single storage record.
+        
+        Args:
+            src: DNI of the account to debit
+            dst: DNI of the account to credit
+            amount: Amount to move (positive)
+            
+        Returns:
+            The new (source, destination) balances
+            
+        Raises:
+            KeyError: If either account does not exist
+            ValueError: If the amount is not positive or src == dst
+            InsufficientFundsError: If the source balance is too low
+        """
+        if src == dst:
+            raise ValueError("Cannot transfer to the same account.")
+        if amount <= 0:
+            raise ValueError("Transfer amount must be positive.")
+        stripes = sorted({self._stripe(src), self._stripe(dst)})
+        for index in stripes:
+            self._locks[index].acquire()
+        try:
+            source = self.get_account(src)
+            target = self.get_account(dst)
+            saved = (source._save_balance(), target._save_balance())
+            source.withdraw(amount)
+            target.deposit(amount)
+            balances = (source.balance, target.balance)
+            record = {
+                "op": "update",
+                "balances": {src: balances[0], dst: balances[1]}
+            }
+            now = self._stamp(record, {src: TRANSFER_OUT, dst: TRANSFER_IN})
+            try:
+                ticket = self._storage.append(record)
+            except BaseException:
+                source._restore_balance(saved[0])
+                target._restore_balance(saved[1])
+                raise
+            self._index.update_balance(src, balances[0])
+            self._index.update_balance(dst, balances[1])
+            self._record(src, TRANSFER_OUT, balances[0], now)
+            self._record(dst, TRANSFER_IN, balances[1], now)
+        finally:
+            for index in reversed(stripes):
+                self._locks[index].release()
+        self._commit(ticket)
+        return balances
+
+    def create_accounts(self, accounts: Iterable) -> list[tuple[bool, object]]:
+        """
+        Create many accounts in one pass with a single durable commit.
+        
+        Duplicates are detected in the same pass, against both existing
+        accounts and earlier items. A failing item does not stop the
+        others.
+        
+        Args:
+            accounts: Iterable of (dni, iban[, initial_balance]) tuples or
+                dicts with "dni", "iban" and optional "initial_balance"
+            
+        Returns:
+            One (ok, value) pair per item: (True, BankAccount) or
+            (False, the exception that rejected it)
+        """
+        results = []
+        with self.batch():
+            for item in accounts:
+                try:
+                    if isinstance(item, Mapping):
+                        account = self.create_account(**item)
+                    else:
+                        account = self.create_account(*item)
+                    results.append((True, account))
+                except (ValueError, TypeError) as exc:
+                    results.append((False, exc))
+        return results
+
+    def apply_transactions(
+            self, transactions: Iterable) -> list[tuple[bool, object]]:
+        """
+        Apply many deposits, withdrawals and transfers in order.
+        
+        All of them share one durable commit. A failing item does not
+        stop the others.
+        
+        Args:
+            transactions: Iterable of tuples ("deposit", dni, amount),
+                ("withdraw", dni, amount) or ("transfer", src, dst,
+                amount), or dicts with an "op" key and the same names
+                as keyword arguments
+            
+        Returns:
+            One (ok, value) pair per item: (True, new balance, or the
+            (source, destination) balances for a transfer) or (False, the
+            exception that rejected it)
+        """
+        operations = {
+            "deposit": self.deposit,
+            "withdraw": self.withdraw,
+            "transfer": self.transfer
+        }
+        results = []
+        with self.batch():
+            for item in transactions:
+                try:
+                    if isinstance(item, Mapping):
+                        kwargs = dict(item)
+                        op, args = kwargs.pop("op", None), ()
+                    else:
+                        op, args, kwargs = item[0], item[1:], {}
+                    if op not in operations:
+                        raise ValueError(f"Unknown transaction: {item!r}")
+                    value = operations[op](*args, **kwargs)
+                    results.append((True, value))
+                except (KeyError, ValueError, TypeError,
+                        InsufficientFundsError) as exc:
+                    results.append((False, exc))
+        return results
+
+    def checkpoint(self):
+        """Write a storage snapshot now, compacting the change log."""
+        # All stripes, in index order, give a consistent point in time
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            self._storage.snapshot([(dni, acc.iban, acc.balance)
+                                    for dni, acc in self._accounts.items()])
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+    @contextmanager
+    def batch(self):
+        """
+        Group the calls made in a ``with`` block into one durable commit.
+        
+        Inside the block, operations take effect immediately but do not
+        wait for storage; the block waits once on exit for all of them.
+        Use it when results are reported only after the whole batch (as
+        the service layer does), so one flush covers many operations.
+        Blocks are per thread and may be nested.
+        """
+        outer = getattr(self._local, "pending", None)
+        self._local.pending = outer if outer is not None else 0
+        try:
+            yield self
+        finally:
+            if outer is None:
+                ticket = self._local.pending
+                self._local.pending = None
+                self._commit(ticket)
+
+    def close(self):
+        """Flush pending changes and close the storage backend."""
+        self._storage.close()
+
+    def _ledger_for(self, dni: str):
+        if self._ledger is None:
+            raise RuntimeError("This manager keeps no transaction ledger.")
+        self.get_account(dni)
+        return self._ledger.get(dni)
+
+    def _record(self, dni: str, kind: int, balance: float,
+                timestamp: Optional[float]):
+        if self._ledger is not None:
+            self._ledger.record(dni, kind, balance, timestamp)
+
+    def _stamp(self, record: dict,
+               kinds: Optional[dict] = None) -> Optional[float]:
+        # With a ledger, records for storage that keeps history carry the
+        # time and the kind of each change, so the ledger can be replayed
+        if self._ledger is None:
+            return None
+        now = self._ledger.now()
+        if not self._storage.keeps_history:
+            return now
+        record["time"] = now
+        if kinds:
+            record["kinds"] = {dni: KINDS[kind] for dni, kind in kinds.items()}
+        return now
+
+    def _resume_ledgers(self):
+        # After replaying stored history: drop the histories of deleted
+        # accounts and start (or re-sync) the others at their balance
+        for dni in self._ledger:
+            if dni not in self._accounts:
+                self._ledger.close(dni)
+        for dni, account in self._accounts.items():
+            if dni not in self._ledger:
+                self._ledger.open(dni, account.balance)
+            elif self._ledger.get(dni).balance != account.balance:
+                # Changed while no history was kept: mark the gap
+                self._ledger.record(dni, OPEN, account.balance)
+
+    def _lookup(self, dnis: list[str]) -> list[BankAccount]:
+        # Skips accounts deleted since the index was queried
+        accounts = []
+        for dni in dnis:
+            account = self._accounts.get(dni)
+            if account is not None:
+                accounts.append(account)
+        return accounts
+
+    def _stripe(self, dni: str) -> int:
+        return hash(dni) % len(self._locks)
+
+    def _lock_for(self, dni: str) -> threading.Lock:
+        return self._locks[self._stripe(dni)]
+
+    def _commit(self, ticket: int):
+        """
+        Wait until a change is durable, compacting the log when due.
+        
+        Called after the account locks are released: records are appended
+        in lock order, and concurrent callers share the storage flush.
+        Inside ``batch()`` the wait is deferred to the end of the block.
+        """
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            self._local.pending = max(pending, ticket)
+            return
+        self._storage.commit(ticket)
+        if (self._storage.wants_snapshot()
+                and self._checkpoint_lock.acquire(blocking=False)):
+            try:
+                if self._storage.wants_snapshot():
+                    self.checkpoint()
+            finally:
+                self._checkpoint_lock.release()
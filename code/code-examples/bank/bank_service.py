@@ -0,0 +1,501 @@
+"""
+Bank Service - Network Layer
+Asyncio front-end that exposes a BankManager over a local JSON API.
+
+Two protocols share one port:
+
+- JSON lines over TCP. Each request is one line,
+  ``{"id": 1, "op": "deposit", "args": {"dni": ..., "amount": 50}}``,
+  answered by ``{"id": 1, "ok": true, "result": ...}`` or
+  ``{"id": 1, "ok": false, "error": {"type": ..., "message": ...}}``.
+  Requests may be pipelined; responses carry the request id.
+- HTTP/1.1: ``POST /<op>`` with the arguments as a JSON body, for example
+  ``curl -d '{"dni": "12345678Z"}' localhost:8765/get``.
+
+A line longer than the stream limit (64 KiB) gets an error response and
+closes the connection, since the rest of the stream cannot be framed.
+
+Operations: create, get, deposit, withdraw, transfer, delete, count.
+
+Requests from all connections go through one queue. A batcher task
+takes everything queued, runs it in a worker thread inside
+``BankManager.batch()`` and then answers every request in the batch, so a
+burst of N operations costs one storage flush instead of N. The event
+loop itself never blocks, so one process can hold thousands of client
+connections.
+
+``BankClient`` is the asyncio client; ``ThreadedBankClient`` runs one on
+a background thread and returns ``concurrent.futures.Future`` objects, so
+a GUI can issue calls without blocking its main loop.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from bank_domain import InsufficientFundsError
+from bank_manager import BankManager
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BATCH = 512
+
+# Error type name -> (exception class raised by clients, HTTP status)
+ERRORS = {
+    "not_found": (KeyError, 404),
+    "invalid": (ValueError, 400),
+    "insufficient_funds": (InsufficientFundsError, 409),
+    "internal": (RuntimeError, 500),
+}
+
+_HTTP_REQUEST = re.compile(rb"^([A-Z]+) /(\S*) HTTP/1\.[01]\r?\n$")
+_HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+                 409: "Conflict", 500: "Internal Server Error"}
+_MALFORMED_LINE = (b'{"id":null,"ok":false,"error":{"type":'
+                   b'"invalid","message":"Malformed request"}}\n')
+_LONG_LINE = (b'{"id":null,"ok":false,"error":{"type":'
+              b'"invalid","message":"Line too long"}}\n')
+
+
+def _account_dict(account) -> dict:
+    return {"dni": account.dni, "iban": account.iban,
+            "balance": account.balance}
+
+
+def _error_type(exc: Exception) -> str:
+    if isinstance(exc, InsufficientFundsError):
+        return "insufficient_funds"
+    if isinstance(exc, KeyError):
+        return "not_found"
+    return "invalid"
+
+
+def _error_message(exc: Exception) -> str:
+    # KeyError wraps its message in quotes
+    return exc.args[0] if isinstance(exc, KeyError) and exc.args else str(exc)
+
+
+class BankService:
+    """
+    Serve a BankManager over TCP with batched execution.
+
+    Args:
+        manager: The manager to expose
+        host: Interface to listen on
+        port: TCP port (0 picks a free one; see ``port`` after start)
+        max_batch: Most requests executed per batch
+    """
+
+    def __init__(self,
+                 manager: BankManager,
+                 host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT,
+                 max_batch: int = MAX_BATCH):
+        self.manager = manager
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self._operations = {
+            "create": self._create,
+            "get": self._get,
+            "deposit": manager.deposit,
+            "withdraw": manager.withdraw,
+            "transfer": self._transfer,
+            "delete": manager.delete_account,
+            "count": manager.get_account_count,
+        }
+        self._queue = None
+        self._server = None
+        self._batcher = None
+        # Handler task -> writer of every open connection
+        self._connections = {}
+        # One worker: while a batch runs, the next one accumulates
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self.batches = 0
+        self.requests = 0
+
+    def _create(self, dni: str, iban: str, initial_balance: float = 0):
+        account = self.manager.create_account(dni, iban, initial_balance)
+        return _account_dict(account)
+
+    def _get(self, dni: str):
+        return _account_dict(self.manager.get_account(dni))
+
+    def _transfer(self, src: str, dst: str, amount: float):
+        return list(self.manager.transfer(src, dst, amount))
+
+    async def start(self):
+        """Start listening and processing batches."""
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._run_batches())
+        self._server = await asyncio.start_server(self._handle, self.host,
+                                                  self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Start (if needed) and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stop accepting connections, drop open ones, finish queued work."""
+        if self._server is not None:
+            self._server.close()
+            # wait_closed() also waits for every client to disconnect
+            # (Python 3.12+), so close the connections from this side
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            await self._queue.join()
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            # Requests queued after the drain would otherwise wait forever
+            while not self._queue.empty():
+                _, _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_result((False, {
+                        "type": "internal",
+                        "message": "Service closed"
+                    }))
+        self._executor.shutdown()
+
+    async def submit(self, op: str, args: dict):
+        """
+        Queue one operation and wait for its batch to finish.
+
+        Returns:
+            Tuple (ok, result_or_error) ready to be serialized
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((op, args, future))
+        return await future
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                results = await loop.run_in_executor(self._executor,
+                                                     self._execute, batch)
+            except Exception as exc:  # commit failed: nothing is durable
+                error = {"type": "internal", "message": str(exc)}
+                results = [(False, error)] * len(batch)
+            self.batches += 1
+            self.requests += len(batch)
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+                self._queue.task_done()
+
+    def _execute(self, batch: list) -> list:
+        """Run a batch in the worker thread with one durable commit."""
+        results = []
+        with self.manager.batch():
+            for op, args, _ in batch:
+                try:
+                    # Inside the try: an unhashable op raises TypeError
+                    func = self._operations.get(op)
+                    if func is None:
+                        raise ValueError(f"Unknown operation: {op}")
+                    results.append((True, func(**args)))
+                except (KeyError, ValueError, TypeError,
+                        InsufficientFundsError) as exc:
+                    results.append((False, {
+                        "type": _error_type(exc),
+                        "message": _error_message(exc)
+                    }))
+                except Exception as exc:  # a bug must not fail the others
+                    results.append((False, {
+                        "type": "internal",
+                        "message": str(exc)
+                    }))
+        return results
+
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            try:
+                first = await reader.readline()
+            except ValueError:  # longer than the stream limit
+                writer.write(_LONG_LINE)
+                return
+            if _HTTP_REQUEST.match(first):
+                await self._handle_http(first, reader, writer)
+            else:
+                await self._handle_lines(first, reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    async def _handle_lines(self, line, reader, writer):
+        tasks = set()
+        while line:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                request = None
+            if isinstance(request, dict):
+                task = asyncio.create_task(
+                    self._answer_line(request, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            else:
+                writer.write(_MALFORMED_LINE)
+            try:
+                line = await reader.readline()
+            except ValueError:  # the rest of the stream cannot be framed
+                writer.write(_LONG_LINE)
+                break
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _answer_line(self, request: dict, writer):
+        ok, payload = await self.submit(request.get("op"),
+                                        request.get("args") or {})
+        response = {"id": request.get("id"), "ok": ok}
+        response["result" if ok else "error"] = payload
+        writer.write(json.dumps(response).encode("utf-8") + b"\n")
+        await writer.drain()
+
+    async def _handle_http(self, line, reader, writer):
+        while line:
+            match = _HTTP_REQUEST.match(line)
+            if match is None:
+                break
+            headers = {}
+            while True:
+                try:
+                    header = await reader.readline()
+                except ValueError:
+                    await self._write_http(writer, False, {
+                        "type": "invalid", "message": "Header too long"})
+                    return
+                if header in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = header.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = headers.get("content-length", "0")
+            if not (length.isascii() and length.isdigit()):
+                # Without a valid length the next request cannot be found
+                await self._write_http(writer, False, {
+                    "type": "invalid", "message": "Invalid Content-Length"})
+                break
+            length = int(length)
+            body = await reader.readexactly(length) if length else b""
+            try:
+                args = json.loads(body) if body else {}
+            except ValueError:
+                args = None
+            if isinstance(args, dict):
+                ok, payload = await self.submit(match.group(2).decode(),
+                                                args)
+            else:
+                ok, payload = False, {"type": "invalid",
+                                      "message": "Malformed JSON body"}
+            await self._write_http(writer, ok, payload)
+            if headers.get("connection", "").lower() == "close":
+                break
+            try:
+                line = await reader.readline()
+            except ValueError:
+                await self._write_http(writer, False, {
+                    "type": "invalid", "message": "Request line too long"})
+                break
+
+    async def _write_http(self, writer, ok: bool, payload):
+        status = 200 if ok else ERRORS[payload["type"]][1]
+        data = json.dumps({"ok": ok, "result" if ok else "error":
+                           payload}).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {_HTTP_REASONS[status]}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\n\r\n"
+                     .encode("latin-1") + data)
+        await writer.drain()
+
+
+class BankClient:
+    """
+    Asyncio client for BankService (JSON lines, pipelined).
+
+    Many coroutines may share one client; requests are matched to
+    responses by id.
+    """
+
+    def __init__(self):
+        self._reader = None
+        self._writer = None
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._receiver = None
+
+    async def connect(self, host: str = DEFAULT_HOST,
+                      port: int = DEFAULT_PORT):
+        """Open the connection to the service."""
+        self._reader, self._writer = await asyncio.open_connection(
+            host, port)
+        self._receiver = asyncio.create_task(self._receive())
+        return self
+
+    async def close(self):
+        """Close the connection."""
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+        if self._receiver is not None:
+            await asyncio.gather(self._receiver, return_exceptions=True)
+
+    async def _receive(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response["id"], None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(
+                        ConnectionError("Connection to bank service lost"))
+            self._pending.clear()
+
+    async def call(self, op: str, **args):
+        """
+        Run one operation on the service.
+
+        Raises:
+            KeyError, ValueError or InsufficientFundsError, mirroring
+            the errors BankManager raises locally
+        """
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        message = {"id": request_id, "op": op, "args": args}
+        self._writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        await self._writer.drain()
+        response = await future
+        if response["ok"]:
+            return response["result"]
+        error = response["error"]
+        raise ERRORS.get(error["type"], (ValueError,))[0](error["message"])
+
+    async def create_account(self, dni, iban, initial_balance=0):
+        return await self.call("create", dni=dni, iban=iban,
+                               initial_balance=initial_balance)
+
+    async def get_account(self, dni):
+        return await self.call("get", dni=dni)
+
+    async def deposit(self, dni, amount):
+        return await self.call("deposit", dni=dni, amount=amount)
+
+    async def withdraw(self, dni, amount):
+        return await self.call("withdraw", dni=dni, amount=amount)
+
+    async def transfer(self, src, dst, amount):
+        return await self.call("transfer", src=src, dst=dst, amount=amount)
+
+    async def delete_account(self, dni):
+        return await self.call("delete", dni=dni)
+
+    async def get_account_count(self):
+        return await self.call("count")
+
+
+class ThreadedBankClient:
+    """
+    Non-blocking client for GUIs and other synchronous code.
+
+    Runs a BankClient on its own event-loop thread. Every method returns
+    a ``concurrent.futures.Future`` immediately; poll ``done()`` (e.g.
+    from Tk's ``after``) or add a callback. Callbacks run on the client
+    thread, so GUI code must hand results back to its own thread.
+
+    Args:
+        host: Service host
+        port: Service port
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        daemon=True)
+        self._thread.start()
+        self._client = BankClient()
+        self._submit(self._client.connect(host, port)).result()
+
+    def _submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def create_account(self, dni, iban, initial_balance=0):
+        return self._submit(
+            self._client.create_account(dni, iban, initial_balance))
+
+    def get_account(self, dni):
+        return self._submit(self._client.get_account(dni))
+
+    def deposit(self, dni, amount):
+        return self._submit(self._client.deposit(dni, amount))
+
+    def withdraw(self, dni, amount):
+        return self._submit(self._client.withdraw(dni, amount))
+
+    def transfer(self, src, dst, amount):
+        return self._submit(self._client.transfer(src, dst, amount))
+
+    def delete_account(self, dni):
+        return self._submit(self._client.delete_account(dni))
+
+    def get_account_count(self):
+        return self._submit(self._client.get_account_count())
+
+    def close(self):
+        """Close the connection and stop the client thread."""
+        self._submit(self._client.close()).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the bank service.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--wal",
+                        metavar="DIR",
+                        help="persist to a write-ahead log in DIR")
+    args = parser.parse_args()
+
+    storage = None
+    if args.wal:
+        from bank_storage import WALStorage
+        storage = WALStorage(args.wal)
+    manager = BankManager(storage)
+    service = BankService(manager, args.host, args.port)
+    print(f"Bank service listening on {args.host}:{args.port}")
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
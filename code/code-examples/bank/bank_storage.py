@@ -0,0 +1,452 @@
+"""
+Bank Storage - Persistence Layer
+Storage backends that let BankManager state survive restarts.
+
+The manager sends one record per state change:
+
+    {"op": "create", "dni": ..., "iban": ..., "balance": ...}
+    {"op": "update", "balances": {dni: balance, ...}}
+    {"op": "delete", "dni": ...}
+
+Records carry resulting balances rather than amounts, so applying a record
+twice is harmless. That keeps recovery simple: load the last snapshot,
+then replay the log on top of it.
+
+Transaction history is opt-in (``history=True`` on the WAL and SQLite
+backends). The manager then stamps records with a ``"time"`` and, for
+updates, the kind of change per account (``"kinds": {dni: "deposit",
+...}``), and the backend keeps those records permanently, snapshots
+notwithstanding, so ``load_history`` can rebuild the ledger after a
+restart. That log is never compacted: it costs a second append per
+change and start-up reads all of it, so by default no history is kept
+and recovery reads one snapshot plus the log since it.
+
+Writing is split in two steps so that concurrent callers can share disk
+flushes (group commit): ``append`` queues a record and returns a ticket,
+and ``commit`` waits until that ticket is durable. While one caller
+flushes, the others keep appending, and the next flush covers all of them.
+"""
+import json
+import os
+import sqlite3
+import threading
+from typing import Callable, Iterable, Optional
+
+
+def apply_record(state: dict, record: dict) -> None:
+    """
+    Apply one storage record to a ``{dni: [iban, balance]}`` mapping.
+
+    Args:
+        state: Mapping to update in place
+        record: A create, update or delete record
+    """
+    op = record["op"]
+    if op == "create":
+        state[record["dni"]] = [record["iban"], record["balance"]]
+    elif op == "update":
+        for dni, balance in record["balances"].items():
+            state[dni][1] = balance
+    elif op == "delete":
+        state.pop(record["dni"], None)
+    else:
+        raise ValueError(f"Unknown storage record: {op}")
+
+
+class StorageBackend:
+    """
+    Interface for BankManager storage backends.
+
+    Subclasses implement ``load``, ``append`` and ``commit``; snapshots,
+    history and ``close`` are optional.
+    """
+
+    #: True when ``load_history`` returns the stamped records
+    keeps_history = False
+
+    def load(self) -> dict[str, tuple[str, float]]:
+        """
+        Recover the stored state.
+
+        Returns:
+            Dictionary mapping DNI to (IBAN, balance)
+        """
+        raise NotImplementedError
+
+    def load_history(self) -> Iterable[dict]:
+        """
+        Recover the records that carry a "time", oldest first.
+
+        Unlike ``load``, this includes records already folded into a
+        snapshot. Call it after ``load``. Backends without
+        ``keeps_history`` return nothing.
+
+        Returns:
+            Iterable of create, update and delete records
+        """
+        return ()
+
+    def append(self, record: dict) -> int:
+        """
+        Queue a record; cheap, does not wait for the disk.
+
+        Args:
+            record: A create, update or delete record
+
+        Returns:
+            Ticket to pass to ``commit``
+        """
+        raise NotImplementedError
+
+    def commit(self, ticket: int) -> None:
+        """
+        Block until every record up to ``ticket`` is durable.
+
+        Args:
+            ticket: Value returned by ``append``
+        """
+        raise NotImplementedError
+
+    def wants_snapshot(self) -> bool:
+        """Return True when the log has grown enough to compact."""
+        return False
+
+    def snapshot(self, accounts: Iterable[tuple[str, str, float]]) -> None:
+        """
+        Replace the log with a snapshot of the full state.
+
+        Args:
+            accounts: (DNI, IBAN, balance) for every account
+        """
+
+    def close(self) -> None:
+        """Flush and release any resources."""
+
+
+class MemoryStorage(StorageBackend):
+    """Storage that keeps nothing; the default, matching the old behaviour."""
+
+    def load(self) -> dict[str, tuple[str, float]]:
+        return {}
+
+    def append(self, record: dict) -> int:
+        return 0
+
+    def commit(self, ticket: int) -> None:
+        pass
+
+
+class _GroupCommitStorage(StorageBackend):
+    """
+    Shared group-commit protocol.
+
+    Every ``append`` gets an increasing ticket. In ``commit`` the first
+    waiter becomes the leader and flushes everything appended so far; the
+    others wait on the condition and usually find their ticket covered
+    when the leader finishes, so N concurrent commits cost about one flush.
+    Subclasses implement ``_write`` and ``_flush``.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._written = 0
+        self._synced = 0
+        self._syncing = False
+
+    def _write(self, record: dict) -> None:
+        raise NotImplementedError
+
+    def _flush(self) -> Optional[Callable[[], None]]:
+        """
+        Flush under the lock; may return a slow step to run unlocked.
+        """
+        raise NotImplementedError
+
+    def append(self, record: dict) -> int:
+        with self._cond:
+            self._write(record)
+            self._written += 1
+            return self._written
+
+    def commit(self, ticket: int) -> None:
+        with self._cond:
+            while self._synced < ticket:
+                if self._syncing:
+                    self._cond.wait()
+                    continue
+                self._syncing = True
+                target = self._written
+                try:
+                    slow_step = self._flush()
+                    if slow_step is not None:
+                        self._cond.release()
+                        try:
+                            slow_step()
+                        finally:
+                            self._cond.acquire()
+                    self._synced = max(self._synced, target)
+                finally:
+                    self._syncing = False
+                    self._cond.notify_all()
+
+    def _wait_idle(self) -> None:
+        """Wait for an in-flight flush; call with the lock held."""
+        while self._syncing:
+            self._cond.wait()
+
+
+def _drop_torn_line(f) -> None:
+    """Cut an append-mode binary file back to its last complete line."""
+    size = f.seek(0, os.SEEK_END)
+    if size == 0:
+        return
+    with open(f.name, "rb") as reader:
+        reader.seek(size - 1)
+        if reader.read(1) == b"\n":
+            return
+        # Walk back to the newline that ends the last complete line
+        end = size - 1
+        while end > 0:
+            start = max(0, end - 4096)
+            reader.seek(start)
+            block = reader.read(end - start)
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                f.truncate(start + newline + 1)
+                return
+            end = start
+    f.truncate(0)
+
+
+def _fsync_dir(path: str) -> None:
+    """Persist a rename on POSIX systems; a no-op elsewhere."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class WALStorage(_GroupCommitStorage):
+    """
+    Append-only write-ahead log with periodic snapshots.
+
+    The directory holds ``snapshot.jsonl`` (one ``[dni, iban, balance]``
+    per line) and ``wal.jsonl`` (one record per line, appended since that
+    snapshot). After ``snapshot_interval`` records the manager writes a new
+    snapshot and the log is truncated, so recovery reads at most one
+    snapshot plus ``snapshot_interval`` records. With ``history``,
+    records with a "time" are also appended to ``history.jsonl``, which
+    is never truncated and is flushed together with the log.
+
+    Args:
+        directory: Directory for the files (created if missing)
+        snapshot_interval: Log records between snapshots
+        sync: fsync on commit (disable only for tests and benchmarks)
+        history: Keep every stamped record for the transaction ledger
+    """
+
+    SNAPSHOT = "snapshot.jsonl"
+    LOG = "wal.jsonl"
+    HISTORY = "history.jsonl"
+
+    def __init__(self,
+                 directory: str,
+                 snapshot_interval: int = 10_000,
+                 sync: bool = True,
+                 history: bool = False):
+        super().__init__()
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.snapshot_interval = snapshot_interval
+        self.sync = sync
+        self.keeps_history = history
+        self._snapshot_path = os.path.join(directory, self.SNAPSHOT)
+        self._log_path = os.path.join(directory, self.LOG)
+        self._history_path = os.path.join(directory, self.HISTORY)
+        self._since_snapshot = 0
+        self._file = None
+        self._history = None
+
+    def load(self) -> dict[str, tuple[str, float]]:
+        state = {}
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, encoding="utf-8") as f:
+                for line in f:
+                    dni, iban, balance = json.loads(line)
+                    state[dni] = [iban, balance]
+
+        replayed = 0
+        valid_size = 0
+        if os.path.exists(self._log_path):
+            with open(self._log_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn final write from a crash
+                    apply_record(state, json.loads(line))
+                    replayed += 1
+                    valid_size += len(line)
+        self._file = open(self._log_path, "ab")
+        self._file.truncate(valid_size)
+        self._since_snapshot = replayed
+        if self.keeps_history:
+            self._history = open(self._history_path, "ab")
+            _drop_torn_line(self._history)
+        return {dni: tuple(value) for dni, value in state.items()}
+
+    def load_history(self) -> Iterable[dict]:
+        if not self.keeps_history:
+            return
+        if self._history is None:
+            raise RuntimeError("Storage not loaded; call load() first.")
+        with open(self._history_path, "rb") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def _write(self, record: dict) -> None:
+        if self._file is None:
+            raise RuntimeError("Storage not loaded; call load() first.")
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode(
+            "utf-8")
+        self._file.write(line)
+        if self._history is not None and "time" in record:
+            self._history.write(line)
+        self._since_snapshot += 1
+
+    def _flush(self) -> Optional[Callable[[], None]]:
+        files = [f for f in (self._file, self._history) if f is not None]
+        for f in files:
+            f.flush()
+        if not self.sync:
+            return None
+        fds = [f.fileno() for f in files]
+
+        def sync():
+            for fd in fds:
+                os.fsync(fd)
+        return sync
+
+    def wants_snapshot(self) -> bool:
+        return self._since_snapshot >= self.snapshot_interval
+
+    def snapshot(self, accounts: Iterable[tuple[str, str, float]]) -> None:
+        tmp_path = self._snapshot_path + ".tmp"
+        with self._cond:
+            self._wait_idle()
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for account in accounts:
+                    f.write(json.dumps(account, separators=(",", ":")))
+                    f.write("\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._snapshot_path)
+            _fsync_dir(self.directory)
+            # Records already in the snapshot may stay in the log if we
+            # crash here; replaying them again is harmless.
+            self._file.seek(0)
+            self._file.truncate()
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            if self._history is not None:
+                # The history is not in the snapshot; make it durable too
+                self._history.flush()
+                os.fsync(self._history.fileno())
+            self._since_snapshot = 0
+            self._synced = self._written
+
+    def close(self) -> None:
+        with self._cond:
+            self._wait_idle()
+            for f in (self._file, self._history):
+                if f is not None:
+                    f.flush()
+                    if self.sync:
+                        os.fsync(f.fileno())
+                    f.close()
+            self._file = self._history = None
+            self._synced = self._written
+
+
+class SQLiteStorage(_GroupCommitStorage):
+    """
+    Storage in an SQLite database (one row per account).
+
+    Records are applied inside an open transaction; ``commit`` commits it,
+    so concurrent operations share one transaction commit. SQLite's own
+    write-ahead journal provides crash safety, and recovery is a single
+    table scan. With ``history``, records with a "time" are also kept,
+    as JSON, in a ``history`` table in the same transaction.
+
+    Args:
+        path: Database file
+        synchronous: SQLite ``synchronous`` pragma ("FULL" is durable on
+            power loss, "NORMAL" only on application crash)
+        history: Keep every stamped record for the transaction ledger
+    """
+
+    def __init__(self, path: str, synchronous: str = "FULL",
+                 history: bool = False):
+        super().__init__()
+        if synchronous.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"Invalid synchronous mode: {synchronous}")
+        self.path = path
+        self.keeps_history = history
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous.upper()}")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS accounts ("
+                           "dni TEXT PRIMARY KEY, "
+                           "iban TEXT NOT NULL, "
+                           "balance REAL NOT NULL)")
+        if history:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS history ("
+                               "id INTEGER PRIMARY KEY, "
+                               "record TEXT NOT NULL)")
+        self._conn.commit()
+
+    def load(self) -> dict[str, tuple[str, float]]:
+        with self._cond:
+            rows = self._conn.execute(
+                "SELECT dni, iban, balance FROM accounts")
+            return {dni: (iban, balance) for dni, iban, balance in rows}
+
+    def load_history(self) -> Iterable[dict]:
+        if not self.keeps_history:
+            return []
+        with self._cond:
+            rows = self._conn.execute(
+                "SELECT record FROM history ORDER BY id").fetchall()
+        return [json.loads(record) for (record,) in rows]
+
+    def _write(self, record: dict) -> None:
+        if self.keeps_history and "time" in record:
+            self._conn.execute(
+                "INSERT INTO history (record) VALUES (?)",
+                (json.dumps(record, separators=(",", ":")),))
+        op = record["op"]
+        if op == "create":
+            self._conn.execute(
+                "INSERT OR REPLACE INTO accounts VALUES (?, ?, ?)",
+                (record["dni"], record["iban"], record["balance"]))
+        elif op == "update":
+            self._conn.executemany(
+                "UPDATE accounts SET balance = ? WHERE dni = ?",
+                [(balance, dni)
+                 for dni, balance in record["balances"].items()])
+        elif op == "delete":
+            self._conn.execute("DELETE FROM accounts WHERE dni = ?",
+                               (record["dni"],))
+        else:
+            raise ValueError(f"Unknown storage record: {op}")
+
+    def _flush(self) -> Optional[Callable[[], None]]:
+        self._conn.commit()
+        return None
+
+    def close(self) -> None:
+        with self._cond:
+            self._wait_idle()
+            self._conn.commit()
+            self._conn.close()
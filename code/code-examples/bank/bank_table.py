@@ -0,0 +1,170 @@
+"""
+Bank Table - Columnar Account Storage
+A compact, array-backed account registry for very large banks.
+
+Instead of one Python object per account, ``AccountTable`` keeps three
+columns: DNIs and IBANs in lists and balances as integer cents in an
+``array('q')``, 8 bytes per account. IBAN strings are interned, so
+accounts that share one store it once. DNIs are not interned: each is
+unique, so interning would save nothing and only add an intern-table
+entry per account. The row index and the DNI column share one string.
+
+Looking up an account returns a small ``TableAccount`` view with the
+usual BankAccount interface, whose deposits and withdrawals write
+straight into the balance column.
+
+Use it as the BankManager registry:
+
+    manager = BankManager(account_class=CompactAccount,
+                          registry=AccountTable())
+"""
+import sys
+import threading
+from array import array
+from collections.abc import MutableMapping
+
+from bank_domain import InsufficientFundsError, to_cents
+
+
+class TableAccount:
+    """
+    View of one row of an AccountTable.
+
+    Views are created on demand and hold no data of their own. Using a
+    view after its account was deleted raises KeyError.
+    """
+
+    __slots__ = ("_table", "_row", "_dni")
+
+    def __init__(self, table: "AccountTable", row: int, dni: str):
+        self._table = table
+        self._row = row
+        self._dni = dni
+
+    def _check(self) -> int:
+        if self._table._dnis[self._row] != self._dni:
+            raise KeyError(f"Account with DNI {self._dni} was deleted.")
+        return self._row
+
+    @property
+    def dni(self) -> str:
+        return self._dni
+
+    @property
+    def iban(self) -> str:
+        return self._table._ibans[self._check()]
+
+    @property
+    def balance(self) -> float:
+        return self._table._cents[self._check()] / 100
+
+    @property
+    def balance_cents(self) -> int:
+        return self._table._cents[self._check()]
+
+    def deposit(self, amount):
+        """Add money to the account."""
+        cents = to_cents(amount)
+        if cents <= 0:
+            raise ValueError("Deposit amount must be positive.")
+        self._table._cents[self._check()] += cents
+
+    def withdraw(self, amount):
+        """Remove money from the account."""
+        cents = to_cents(amount)
+        if cents <= 0:
+            raise ValueError("Withdrawal amount must be positive.")
+        row = self._check()
+        if cents > self._table._cents[row]:
+            raise InsufficientFundsError("Insufficient funds.")
+        self._table._cents[row] -= cents
+
+    def _save_balance(self) -> int:
+        """Exact stored balance, for ``_restore_balance`` after a failure."""
+        return self._table._cents[self._check()]
+
+    def _restore_balance(self, saved: int):
+        """Put back a balance returned by ``_save_balance``."""
+        self._table._cents[self._check()] = saved
+
+    def __eq__(self, other):
+        if not isinstance(other, TableAccount):
+            return NotImplemented
+        return self._table is other._table and self._dni == other._dni
+
+    def __hash__(self):
+        return hash(self._dni)
+
+    def __str__(self):
+        """Return account information as a string."""
+        return (f"Account DNI: {self._dni}\n"
+                f"IBAN: {self.iban}\n"
+                f"Balance: ${self.balance:.2f}")
+
+
+class AccountTable(MutableMapping):
+    """
+    Mapping from DNI to account, stored column-wise.
+
+    Assigning an account copies its fields into the columns; reading
+    returns a TableAccount view. Rows freed by deletions are reused.
+    Structural changes (insert, delete) take an internal lock; balance
+    updates on a row rely on the caller's per-account locking, as with
+    BankManager.
+    """
+
+    def __init__(self):
+        self._rows = {}
+        self._dnis = []
+        self._ibans = []
+        self._cents = array("q")
+        self._free = []
+        self._lock = threading.Lock()
+
+    def __getitem__(self, dni: str) -> TableAccount:
+        return TableAccount(self, self._rows[dni], self._dnis[self._rows[dni]])
+
+    def __setitem__(self, dni: str, account):
+        cents = getattr(account, "balance_cents", None)
+        if cents is None:
+            cents = to_cents(account.balance)
+        iban = sys.intern(account.iban)
+        with self._lock:
+            row = self._rows.get(dni)
+            if row is None:
+                if self._free:
+                    row = self._free.pop()
+                else:
+                    row = len(self._dnis)
+                    self._dnis.append(None)
+                    self._ibans.append(None)
+                    self._cents.append(0)
+                self._rows[dni] = row
+            self._dnis[row] = dni
+            self._ibans[row] = iban
+            self._cents[row] = cents
+
+    def __delitem__(self, dni: str):
+        with self._lock:
+            row = self._rows.pop(dni)
+            self._dnis[row] = None
+            self._ibans[row] = None
+            self._cents[row] = 0
+            self._free.append(row)
+
+    def __contains__(self, dni) -> bool:
+        return dni in self._rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def copy(self) -> dict:
+        """Return a plain dict of views (a snapshot of the key set)."""
+        return {dni: self[dni] for dni in list(self._rows)}
+
+    def total_cents(self) -> int:
+        """Sum of every balance, straight from the balance column."""
+        return sum(self._cents)
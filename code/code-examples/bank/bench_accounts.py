@@ -0,0 +1,117 @@
+"""
+Memory and throughput benchmark for the account representations.
+
+Compares BankAccount (float balance, per-instance __dict__),
+CompactAccount (__slots__, integer cents) and AccountTable (columnar,
+balances in an array('q')): memory per account as measured by
+tracemalloc, deposit/withdraw throughput, and the rounding drift after
+many small deposits.
+
+Every account is built from its own DNI and IBAN strings, as when they
+are read from a file or a request, and the memory figure includes those
+strings. Each representation keeps them as it normally would, so the
+interned IBANs of AccountTable show up as savings.
+
+Usage:
+    python bench_accounts.py --accounts 200000 --ops 500000
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from bank_domain import BankAccount, CompactAccount
+from bank_table import AccountTable
+from bank_validation import DNI_LETTERS
+
+
+def spanish_iban(bban: str) -> str:
+    """IBAN with valid check digits for a 20-digit Spanish BBAN."""
+    # "ES00" moved to the end reads as 142800 (E=14, S=28)
+    return f"ES{98 - int(bban + '142800') % 97:02d}{bban}"
+
+
+IBANS = [spanish_iban(f"207700240031025757{i:02d}") for i in range(100)]
+
+
+def make_dni(i: int) -> str:
+    """The i-th valid DNI."""
+    return f"{i:08d}{DNI_LETTERS[i % 23]}"
+
+
+def rows(count: int):
+    """(dni, iban) pairs made of fresh strings, 100 distinct IBANs."""
+    for i in range(count):
+        # A new string each time, equal to one of IBANS
+        iban = IBANS[i % len(IBANS)]
+        yield make_dni(i), iban[:2] + iban[2:]
+
+
+def build(kind: str, count: int):
+    """Create ``count`` accounts in the given representation."""
+    if kind == "table":
+        registry = AccountTable()
+        for dni, iban in rows(count):
+            registry[dni] = CompactAccount(dni, iban, 100)
+        return registry
+    account_class = BankAccount if kind == "float" else CompactAccount
+    return {
+        dni: account_class(dni, iban, 100)
+        for dni, iban in rows(count)
+    }
+
+
+def measure_memory(kind: str, count: int) -> float:
+    """Bytes per account still allocated once the registry is built."""
+    gc.collect()
+    tracemalloc.start()
+    registry = build(kind, count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del registry
+    return size / count
+
+
+def measure_ops(kind: str, count: int, ops: int) -> float:
+    """Deposit/withdraw pairs per second through registry lookups."""
+    registry = build(kind, count)
+    rows_hit = random.Random(0).choices(range(count), k=ops)
+    targets = [make_dni(i) for i in rows_hit]
+    start = time.perf_counter()
+    for dni in targets:
+        account = registry[dni]
+        account.deposit(12.34)
+        account.withdraw(12.34)
+    return ops / (time.perf_counter() - start)
+
+
+def drift(kind: str, deposits: int) -> str:
+    """Balance after ``deposits`` deposits of 0.10 starting from zero."""
+    account_class = BankAccount if kind == "float" else CompactAccount
+    account = account_class("12345678Z", IBANS[0], 0)
+    for _ in range(deposits):
+        account.deposit(0.1)
+    return repr(account.balance)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--accounts", type=int, default=200_000)
+    parser.add_argument("--ops", type=int, default=500_000)
+    args = parser.parse_args()
+
+    print(f"{args.accounts} accounts, {args.ops} deposit+withdraw pairs")
+    print(f"{'representation':<16}{'bytes/account':>14}{'pairs/sec':>12}"
+          f"  balance after 10^5 x 0.10")
+    for kind, label in (("float", "BankAccount"),
+                        ("compact", "CompactAccount"),
+                        ("table", "AccountTable")):
+        memory = measure_memory(kind, args.accounts)
+        rate = measure_ops(kind, args.accounts, args.ops)
+        balance = drift("compact" if kind == "table" else kind, 100_000)
+        print(f"{label:<16}{memory:>14.0f}{rate:>12,.0f}  {balance}")
+
+
+if __name__ == "__main__":
+    main()
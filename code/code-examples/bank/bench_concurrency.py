@@ -0,0 +1,118 @@
+"""
+Multi-threaded stress benchmark for BankManager.
+
+Worker threads run a random mix of deposits, withdrawals and transfers
+against a shared manager, then the benchmark checks that money was
+conserved: the final total must equal the initial total plus every
+successful deposit minus every successful withdrawal. Amounts are whole
+numbers so the float arithmetic is exact.
+
+Usage:
+    python bench_concurrency.py --threads 8 --accounts 1000 --ops 20000
+    python bench_concurrency.py --storage wal    # include durable logging
+"""
+import argparse
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+from bank_domain import InsufficientFundsError
+from bank_manager import BankManager
+from bank_storage import SQLiteStorage, WALStorage
+from bank_validation import DNI_LETTERS
+
+IBAN = "ES7620770024003102575766"
+INITIAL_BALANCE = 1000
+
+
+def make_storage(kind: str, directory: str):
+    """Build the storage backend named on the command line."""
+    if kind == "wal":
+        return WALStorage(directory)
+    if kind == "sqlite":
+        return SQLiteStorage(f"{directory}/bank.db")
+    return None
+
+
+def worker(manager: BankManager, dnis: list, ops: int, seed: int,
+           totals: list, index: int):
+    """Run ``ops`` random operations and record the net money added."""
+    rng = random.Random(seed)
+    net = 0
+    for _ in range(ops):
+        kind = rng.random()
+        amount = rng.randint(1, 100)
+        try:
+            if kind < 0.25:
+                manager.deposit(rng.choice(dnis), amount)
+                net += amount
+            elif kind < 0.5:
+                manager.withdraw(rng.choice(dnis), amount)
+                net -= amount
+            else:
+                src, dst = rng.sample(dnis, 2)
+                manager.transfer(src, dst, amount)
+        except InsufficientFundsError:
+            pass
+    totals[index] = net
+
+
+def run(threads: int, accounts: int, ops: int, storage: str) -> bool:
+    """Run the benchmark; return True if balances were conserved."""
+    directory = tempfile.mkdtemp()
+    try:
+        manager = BankManager(make_storage(storage, directory))
+        dnis = [f"{i:08d}{DNI_LETTERS[i % 23]}" for i in range(accounts)]
+        for dni in dnis:
+            manager.create_account(dni, IBAN, INITIAL_BALANCE)
+
+        totals = [0] * threads
+        per_thread = ops // threads
+        workers = [
+            threading.Thread(target=worker,
+                             args=(manager, dnis, per_thread, seed, totals,
+                                   seed)) for seed in range(threads)
+        ]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        expected = INITIAL_BALANCE * accounts + sum(totals)
+        actual = sum(acc.balance
+                     for acc in manager.get_all_accounts().values())
+        negative = sum(1 for acc in manager.get_all_accounts().values()
+                       if acc.balance < 0)
+        manager.close()
+    finally:
+        shutil.rmtree(directory)
+
+    done = per_thread * threads
+    print(f"{threads} threads, {accounts} accounts, storage={storage}")
+    print(f"  {done} ops in {elapsed:.2f}s = {done / elapsed:,.0f} ops/sec")
+    print(f"  total balance {actual} (expected {expected}), "
+          f"{negative} negative balances")
+    ok = actual == expected and negative == 0
+    print("  conserved" if ok else "  FAILED: money was created or lost")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--ops", type=int, default=20_000)
+    parser.add_argument("--storage",
+                        choices=("memory", "wal", "sqlite"),
+                        default="memory")
+    args = parser.parse_args()
+    ok = run(args.threads, args.accounts, args.ops, args.storage)
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Tests for the GUI's background worker and selector paging (no window is
+opened).
+"""
+import threading
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from bank_gui import PAGE_SIZE, ManagerWorker, account_page  # noqa: E402
+from bank_manager import BankManager  # noqa: E402
+from bank_validation import DNI_LETTERS  # noqa: E402
+
+IBAN_1, IBAN_2 = "ES9121000418450200051332", "ES7921000813610123456789"
+
+
+def _finish(worker):
+    worker.stop()
+    worker._thread.join(timeout=5)
+    worker.poll()
+
+
+def test_worker_dispatches_results_and_errors_on_the_polling_thread():
+    """Callbacks run from poll(), in submission order, never on the worker."""
+    worker = ManagerWorker()
+    calls = []
+
+    def record(name):
+        return lambda value: calls.append(
+            (name, value, threading.current_thread().name))
+
+    def fail():
+        raise KeyError("missing")
+
+    worker.submit(pow, 2, 10, on_done=record("done"))
+    worker.submit(fail, on_done=record("done"), on_error=record("error"))
+    worker.submit(len, "abc")  # no callbacks: the result is dropped
+    worker.submit(sum, [1, 2], on_done=record("done"))
+    _finish(worker)
+
+    here = threading.current_thread().name
+    assert [(name, thread) for name, _, thread in calls] == [
+        ("done", here), ("error", here), ("done", here)]
+    assert calls[0][1] == 1024 and calls[2][1] == 3
+    assert isinstance(calls[1][1], KeyError)
+
+
+class FakeRoot:
+    """Records after() calls and reported errors instead of running Tk."""
+
+    def __init__(self):
+        self.scheduled = []
+        self.reported = []
+
+    def after(self, interval, func):
+        self.scheduled.append(func)
+
+    def report_callback_exception(self, exc_type, exc, tb):
+        self.reported.append(exc)
+
+
+def test_failing_callback_does_not_stop_polling():
+    """A callback that raises is reported; later results still arrive."""
+    worker = ManagerWorker()
+    root = FakeRoot()
+    worker.attach(root)
+    results = []
+
+    def broken(value):
+        raise RuntimeError("bad callback")
+
+    worker.submit(pow, 2, 3, on_done=broken)
+    worker.submit(pow, 3, 2, on_done=results.append)
+    worker.stop()
+    worker._thread.join(timeout=5)
+
+    root.scheduled.pop()()  # first tick
+    assert results == [9]
+    assert [str(exc) for exc in root.reported] == ["bad callback"]
+    assert len(root.scheduled) == 1  # the next tick is still scheduled
+
+
+def test_account_page_walks_every_match_once():
+    """Pages of PAGE_SIZE cover the matches in order; has_more ends it."""
+    manager = BankManager()
+    count = 2 * PAGE_SIZE + 7
+    for i in range(count):
+        manager.create_account(f"1{i:07d}{DNI_LETTERS[(10**7 + i) % 23]}",
+                               (IBAN_1, IBAN_2)[i % 2])
+    manager.create_account("20000000" + DNI_LETTERS[2 * 10**7 % 23], IBAN_1)
+
+    pages, after, has_more = [], None, True
+    while has_more:
+        entries, has_more = account_page(manager, "1", after)
+        pages.append(entries)
+        after = entries[-1][0]
+
+    assert [len(page) for page in pages] == [PAGE_SIZE, PAGE_SIZE, 7]
+    entries = [entry for page in pages for entry in page]
+    assert entries == sorted(
+        (dni, manager.get_account(dni).iban)
+        for dni in manager.get_all_accounts() if dni.startswith("1"))
+    assert account_page(manager, "3") == ([], False)
@@ -0,0 +1,43 @@
+"""
+Tests for bank_io imports: one unparsable line must not abort the rest.
+"""
+import pytest
+
+from bank_io import import_accounts, read_accounts
+from bank_manager import BankManager
+
+DNI_1, IBAN_1 = "12345678Z", "ES9121000418450200051332"
+DNI_2, IBAN_2 = "87654321X", "ES7921000813610123456789"
+
+
+def test_short_csv_row_is_reported(tmp_path):
+    """A CSV row without an IBAN is rejected with its line number."""
+    path = tmp_path / "accounts.csv"
+    path.write_text(f"dni,iban,balance\n{DNI_1},{IBAN_1},10\n"
+                    f"99999999R\n{DNI_2},{IBAN_2},20\n")
+    manager = BankManager()
+
+    report = import_accounts(manager, str(path))
+
+    assert report["created"] == 2
+    assert report["errors"] == [(2, "line 3: missing field 'iban'")]
+    assert manager.get_account(DNI_2).balance == 20
+
+
+def test_bad_json_line_is_reported(tmp_path):
+    """An invalid JSON line is rejected with its line number."""
+    path = tmp_path / "accounts.jsonl"
+    path.write_text(f'{{"dni": "{DNI_1}", "iban": "{IBAN_1}"}}\n'
+                    '{"dni": "99999999R", "iban": \n'
+                    f'{{"dni": "{DNI_2}", "iban": "{IBAN_2}", "balance": 5}}\n')
+    manager = BankManager()
+
+    report = import_accounts(manager, str(path), chunk_size=2)
+
+    assert report["created"] == 2
+    assert report["failed"] == 1
+    position, message = report["errors"][0]
+    assert position == 2 and message.startswith("line 2: invalid JSON")
+
+    with pytest.raises(ValueError, match="line 2"):
+        list(read_accounts(str(path)))
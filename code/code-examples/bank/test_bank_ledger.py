@@ -0,0 +1,156 @@
+"""
+Tests for the transaction ledger: point-in-time balances and statements.
+"""
+import itertools
+import json
+import random
+
+import pytest
+
+from bank_ledger import DEPOSIT, WITHDRAW, LedgerBook
+from bank_manager import BankManager
+from bank_storage import SQLiteStorage, WALStorage
+
+DNI, IBAN = "12345678Z", "ES9121000418450200051332"
+
+
+@pytest.fixture
+def history():
+    """A ledger ticking one second per entry, and its (time, balance) log."""
+    clock = itertools.count(1000)
+    book = LedgerBook(clock=lambda: float(next(clock)))
+    rng = random.Random(3)
+    balance = 100.0
+    book.open(DNI, balance)
+    log = [(1000, balance)]
+    for timestamp in range(1001, 1201):
+        change = rng.randint(1, 5000) / 100
+        kind = DEPOSIT if rng.random() < 0.6 or balance < change else WITHDRAW
+        balance = round(balance + (change if kind == DEPOSIT else -change), 2)
+        book.record(DNI, kind, balance)
+        log.append((timestamp, balance))
+    return book.get(DNI), log
+
+
+def test_balance_at_every_moment(history):
+    """Each moment gives the balance after the last entry up to it."""
+    ledger, log = history
+    assert ledger.balance_at(999.5) is None
+    for timestamp, balance in log:
+        assert ledger.balance_at(timestamp) == balance
+        assert ledger.balance_at(timestamp + 0.5) == balance
+
+
+def test_entries_between_bounds(history):
+    """entries(start, end) yields the half-open range with running balances."""
+    ledger, log = history
+    entries = list(ledger.entries(1070, 1140))
+    assert [(e.timestamp, e.balance) for e in entries] == [
+        (t, b) for t, b in log if 1070 <= t < 1140]
+    previous = log[69][1]
+    for entry in entries:
+        assert entry.kind in ("deposit", "withdraw")
+        assert entry.amount == pytest.approx(entry.balance - previous)
+        previous = entry.balance
+    assert list(ledger.entries(5000)) == []
+
+
+def test_clock_going_backwards_keeps_order():
+    """Entries recorded after the clock steps back keep non-decreasing times."""
+    times = iter([10.0, 12.0, 11.0])
+    book = LedgerBook(clock=lambda: next(times))
+    book.open(DNI, 0)
+    book.record(DNI, DEPOSIT, 5)
+    book.record(DNI, DEPOSIT, 7)
+    assert [e.timestamp for e in book.get(DNI).entries()] == [10, 12, 12]
+    assert book.get(DNI).balance_at(12) == 7
+
+
+def test_statement_pages():
+    """Statements come in full pages, oldest first, ending at the balance."""
+    manager = BankManager()
+    manager.create_account(DNI, IBAN, 10)
+    for _ in range(120):
+        manager.deposit(DNI, 1)
+    manager.withdraw(DNI, 30)
+
+    pages = list(manager.statement(DNI, page_size=50))
+
+    assert [len(page) for page in pages] == [50, 50, 22]
+    entries = [entry for page in pages for entry in page]
+    assert [entry.kind for entry in entries] == (
+        ["open"] + ["deposit"] * 120 + ["withdraw"])
+    assert entries[-1].balance == manager.get_account(DNI).balance == 100
+    with pytest.raises(ValueError):
+        manager.statement(DNI, page_size=0)
+    with pytest.raises(RuntimeError):
+        BankManager(ledger=False).statement(DNI)
+
+
+def test_sub_cent_amounts_keep_ledger_and_account_in_step():
+    """Float balances are recorded exactly, fractions of a cent included."""
+    manager = BankManager()
+    manager.create_account(DNI, IBAN, 0.1)
+    for amount in (0.2, 0.004, 0.0005):
+        manager.deposit(DNI, amount)
+    manager.withdraw(DNI, 0.001)
+
+    balance = manager.get_account(DNI).balance
+    assert manager.balance_at(DNI, 1e12) == balance
+    entries = [e for page in manager.statement(DNI) for e in page]
+    assert entries[-1].balance == balance
+    assert [e.amount for e in entries] == pytest.approx(
+        [0.1, 0.2, 0.004, 0.0005, -0.001])
+
+
+@pytest.mark.parametrize("backend", ["wal", "sqlite"])
+def test_history_survives_restart(tmp_path, backend):
+    """The ledger is rebuilt from storage, across snapshots and deletes."""
+    def open_storage():
+        if backend == "wal":
+            return WALStorage(str(tmp_path), snapshot_interval=3,
+                              sync=False, history=True)
+        return SQLiteStorage(str(tmp_path / "bank.db"), synchronous="OFF",
+                             history=True)
+
+    other = "87654321X", "ES7921000813610123456789"
+    manager = BankManager(storage=open_storage())
+    manager.create_account(DNI, IBAN, 10)
+    manager.create_account(*other, 5)
+    manager.deposit(DNI, 2.5)
+    manager.checkpoint()
+    manager.transfer(DNI, other[0], 1)
+    manager.delete_account(other[0])
+    manager.withdraw(DNI, 0.5)
+    before = [e for page in manager.statement(DNI) for e in page]
+    manager.close()
+
+    reopened = BankManager(storage=open_storage())
+    after = [e for page in reopened.statement(DNI) for e in page]
+    assert after == before
+    assert [e.kind for e in after] == [
+        "open", "deposit", "transfer_out", "withdraw"]
+    assert reopened.balance_at(DNI, before[1].timestamp) == 12.5
+    with pytest.raises(KeyError):
+        reopened.statement(other[0])
+    reopened.close()
+
+
+def test_history_is_not_stored_by_default(tmp_path):
+    """Without history=True the log holds plain records and is compacted."""
+    manager = BankManager(storage=WALStorage(str(tmp_path), sync=False))
+    manager.create_account(DNI, IBAN, 10)
+    manager.deposit(DNI, 5)
+    with open(tmp_path / WALStorage.LOG, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert all("time" not in r and "kinds" not in r for r in records)
+    manager.checkpoint()
+    manager.close()
+    assert not (tmp_path / WALStorage.HISTORY).exists()
+    assert (tmp_path / WALStorage.LOG).stat().st_size == 0
+
+    # The ledger starts afresh at the stored balance
+    reopened = BankManager(storage=WALStorage(str(tmp_path), sync=False))
+    entries = [e for page in reopened.statement(DNI) for e in page]
+    assert [(e.kind, e.balance) for e in entries] == [("open", 15)]
+    reopened.close()
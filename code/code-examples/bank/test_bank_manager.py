@@ -0,0 +1,160 @@
+"""
+Tests for BankManager: storage ordering, thread safety and the secondary
+indexes.
+"""
+import random
+import threading
+
+import pytest
+
+from bank_domain import CompactAccount, InsufficientFundsError
+from bank_index import SortedList
+from bank_manager import BankManager
+from bank_storage import MemoryStorage
+from bank_table import AccountTable
+from bank_validation import DNI_LETTERS
+
+DNI_1, IBAN_1 = "12345678Z", "ES9121000418450200051332"
+DNI_2, IBAN_2 = "87654321X", "ES7921000813610123456789"
+
+
+class FailingStorage(MemoryStorage):
+    """Accepts account creation, then fails every later append."""
+
+    def append(self, record: dict) -> int:
+        if record["op"] != "create":
+            raise OSError("disk full")
+        return 0
+
+
+def test_failed_append_leaves_balances_unchanged():
+    """A change storage rejects is not applied in memory either."""
+    manager = BankManager(storage=FailingStorage())
+    manager.create_account(DNI_1, IBAN_1, 100)
+    manager.create_account(DNI_2, IBAN_2, 50)
+
+    for call in (lambda: manager.deposit(DNI_1, 10),
+                 lambda: manager.withdraw(DNI_1, 10),
+                 lambda: manager.transfer(DNI_1, DNI_2, 10)):
+        with pytest.raises(OSError):
+            call()
+
+    assert manager.get_account(DNI_1).balance == 100
+    assert manager.get_account(DNI_2).balance == 50
+    assert manager.find_by_balance(100, 100)[0].dni == DNI_1
+
+
+@pytest.mark.parametrize("kind", ["float", "cents", "table"])
+def test_failed_append_restores_exact_balances(kind):
+    """Undoing a failed write does not leave float rounding behind."""
+    if kind == "float":
+        manager = BankManager(storage=FailingStorage())
+    else:
+        manager = BankManager(storage=FailingStorage(),
+                              account_class=CompactAccount,
+                              registry=AccountTable() if kind == "table"
+                              else None)
+    manager.create_account(DNI_1, IBAN_1, 0.1)
+    manager.create_account(DNI_2, IBAN_2, 0.7)
+
+    for call in (lambda: manager.deposit(DNI_1, 0.2),
+                 lambda: manager.withdraw(DNI_2, 0.3),
+                 lambda: manager.transfer(DNI_2, DNI_1, 0.2)):
+        with pytest.raises(OSError):
+            call()
+
+    assert manager.get_account(DNI_1).balance == 0.1
+    assert manager.get_account(DNI_2).balance == 0.7
+
+
+def test_concurrent_transfers_conserve_total():
+    """Threads moving money between accounts neither create nor lose it."""
+    manager = BankManager()
+    dnis = [DNI_1, DNI_2]
+    for dni, iban in ((DNI_1, IBAN_1), (DNI_2, IBAN_2)):
+        manager.create_account(dni, iban, 1000)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(500):
+            src, dst = rng.sample(dnis, 2)
+            try:
+                manager.transfer(src, dst, rng.randint(1, 50))
+            except InsufficientFundsError:
+                pass
+
+    threads = [threading.Thread(target=worker, args=(seed,))
+               for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(manager.get_account(dni).balance for dni in dnis) == 2000
+
+
+def test_sorted_list_matches_sorted_across_bucket_splits():
+    """Adds and removes with tiny buckets keep the order of sorted()."""
+    rng = random.Random(1)
+    items = SortedList(bucket_size=4)
+    expected = []
+    for _ in range(500):
+        if expected and rng.random() < 0.4:
+            value = rng.choice(expected)
+            expected.remove(value)
+            items.remove(value)
+        else:
+            value = rng.randint(0, 50)
+            expected.append(value)
+            items.add(value)
+    expected.sort()
+    assert len(items) == len(expected)
+    assert list(items.iter_from()) == expected
+    assert list(items.iter_descending()) == expected[::-1]
+    assert list(items.iter_from(25, inclusive=False)) == [
+        x for x in expected if x > 25]
+
+
+def test_indexes_follow_deposits_withdrawals_and_deletes():
+    """Index queries match a scan of the accounts after random changes."""
+    rng = random.Random(2)
+    manager = BankManager()
+    dnis = [f"{i:08d}{DNI_LETTERS[i % 23]}" for i in range(0, 6000, 97)]
+    for i, dni in enumerate(dnis):
+        manager.create_account(dni, (IBAN_1, IBAN_2)[i % 2], i % 5 * 10)
+    for _ in range(300):
+        dni = rng.choice(dnis)
+        action = rng.random()
+        if not manager.account_exists(dni):
+            continue
+        if action < 0.45:
+            manager.deposit(dni, rng.randint(1, 40))
+        elif action < 0.9:
+            try:
+                manager.withdraw(dni, rng.randint(1, 40))
+            except InsufficientFundsError:
+                pass
+        else:
+            manager.delete_account(dni)
+
+    accounts = manager.get_all_accounts()
+    keys = sorted((acc.balance, dni) for dni, acc in accounts.items())
+
+    def dnis_of(found):
+        return [acc.dni for acc in found]
+
+    assert dnis_of(manager.find_by_balance()) == [dni for _, dni in keys]
+    assert dnis_of(manager.find_by_balance(20, 60)) == [
+        dni for balance, dni in keys if 20 <= balance <= 60]
+    assert dnis_of(manager.top_accounts(5)) == [
+        dni for _, dni in keys[::-1][:5]]
+    assert dnis_of(manager.top_accounts(5, largest=False)) == [
+        dni for _, dni in keys[:5]]
+    assert dnis_of(manager.find_by_iban(IBAN_2)) == [
+        dni for dni in dnis[1::2] if dni in accounts]
+    matches = sorted(dni for dni in accounts if dni.startswith("00001"))
+    assert manager.search_dni("00001") == matches
+    first = manager.search_dni("00001", limit=3)
+    assert first + manager.search_dni("00001", 3, after=first[-1]) == (
+        matches[:6])
+    assert len(accounts) < len(dnis)
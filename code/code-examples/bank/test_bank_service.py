@@ -0,0 +1,138 @@
+"""
+Tests for BankService error handling.
+"""
+import asyncio
+
+from bank_manager import BankManager
+from bank_service import BankService
+
+DNI, IBAN = "12345678Z", "ES9121000418450200051332"
+
+
+def _run(coroutine_function):
+    async def main():
+        service = BankService(BankManager(), port=0)
+        await service.start()
+        try:
+            return await coroutine_function(service)
+        finally:
+            await service.close()
+    return asyncio.run(main())
+
+
+def test_unexpected_error_fails_only_its_operation():
+    """An unexpected exception is reported for its request alone."""
+    async def scenario(service):
+        def broken(**args):
+            raise RuntimeError("boom")
+        service._operations["broken"] = broken
+        return await asyncio.gather(
+            service.submit("create", {"dni": DNI, "iban": IBAN}),
+            service.submit("broken", {}),
+            service.submit("deposit", {"dni": DNI, "amount": 5}))
+
+    created, broken, deposited = _run(scenario)
+
+    assert created[0] and deposited == (True, 5.0)
+    assert broken == (False, {"type": "internal", "message": "boom"})
+
+
+def test_bad_content_length_is_rejected():
+    """A malformed or negative Content-Length gets a 400 response."""
+    async def scenario(service):
+        statuses = []
+        for length in (b"abc", b"-5"):
+            reader, writer = await asyncio.open_connection("127.0.0.1",
+                                                           service.port)
+            writer.write(b"POST /count HTTP/1.1\r\nContent-Length: "
+                         + length + b"\r\n\r\n")
+            statuses.append(await reader.readline())
+            writer.close()
+        return statuses
+
+    assert _run(scenario) == [b"HTTP/1.1 400 Bad Request\r\n"] * 2
+
+
+def test_unhashable_op_fails_only_its_request():
+    """A non-string op is rejected without failing the rest of the batch."""
+    async def scenario(service):
+        await service.submit("create", {"dni": DNI, "iban": IBAN,
+                                        "initial_balance": 100})
+        return await asyncio.gather(
+            service.submit(["x"], {}),
+            service.submit("deposit", {"dni": DNI, "amount": 5}))
+
+    bad, deposited = _run(scenario)
+
+    assert bad[0] is False and bad[1]["type"] == "invalid"
+    assert deposited == (True, 105.0)
+
+
+def test_close_answers_queued_requests():
+    """Closing the service resolves every queued request."""
+    async def scenario(service):
+        pending = [asyncio.create_task(service.submit("count", {}))
+                   for _ in range(20)]
+        await asyncio.sleep(0)
+        await service.close()
+        return await asyncio.wait_for(asyncio.gather(*pending), 5)
+
+    results = _run(scenario)
+    assert all(ok for ok, _ in results)
+
+
+def test_close_with_connected_clients():
+    """Closing drops idle and busy connections instead of waiting."""
+    async def scenario(service):
+        idle = await asyncio.open_connection("127.0.0.1", service.port)
+        busy = await asyncio.open_connection("127.0.0.1", service.port)
+        busy[1].write(b'{"id": 1, "op": "count"}\n')
+        assert await busy[0].readline() == (b'{"id": 1, "ok": true, '
+                                            b'"result": 0}\n')
+        http = await asyncio.open_connection("127.0.0.1", service.port)
+        http[1].write(b"POST /count HTTP/1.1\r\nContent-Length: 10\r\n\r\n")
+        await asyncio.sleep(0.05)  # the HTTP handler waits for its body
+
+        await asyncio.wait_for(service.close(), 5)
+        remaining = [await asyncio.wait_for(reader.read(), 5)
+                     for reader, _ in (idle, busy, http)]
+        for _, writer in (idle, busy, http):
+            writer.close()
+        return remaining, service._connections
+
+    remaining, connections = _run(scenario)
+
+    assert remaining == [b"", b"", b""]
+    assert connections == {}
+
+
+def test_oversized_lines_get_an_error_and_close():
+    """Lines over the stream limit are answered, then the peer is dropped."""
+    long_line = b"x" * (2**16 + 1) + b"\n"
+
+    async def exchange(service, request):
+        reader, writer = await asyncio.open_connection("127.0.0.1",
+                                                       service.port)
+        writer.write(request)
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        return response
+
+    async def scenario(service):
+        return [await exchange(service, request) for request in (
+            long_line,
+            b'{"id": 1, "op": "count"}\n' + long_line,
+            b"POST /count HTTP/1.1\r\nX-Pad: " + long_line,
+            b"POST /count HTTP/1.1\r\n\r\n" + long_line,
+        )]
+
+    first, pipelined, header, next_request = _run(scenario)
+
+    error = b'"error":{"type":"invalid","message":"Line too long"}}\n'
+    assert first.endswith(error) and first.count(b"\n") == 1
+    assert b'{"id": 1, "ok": true, "result": 0}\n' in pipelined
+    assert pipelined.count(b"Line too long") == 1
+    assert header.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+    assert b"Header too long" in header
+    assert next_request.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert next_request.count(b"HTTP/1.1 400 Bad Request\r\n") == 1
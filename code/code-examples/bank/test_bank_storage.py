@@ -0,0 +1,201 @@
+"""
+Tests for the storage backends: crash recovery, torn writes, snapshot
+compaction, SQLite reopen and group commit.
+"""
+import threading
+import time
+
+import pytest
+
+from bank_manager import BankManager
+from bank_storage import SQLiteStorage, WALStorage, _drop_torn_line
+
+DNI_1, IBAN_1 = "12345678Z", "ES9121000418450200051332"
+DNI_2, IBAN_2 = "87654321X", "ES7921000813610123456789"
+DNI_3, IBAN_3 = "11111111H", "ES6621000418401234567891"
+
+
+def balances(manager):
+    """{dni: balance} for every account of a manager."""
+    return {dni: account.balance
+            for dni, account in manager.get_all_accounts().items()}
+
+
+def run_operations(manager):
+    """A mix of every kind of change; returns the resulting balances."""
+    manager.create_account(DNI_1, IBAN_1, 100)
+    manager.create_account(DNI_2, IBAN_2, 50.5)
+    manager.create_account(DNI_3, IBAN_3, 1)
+    manager.deposit(DNI_1, 25)
+    manager.withdraw(DNI_2, 0.5)
+    manager.transfer(DNI_1, DNI_2, 40)
+    manager.delete_account(DNI_3)
+    return {DNI_1: 85, DNI_2: 90}
+
+
+def test_wal_recovers_after_crash(tmp_path):
+    """Committed changes survive a crash that skips close()."""
+    manager = BankManager(storage=WALStorage(str(tmp_path), sync=False))
+    expected = run_operations(manager)
+    # No close(): every operation already waited for its commit
+
+    recovered = BankManager(storage=WALStorage(str(tmp_path), sync=False))
+    assert balances(recovered) == expected
+    recovered.close()
+
+
+def test_wal_drops_torn_last_record(tmp_path):
+    """A half-written final record is ignored and cut from the log."""
+    manager = BankManager(storage=WALStorage(str(tmp_path), sync=False))
+    expected = run_operations(manager)
+    manager.close()
+    log = tmp_path / WALStorage.LOG
+    intact = log.read_bytes()
+    with open(log, "ab") as f:
+        f.write(b'{"op":"update","balances":{"12345678Z":1')
+
+    recovered = BankManager(storage=WALStorage(str(tmp_path), sync=False))
+    assert balances(recovered) == expected
+    assert log.read_bytes() == intact
+    # New records follow the last complete line
+    recovered.deposit(DNI_1, 5)
+    recovered.close()
+
+    reopened = BankManager(storage=WALStorage(str(tmp_path), sync=False))
+    assert balances(reopened) == {DNI_1: 90, DNI_2: 90}
+    reopened.close()
+
+
+def test_wal_drops_torn_history_line(tmp_path):
+    """A torn line at the end of the history log is cut on load."""
+    def open_manager():
+        return BankManager(storage=WALStorage(str(tmp_path), sync=False,
+                                              history=True))
+
+    manager = open_manager()
+    expected = run_operations(manager)
+    manager.close()
+    with open(tmp_path / WALStorage.HISTORY, "ab") as f:
+        f.write(b'{"op":"update","time":')
+
+    recovered = open_manager()
+    assert balances(recovered) == expected
+    assert (tmp_path / WALStorage.HISTORY).read_bytes().endswith(b"}\n")
+    entries = [e for page in recovered.statement(DNI_1) for e in page]
+    assert [e.kind for e in entries] == ["open", "deposit", "transfer_out"]
+    recovered.close()
+
+
+@pytest.mark.parametrize("content, kept", [
+    (b"", b""),
+    (b"complete\n", b"complete\n"),
+    (b"one\ntwo\nthr", b"one\ntwo\n"),
+    (b"no newline at all", b""),
+    (b"first\n" + b"x" * 10_000, b"first\n"),
+])
+def test_drop_torn_line(tmp_path, content, kept):
+    """Files are cut back to their last newline, across read blocks."""
+    path = tmp_path / "log.jsonl"
+    path.write_bytes(content)
+    with open(path, "ab") as f:
+        _drop_torn_line(f)
+        f.write(b"next\n")
+    assert path.read_bytes() == kept + b"next\n"
+
+
+def test_snapshot_compaction_resets_the_log(tmp_path):
+    """After snapshot_interval records the log restarts from a snapshot."""
+    storage = WALStorage(str(tmp_path), snapshot_interval=3, sync=False)
+    manager = BankManager(storage=storage)
+    expected = run_operations(manager)
+    for _ in range(4):
+        manager.deposit(DNI_1, 1)
+    expected[DNI_1] += 4
+
+    log_lines = (tmp_path / WALStorage.LOG).read_bytes().count(b"\n")
+    assert log_lines < storage.snapshot_interval
+    snapshot = (tmp_path / WALStorage.SNAPSHOT).read_text(encoding="utf-8")
+    assert DNI_3 not in snapshot
+    manager.close()
+
+    reopened = BankManager(storage=WALStorage(str(tmp_path), sync=False))
+    assert balances(reopened) == expected
+    reopened.close()
+
+
+def test_explicit_checkpoint_then_more_changes(tmp_path):
+    """Recovery applies the log written after the latest snapshot."""
+    manager = BankManager(storage=WALStorage(str(tmp_path), sync=False))
+    run_operations(manager)
+    manager.checkpoint()
+    assert (tmp_path / WALStorage.LOG).stat().st_size == 0
+    manager.withdraw(DNI_2, 10)
+    manager.create_account(DNI_3, IBAN_3, 7)
+    manager.close()
+
+    reopened = BankManager(storage=WALStorage(str(tmp_path), sync=False))
+    assert balances(reopened) == {DNI_1: 85, DNI_2: 80, DNI_3: 7}
+    reopened.close()
+
+
+def test_sqlite_reopen(tmp_path):
+    """SQLite storage gives back the same accounts after reopening."""
+    path = str(tmp_path / "bank.db")
+    manager = BankManager(storage=SQLiteStorage(path, synchronous="OFF"))
+    expected = run_operations(manager)
+    manager.close()
+
+    reopened = BankManager(storage=SQLiteStorage(path, synchronous="OFF"))
+    assert balances(reopened) == expected
+    reopened.deposit(DNI_2, 10)
+    reopened.close()
+
+    again = BankManager(storage=SQLiteStorage(path, synchronous="OFF"))
+    assert balances(again) == {DNI_1: 85, DNI_2: 100}
+    again.close()
+
+
+class SlowFlushWAL(WALStorage):
+    """WAL storage whose unlocked sync step is slow, counting flushes."""
+
+    def __init__(self, directory):
+        super().__init__(directory, sync=False)
+        self.flushes = 0
+
+    def _flush(self):
+        super()._flush()
+        self.flushes += 1
+        return lambda: time.sleep(0.05)
+
+
+def test_group_commit_shares_flushes(tmp_path):
+    """Threads committing together share flushes and all become durable."""
+    threads_count = 8
+    dnis = [f"{n:08d}{'TRWAGMYFPDXBNJZSQVHLCKE'[n % 23]}"
+            for n in range(threads_count)]
+    storage = SlowFlushWAL(str(tmp_path))
+    manager = BankManager(storage=storage)
+    with manager.batch():
+        for dni in dnis:
+            manager.create_account(dni, IBAN_1, 0)
+    storage.flushes = 0
+
+    barrier = threading.Barrier(threads_count)
+
+    def worker(dni):
+        barrier.wait()
+        manager.deposit(dni, 10)
+
+    threads = [threading.Thread(target=worker, args=(dni,)) for dni in dnis]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert storage.flushes < threads_count
+    assert storage._synced == storage._written
+    manager.close()
+
+    reopened = BankManager(storage=WALStorage(str(tmp_path), sync=False))
+    assert balances(reopened) == {dni: 10 for dni in dnis}
+    reopened.close()
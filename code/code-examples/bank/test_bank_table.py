@@ -0,0 +1,184 @@
+"""
+Tests for the compact account representations: CompactAccount and the
+columnar AccountTable, checked against BankAccount behavior.
+"""
+import sys
+
+import pytest
+
+from bank_domain import BankAccount, CompactAccount, InsufficientFundsError
+from bank_manager import BankManager
+from bank_table import AccountTable, TableAccount
+
+DNI_1, IBAN_1 = "12345678Z", "ES9121000418450200051332"
+DNI_2, IBAN_2 = "87654321X", "ES7921000813610123456789"
+
+OPERATIONS = [("deposit", 50), ("withdraw", 20.5), ("deposit", 0.25),
+              ("withdraw", 100), ("deposit", 1999.99)]
+
+
+def table_account(dni, iban, initial_balance=0):
+    """A TableAccount view in a fresh one-row table."""
+    table = AccountTable()
+    table[dni] = CompactAccount(dni, iban, initial_balance)
+    return table[dni]
+
+
+@pytest.mark.parametrize("make", [CompactAccount, table_account])
+def test_behaves_like_bank_account(make):
+    """Same fields, balances, errors and text as BankAccount."""
+    reference = BankAccount(DNI_1, IBAN_1, 100)
+    account = make(DNI_1, IBAN_1, 100)
+    assert (account.dni, account.iban) == (reference.dni, reference.iban)
+    for name, amount in OPERATIONS:
+        getattr(reference, name)(amount)
+        getattr(account, name)(amount)
+        assert account.balance == pytest.approx(reference.balance)
+    assert str(account) == str(reference)
+
+    for target in (reference, account):
+        with pytest.raises(ValueError):
+            target.deposit(0)
+        with pytest.raises(ValueError):
+            target.withdraw(-5)
+        with pytest.raises(InsufficientFundsError):
+            target.withdraw(10**6)
+    assert account.balance == pytest.approx(reference.balance)
+
+
+@pytest.mark.parametrize("make", [CompactAccount, table_account])
+def test_cent_balances_round_trip_exactly(make):
+    """Balances are whole cents, so repeated small amounts never drift."""
+    account = make(DNI_1, IBAN_1, 0.1)
+    for _ in range(1000):
+        account.deposit(0.1)
+    for _ in range(500):
+        account.withdraw(0.2)
+    assert account.balance_cents == 10
+    assert account.balance == 0.1
+
+    account.deposit(12345678.99)
+    assert account.balance_cents == 1234567909
+    assert account.balance == 12345679.09
+
+
+def test_sub_cent_amounts_are_rejected():
+    """Fractions of a cent raise instead of being rounded away."""
+    account = CompactAccount(DNI_1, IBAN_1, 1)
+    with pytest.raises(ValueError):
+        account.deposit(0.001)
+    with pytest.raises(ValueError):
+        CompactAccount(DNI_1, IBAN_1, 0.005)
+    with pytest.raises(ValueError):
+        account.deposit(True)
+    assert account.balance_cents == 100
+
+
+def test_invalid_account_data_raises_like_bank_account():
+    """Bad DNIs and IBANs are rejected by both classes."""
+    for dni, iban in (("1234", IBAN_1), (DNI_1, "ES00")):
+        with pytest.raises(ValueError):
+            BankAccount(dni, iban)
+        with pytest.raises(ValueError):
+            CompactAccount(dni, iban)
+
+
+def test_compact_account_has_no_instance_dict():
+    """Slots keep a CompactAccount smaller than a BankAccount and its dict."""
+    compact = CompactAccount(DNI_1, IBAN_1, 100)
+    reference = BankAccount(DNI_1, IBAN_1, 100)
+    assert not hasattr(compact, "__dict__")
+    with pytest.raises(AttributeError):
+        compact.nickname = "savings"
+    assert sys.getsizeof(compact) < (sys.getsizeof(reference)
+                                     + sys.getsizeof(reference.__dict__))
+
+
+def test_table_lookups_and_mapping_interface():
+    """Rows are found by DNI and copied from any account class."""
+    table = AccountTable()
+    table[DNI_1] = BankAccount(DNI_1, IBAN_1, 10.5)
+    table[DNI_2] = CompactAccount(DNI_2, IBAN_2, 3)
+
+    assert len(table) == 2 and set(table) == {DNI_1, DNI_2}
+    assert DNI_1 in table and "00000000T" not in table
+    view = table[DNI_1]
+    assert isinstance(view, TableAccount)
+    assert (view.dni, view.iban, view.balance_cents) == (DNI_1, IBAN_1, 1050)
+    assert table[DNI_1] == view and hash(table[DNI_1]) == hash(view)
+    assert table[DNI_1] != table[DNI_2]
+    assert table.total_cents() == 1350
+    assert set(table.copy()) == {DNI_1, DNI_2}
+    with pytest.raises(KeyError):
+        table["00000000T"]
+
+    # Reassigning a DNI overwrites its row
+    table[DNI_1] = CompactAccount(DNI_1, IBAN_2, 7)
+    assert (table[DNI_1].iban, table[DNI_1].balance) == (IBAN_2, 7)
+    assert len(table) == 2
+
+
+def test_table_views_write_through_and_go_stale():
+    """Views update the balance column and fail once the row is deleted."""
+    table = AccountTable()
+    table[DNI_1] = CompactAccount(DNI_1, IBAN_1, 100)
+    view = table[DNI_1]
+    view.deposit(0.5)
+    assert table[DNI_1].balance_cents == 10050
+    assert table._cents[table._rows[DNI_1]] == 10050
+
+    del table[DNI_1]
+    assert DNI_1 not in table and len(table) == 0
+    with pytest.raises(KeyError):
+        view.balance
+    with pytest.raises(KeyError):
+        view.deposit(1)
+
+    # The freed row is reused, but the stale view still refuses it
+    table[DNI_2] = CompactAccount(DNI_2, IBAN_2, 1)
+    assert len(table._cents) == 1
+    with pytest.raises(KeyError):
+        view.balance
+    assert table[DNI_2].balance == 1
+
+
+def test_table_memory_layout():
+    """Balances live in one int64 column; each string is stored once."""
+    table = AccountTable()
+    dnis = [f"{n:08d}{'TRWAGMYFPDXBNJZSQVHLCKE'[n % 23]}"
+            for n in range(100)]
+    for i, dni in enumerate(dnis):
+        # Built at run time, so each account brings its own IBAN string
+        iban = "".join(["ES91210004184502000513", "32"])
+        table[dni] = CompactAccount(dni, iban, i)
+
+    assert table._cents.typecode == "q" and table._cents.itemsize == 8
+    assert len(table._cents) == 100
+    assert list(table._cents) == [i * 100 for i in range(100)]
+    assert len({id(iban) for iban in table._ibans}) == 1
+    # The row index and the DNI column hold the same DNI object
+    assert all(dni is table._dnis[row] for dni, row in table._rows.items())
+    assert table.total_cents() == sum(range(100)) * 100
+
+
+@pytest.mark.parametrize("registry", [None, AccountTable])
+def test_manager_with_compact_accounts_matches_bank_accounts(registry):
+    """A manager over compact accounts reports what a plain one does."""
+    plain = BankManager()
+    compact = BankManager(account_class=CompactAccount,
+                          registry=registry() if registry else None)
+    for manager in (plain, compact):
+        manager.create_account(DNI_1, IBAN_1, 100)
+        manager.create_account(DNI_2, IBAN_2, 25.5)
+        manager.transfer(DNI_1, DNI_2, 40.25)
+        manager.withdraw(DNI_2, 5)
+        with pytest.raises(InsufficientFundsError):
+            manager.withdraw(DNI_1, 1000)
+
+    for dni in (DNI_1, DNI_2):
+        assert (compact.get_account(dni).balance
+                == plain.get_account(dni).balance)
+    assert ([a.dni for a in compact.find_by_balance(59, 60)]
+            == [a.dni for a in plain.find_by_balance(59, 60)] == [DNI_1])
+    assert [a.dni for a in compact.find_by_iban(IBAN_2)] == [DNI_2]
+    assert compact.get_account_count() == 2
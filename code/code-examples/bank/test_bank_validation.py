@@ -0,0 +1,63 @@
+"""
+Tests for bank_validation and the checksums applied on account creation.
+"""
+import re
+
+import pytest
+
+import bank_validation
+from bank_domain import BankAccount
+from bank_manager import BankManager
+from bank_validation import (DNI_FORMAT_ERROR, DNI_LETTER_ERROR,
+                             IBAN_CHECKSUM_ERROR, IBAN_FORMAT_ERROR,
+                             cache_info, validate_many)
+
+DNI, IBAN = "12345678Z", "ES9121000418450200051332"
+
+
+def test_validate_many_reports_each_record():
+    """Each pair gets None or the first error, DNI before IBAN."""
+    records = [(DNI, IBAN), ("12345678A", IBAN),
+               ("1234567Z", IBAN), (DNI, "ES9121000418450200051333"),
+               (DNI, "ES91210004184502000513"), ("12345678A", "bad")]
+
+    assert validate_many(records) == [
+        None, DNI_LETTER_ERROR, DNI_FORMAT_ERROR, IBAN_CHECKSUM_ERROR,
+        IBAN_FORMAT_ERROR, DNI_LETTER_ERROR
+    ]
+    assert validate_many(records[:2], checksum=False) == [None, None]
+
+
+def test_repeated_identifiers_hit_the_cache():
+    """A repeated DNI or IBAN is looked up, not validated again."""
+    bank_validation._cached_dni_error.cache_clear()
+    bank_validation._cached_iban_error.cache_clear()
+
+    validate_many([(DNI, IBAN)] * 5)
+
+    info = cache_info()
+    assert (info["dni"].misses, info["dni"].hits) == (1, 4)
+    assert (info["iban"].misses, info["iban"].hits) == (1, 4)
+
+
+def test_account_creation_verifies_checksums():
+    """Accounts with a wrong check letter or check digits are rejected."""
+    with pytest.raises(ValueError, match=DNI_LETTER_ERROR):
+        BankAccount("12345678A", IBAN)
+    with pytest.raises(ValueError, match=IBAN_CHECKSUM_ERROR):
+        BankManager().create_account(DNI, "ES9121000418450200051333")
+    assert BankManager().create_account(DNI, IBAN).dni == DNI
+
+
+@pytest.mark.parametrize("dni, iban, error", [
+    (["12345678Z"], IBAN, DNI_FORMAT_ERROR),
+    ({"dni": DNI}, ["ES"], DNI_FORMAT_ERROR),
+    (DNI, ["ES91", "2100"], IBAN_FORMAT_ERROR),
+    (DNI, {"iban": IBAN}, IBAN_FORMAT_ERROR),
+    ("12345678A", ["ES"], DNI_LETTER_ERROR),
+])
+def test_unhashable_identifiers_get_the_format_error(dni, iban, error):
+    """Lists and dicts are reported as invalid instead of raising."""
+    assert validate_many([(dni, iban)]) == [error]
+    with pytest.raises(ValueError, match=re.escape(error)):
+        BankAccount(dni, iban)
@@ -0,0 +1,112 @@
+"""
+Import-time benchmark for the mathtools and datatools packages and the
+data_validators module.
+
+Runs ``python -X importtime -c "import <package>"`` in fresh interpreters
+and reports the package's cumulative import time (best of several runs).
+It also checks that importing prints nothing and does not load NumPy or
+any submodule, so the lazy package ``__init__`` files stay lazy.
+
+Usage::
+
+    python benchmarks/import_time.py             # report
+    python benchmarks/import_time.py --budget 5  # fail above 5 ms
+
+Exits with status 1 if a check fails or a package exceeds the budget.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+PACKAGES = ('mathtools', 'datatools', 'data_validators')
+MODULES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = ("import sys, {package}; "
+          "print(sorted(m for m in sys.modules "
+          "if m == 'numpy' or m.startswith('{package}.')))")
+
+
+def import_time(package, runs=5):
+    """
+    Cumulative import time of ``package`` in microseconds (best of runs).
+
+    Parameters
+    ----------
+    package : str
+        Top-level package to import
+    runs : int
+        Number of fresh interpreters to try
+
+    Returns
+    -------
+    int
+        Smallest cumulative time reported by ``-X importtime``
+    """
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {package}'],
+            cwd=MODULES_DIR, capture_output=True, text=True, check=True)
+        for line in proc.stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package"
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == package:
+                cumulative = int(fields[1])
+                best = cumulative if best is None else min(best, cumulative)
+    return best
+
+
+def check_side_effects(package):
+    """
+    Return a list of problems found when importing ``package``.
+
+    Parameters
+    ----------
+    package : str
+        Top-level package to import
+
+    Returns
+    -------
+    list of str
+        Empty when the import printed nothing and loaded nothing eagerly
+    """
+    proc = subprocess.run(
+        [sys.executable, '-c', f'import {package}'],
+        cwd=MODULES_DIR, capture_output=True, text=True, check=True)
+    problems = []
+    if proc.stdout or proc.stderr:
+        problems.append(f"import {package} produced output: "
+                        f"{(proc.stdout + proc.stderr).strip()!r}")
+    probe = subprocess.run(
+        [sys.executable, '-c', _PROBE.format(package=package)],
+        cwd=MODULES_DIR, capture_output=True, text=True, check=True)
+    loaded = probe.stdout.strip()
+    if loaded != '[]':
+        problems.append(f"import {package} eagerly loaded {loaded}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--budget', type=float, default=None,
+                        help='maximum cumulative import time in ms')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for package in PACKAGES:
+        ms = import_time(package, args.runs) / 1000
+        print(f"{package:<10} {ms:8.2f} ms")
+        for problem in check_side_effects(package):
+            print(f"  FAIL: {problem}")
+            failed = True
+        if args.budget is not None and ms > args.budget:
+            print(f"  FAIL: exceeds budget of {args.budget} ms")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Serial versus ParallelExecutor timings for the chunked statistics.
+
+Times ``variance`` and ``data_validators.check_outliers`` on a list of
+Gaussian floats, without an executor and with a process pool of each
+requested size, and prints the speedup. The parallel kernels compute
+exact, mergeable sums (two or three ``math.fsum`` passes per chunk), so
+they do about three times the serial work: expect a net speedup only
+with several workers on separate cores, and use this script to find the
+crossover on a given machine.
+
+Usage::
+
+    python benchmarks/parallel_stats.py                      # 4M values
+    python benchmarks/parallel_stats.py --size 10000000 --workers 2 4 8
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+MODULES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, MODULES_DIR)
+
+import data_validators  # noqa: E402
+from datatools.parallel import (DEFAULT_CHUNK_SIZE,  # noqa: E402
+                                ParallelExecutor)
+from datatools.stats import variance  # noqa: E402
+
+CASES = {
+    'variance': variance,
+    'check_outliers': data_validators.check_outliers,
+}
+
+
+def best_time(func, runs):
+    """Smallest wall-clock time of ``runs`` calls, in seconds."""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=4_000_000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[2, os.cpu_count() or 1])
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    data = [rng.gauss(0, 1) for _ in range(args.size)]
+    print(f"{args.size} values, {os.cpu_count()} CPUs")
+    for name, func in CASES.items():
+        serial = best_time(lambda: func(data), args.runs)
+        print(f"{name:<15} serial      {serial:7.3f} s")
+        for workers in sorted(set(args.workers)):
+            with ParallelExecutor(workers, args.chunk_size) as ex:
+                func(data[:2 * args.chunk_size], executor=ex)  # start pool
+                parallel = best_time(lambda: func(data, executor=ex),
+                                     args.runs)
+            print(f"{name:<15} {workers:2d} workers {parallel:7.3f} s "
+                  f"({serial / parallel:.2f}x)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1 @@
+# Makes the project modules (e.g. datatools) importable from test/
@@ -4,19 +4,35 @@ Data validation utilities for data analysis projects.
 
 This module provides functions to validate data quality,
 check data types, and identify potential issues.
+
+``check_missing``, ``check_outliers`` and ``validate_numeric_range`` are
+written as per-chunk kernels plus an exact merge. Serially the whole list
+is one chunk; pass ``executor`` (anything with a
+``map_chunks(func, data, *args)`` method, such as
+``datatools.parallel.ParallelExecutor``) to spread the chunks over
+several cores with identical results. Executors that also provide
+``as_floats`` and ``map_float_chunks`` get the z-score kernels' input as
+floats, which is cheaper to send to worker processes.
 """
 
+import hashlib
+import math
+import numbers
+from datatools.parallel import chunk_squared_deviations, chunk_sum, merge_sums
+from datatools.stats.accumulator import squared_deviations
+
 __all__ = [
     'check_missing', 'check_duplicates', 'check_outliers',
-    'validate_numeric_range'
+    'validate_numeric_range', 'validate_all', 'HyperLogLog', 'BloomFilter'
 ]
 
 # Module constants
 DEFAULT_OUTLIER_THRESHOLD = 3  # Standard deviations
+DEFAULT_SKETCH_ERROR = 0.01  # Relative error of approximate unique counts
 _VERSION = "1.0.0"
 
 
-def check_missing(data):
+def check_missing(data, executor=None):
     """
     Check for missing values in dataset.
     
@@ -24,14 +40,20 @@ def check_missing(data):
     ----------
     data : list
         Dataset to check
+    executor : object, optional
+        Chunk executor for parallel processing of large lists
     
     Returns
     -------
     dict
         Dictionary with 'count' and 'percentage' of missing values
     """
-    missing_count = sum(1 for x in data if x is None)
-    percentage = (missing_count / len(data)) * 100 if data else 0
+    if hasattr(data, 'missing_count'):
+        # Precomputed, e.g. a column of a datatools.columnar file
+        missing_count = data.missing_count
+    else:
+        missing_count = sum(_map_chunks(executor, _count_missing, data))
+    percentage = (missing_count / len(data)) * 100 if len(data) else 0
 
     return {
         'count': missing_count,
@@ -40,32 +62,91 @@ def check_missing(data):
     }
 
 
-def check_duplicates(data):
+def check_duplicates(data, approximate=False, error=None,
+                     flag_positions=False, capacity=None):
     """
     Check for duplicate values in dataset.
     
+    The exact check keeps every distinct value in a set. With
+    ``approximate=True`` the unique count comes from a HyperLogLog sketch
+    instead: memory stays at a few kilobytes whatever the cardinality,
+    any iterable (including a generator) is accepted in one pass, and
+    unhashable values work because they are hashed by content.
+    
     Parameters
     ----------
-    data : list
-        Dataset to check
+    data : list or iterable
+        Dataset to check (any iterable when ``approximate`` is True)
+    approximate : bool
+        Estimate the unique count with a HyperLogLog sketch
+    error : float, optional
+        Target relative error of the estimate (default: 0.01)
+    flag_positions : bool
+        Also run a Bloom filter over the data and report the positions
+        of probable repeats (approximate mode only)
+    capacity : int, optional
+        Expected number of values, used to size the Bloom filter
+        (default: ``len(data)``; required if ``data`` has no length,
+        such as a generator)
     
     Returns
     -------
     dict
-        Dictionary with duplicate count and unique values count
+        Dictionary with duplicate count and unique values count. In
+        approximate mode it also holds 'approximate', 'error' and
+        'sketch' (the HyperLogLog, which can be merged with the sketches
+        of other shards), plus 'probable_duplicate_indices' when
+        ``flag_positions`` is set.
     """
-    unique_count = len(set(data))
-    duplicate_count = len(data) - unique_count
+    if not approximate:
+        unique_count = len(set(data))
+        duplicate_count = len(data) - unique_count
 
-    return {
-        'total': len(data),
+        return {
+            'total': len(data),
+            'unique': unique_count,
+            'duplicates': duplicate_count,
+            'has_duplicates': duplicate_count > 0
+        }
+
+    if error is None:
+        error = DEFAULT_SKETCH_ERROR
+    sketch = HyperLogLog(error)
+    bloom = None
+    flagged = []
+    if flag_positions:
+        if capacity is None:
+            if not hasattr(data, '__len__'):
+                raise ValueError("capacity is required to flag positions "
+                                 "in an iterable without a length")
+            capacity = len(data)
+        bloom = BloomFilter(capacity, error)
+
+    total = 0
+    for value in data:
+        key = _hash_key(value)
+        sketch.add_key(key)
+        if bloom is not None and bloom.add_key(key):
+            flagged.append(total)
+        total += 1
+
+    unique_count = min(total, sketch.count())
+    duplicate_count = total - unique_count
+    result = {
+        'total': total,
         'unique': unique_count,
         'duplicates': duplicate_count,
-        'has_duplicates': duplicate_count > 0
+        'has_duplicates': duplicate_count > 0,
+        'approximate': True,
+        'error': error,
+        'sketch': sketch
     }
+    if bloom is not None:
+        result['probable_duplicate_indices'] = flagged
+    return result
 
 
-def check_outliers(data, threshold=None):
+def check_outliers(data, threshold=None, executor=None):
     """
     Identify outliers using z-score method.
     
@@ -75,6 +156,8 @@ def check_outliers(data, threshold=None):
         Numerical dataset
     threshold : float, optional
         Z-score threshold for outliers (default: 3)
+    executor : object, optional
+        Chunk executor for parallel processing of large lists
     
     Returns
     -------
@@ -84,15 +167,29 @@ def check_outliers(data, threshold=None):
     if threshold is None:
         threshold = DEFAULT_OUTLIER_THRESHOLD
 
-    mean_val = sum(data) / len(data)
-    variance = sum((x - mean_val)**2 for x in data) / len(data)
+    # Correctly rounded sums, so the result does not depend on chunking
+    if executor is None:
+        values = data
+        mean_val = math.fsum(data) / len(data)
+        variance = (math.fsum(squared_deviations(data, mean_val))
+                    / len(data))
+    else:
+        as_floats = getattr(executor, 'as_floats', None)
+        values = data if as_floats is None else as_floats(data)
+        sums = _map_float_chunks(executor, chunk_sum, values)
+        mean_val = merge_sums(sums) / len(data)
+        squared = _map_float_chunks(executor, chunk_squared_deviations,
+                                    values, mean_val)
+        variance = merge_sums(squared) / len(data)
     std_dev = variance**0.5
 
+    # The kernel sees floats; report the caller's own values
     outliers = []
-    for i, value in enumerate(data):
-        z_score = abs((value - mean_val) / std_dev) if std_dev > 0 else 0
-        if z_score > threshold:
-            outliers.append({'index': i, 'value': value, 'z_score': z_score})
+    for chunk_outliers in _map_float_chunks(executor, _zscore_outliers,
+                                            values, mean_val, std_dev,
+                                            threshold):
+        outliers.extend({'index': i, 'value': data[i], 'z_score': z_score}
+                        for i, z_score in chunk_outliers)
 
     return {
         'count': len(outliers),
@@ -101,7 +198,7 @@ def check_outliers(data, threshold=None):
     }
 
 
-def validate_numeric_range(data, min_val=None, max_val=None):
+def validate_numeric_range(data, min_val=None, max_val=None, executor=None):
     """
     Validate that all values are within specified range.
     
@@ -113,6 +210,8 @@ def validate_numeric_range(data, min_val=None, max_val=None):
         Minimum allowed value
     max_val : float, optional
         Maximum allowed value
+    executor : object, optional
+        Chunk executor for parallel processing of large lists
     
     Returns
     -------
@@ -120,8 +219,351 @@ def validate_numeric_range(data, min_val=None, max_val=None):
         Validation results
     """
     out_of_range = []
+    for violations in _map_chunks(executor, _range_violations, data,
+                                  min_val, max_val):
+        out_of_range.extend(violations)
 
+    return {
+        'valid': len(out_of_range) == 0,
+        'out_of_range_count': len(out_of_range),
+        'violations': out_of_range
+    }
+
+
+def validate_all(data, rules=None):
+    """
+    Run several checks with a fused scan plus the z-score passes.
+
+    The first pass counts missing values, collects distinct values and
+    the present values, and records range violations. The z-scores then
+    use the same ``math.fsum`` moments as ``check_outliers`` (two C-level
+    sums over the present values) and one scoring pass. Calling the checks
+    one by one costs up to seven Python-level passes.
+
+    Parameters
+    ----------
+    data : list
+        Dataset to check; ``None`` marks a missing value
+    rules : dict, optional
+        Checks to run. Keys: 'missing' (bool), 'duplicates' (bool),
+        'outliers' (bool or dict with 'threshold') and 'range' (dict with
+        'min_val' and/or 'max_val'). By default every check except
+        'range' runs.
+    
+    Returns
+    -------
+    dict
+        One entry per requested check, shaped like the result of the
+        matching function ('missing': ``check_missing``, 'duplicates':
+        ``check_duplicates``, 'outliers': ``check_outliers``, 'range':
+        ``validate_numeric_range``). Duplicates, outliers and range are
+        evaluated on the non-missing values, and reported indices refer
+        to positions in ``data``. The values and z-scores are exactly
+        those of the individual checks.
+    """
+    if rules is None:
+        rules = {'missing': True, 'duplicates': True, 'outliers': True}
+
+    outlier_rule = rules.get('outliers')
+    threshold = None
+    if isinstance(outlier_rule, dict):
+        threshold = outlier_rule.get('threshold')
+    if threshold is None:
+        threshold = DEFAULT_OUTLIER_THRESHOLD
+    range_rule = rules.get('range')
+    min_val = range_rule.get('min_val') if range_rule else None
+    max_val = range_rule.get('max_val') if range_rule else None
+
+    seen = set() if rules.get('duplicates') else None
+    present = [] if outlier_rule else None
+    missing_count = 0
+    valid_count = 0
+    out_of_range = []
+
+    # Pass 1: missing, distinct values, present values and range, fused
     for i, value in enumerate(data):
+        if value is None:
+            missing_count += 1
+            continue
+        valid_count += 1
+        if seen is not None:
+            seen.add(value)
+        if present is not None:
+            present.append(value)
+        if range_rule:
+            if min_val is not None and value < min_val:
+                out_of_range.append({
+                    'index': i,
+                    'value': value,
+                    'reason': 'below_min'
+                })
+            elif max_val is not None and value > max_val:
+                out_of_range.append({
+                    'index': i,
+                    'value': value,
+                    'reason': 'above_max'
+                })
+
+    report = {}
+    if rules.get('missing'):
+        total = len(data)
+        report['missing'] = {
+            'count': missing_count,
+            'percentage': (missing_count / total) * 100 if total else 0,
+            'has_missing': missing_count > 0
+        }
+    if seen is not None:
+        duplicate_count = valid_count - len(seen)
+        report['duplicates'] = {
+            'total': valid_count,
+            'unique': len(seen),
+            'duplicates': duplicate_count,
+            'has_duplicates': duplicate_count > 0
+        }
+    if outlier_rule:
+        # Moments as in check_outliers, then the z-score pass
+        outliers = []
+        if valid_count:
+            mean_val = math.fsum(present) / valid_count
+            std_dev = (math.fsum(squared_deviations(present, mean_val))
+                       / valid_count)**0.5
+        else:
+            std_dev = 0
+        if std_dev > 0:
+            for i, value in enumerate(data):
+                if value is None:
+                    continue
+                z_score = abs((value - mean_val) / std_dev)
+                if z_score > threshold:
+                    outliers.append({
+                        'index': i,
+                        'value': value,
+                        'z_score': z_score
+                    })
+        report['outliers'] = {
+            'count': len(outliers),
+            'outliers': outliers,
+            'threshold': threshold
+        }
+    if range_rule:
+        report['range'] = {
+            'valid': len(out_of_range) == 0,
+            'out_of_range_count': len(out_of_range),
+            'violations': out_of_range
+        }
+    return report
+
+
+def _hash_key(value):
+    """
+    Stable 128-bit hash of a value, as an int.
+
+    Unlike ``hash()``, it is the same in every process (so sketches from
+    different shards can be merged) and works for unhashable values.
+    Numbers that compare equal hash alike (``1``, ``True`` and ``1.0``),
+    mirroring ``set`` semantics.
+    """
+    if isinstance(value, bytes):
+        raw = b'b' + value
+    elif isinstance(value, str):
+        raw = b's' + value.encode('utf-8')
+    elif isinstance(value, numbers.Integral):
+        raw = b'n' + str(int(value)).encode()
+    elif isinstance(value, numbers.Real) and float(value) == value:
+        value = float(value)
+        number = int(value) if value.is_integer() else value
+        raw = b'n' + repr(number).encode()
+    else:
+        raw = b'r' + repr(value).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=16).digest(),
+                          'little')
+
+
+class HyperLogLog:
+    """
+    Approximate distinct counter (HyperLogLog).
+
+    Uses ``2**p`` one-byte registers, with ``p`` chosen so the standard
+    error ``1.04 / sqrt(2**p)`` is at most ``error``: 16 KB for 1%, 1 KB
+    for 4%. Sketches with the same ``error`` merge exactly, so shards can
+    be counted separately and combined.
+
+    Parameters
+    ----------
+    error : float
+        Target relative standard error of ``count()``
+    """
+
+    def __init__(self, error=DEFAULT_SKETCH_ERROR):
+        if not 0 < error < 1:
+            raise ValueError("error must be between 0 and 1")
+        self.p = min(18, max(4, math.ceil(math.log2((1.04 / error)**2))))
+        self.m = 1 << self.p
+        self.registers = bytearray(self.m)
+
+    def add(self, value):
+        """Add a value to the sketch."""
+        self.add_key(_hash_key(value))
+
+    def add_key(self, key):
+        """Add a precomputed ``_hash_key`` (uses its low 64 bits)."""
+        key &= 0xFFFFFFFFFFFFFFFF
+        index = key >> (64 - self.p)
+        rest_bits = 64 - self.p
+        rest = key & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, data):
+        """Add every value from an iterable; returns the sketch."""
+        for value in data:
+            self.add(value)
+        return self
+
+    def merge(self, other):
+        """
+        Combine another sketch into this one (register-wise maximum).
+
+        Parameters
+        ----------
+        other : HyperLogLog
+            Sketch with the same precision
+
+        Returns
+        -------
+        HyperLogLog
+            The sketch itself, to allow chaining
+        """
+        if other.p != self.p:
+            raise ValueError("Cannot merge sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self):
+        """
+        Estimate the number of distinct values added.
+
+        Returns
+        -------
+        int
+            Estimated cardinality
+        """
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / math.fsum(2.0**-r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction: linear counting
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def __len__(self):
+        return self.count()
+
+
+class BloomFilter:
+    """
+    Probabilistic set membership with no false negatives.
+
+    Sized for ``capacity`` items at false-positive rate ``error_rate``
+    (about 1.2 bytes per item at 1%). Filters with the same parameters
+    merge with a bitwise OR.
+
+    Parameters
+    ----------
+    capacity : int
+        Expected number of distinct items
+    error_rate : float
+        Target false-positive probability at full capacity
+    """
+
+    def __init__(self, capacity, error_rate=DEFAULT_SKETCH_ERROR):
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate)
+                                     / math.log(2)**2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        # Double hashing: two 64-bit halves of the 128-bit key
+        h1 = key & 0xFFFFFFFFFFFFFFFF
+        h2 = (key >> 64) | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        """
+        Add a value.
+
+        Returns
+        -------
+        bool
+            True if the value was probably already present
+        """
+        return self.add_key(_hash_key(value))
+
+    def add_key(self, key):
+        """Add a precomputed ``_hash_key``; same return value as ``add``."""
+        present = True
+        bits = self.bits
+        for pos in self._positions(key):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        return present
+
+    def __contains__(self, value):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7))
+                   for pos in self._positions(_hash_key(value)))
+
+    def merge(self, other):
+        """Combine another filter with the same parameters (bitwise OR)."""
+        if (other.size, other.hashes) != (self.size, self.hashes):
+            raise ValueError("Cannot merge filters with different parameters")
+        self.bits = bytearray(map(int.__or__, self.bits, other.bits))
+        return self
+
+
+def _map_chunks(executor, func, data, *args):
+    """Run a chunk kernel serially (one chunk) or on ``executor``."""
+    if executor is None:
+        return [func(data, 0, *args)]
+    return executor.map_chunks(func, data, *args)
+
+
+def _map_float_chunks(executor, func, data, *args):
+    """``_map_chunks`` for kernels that only read the values as floats."""
+    if executor is None:
+        return [func(data, 0, *args)]
+    map_floats = getattr(executor, 'map_float_chunks', executor.map_chunks)
+    return map_floats(func, data, *args)
+
+
+# Chunk kernels: module-level so they can be sent to worker processes.
+# Each receives its chunk and the chunk's offset in the full dataset; the
+# exact-sum kernels are shared with datatools.parallel.
+
+def _count_missing(chunk, offset):
+    return sum(1 for x in chunk if x is None)
+
+
+def _zscore_outliers(chunk, offset, mean_val, std_dev, threshold):
+    # (index, z_score) pairs; the caller looks up the values
+    outliers = []
+    for i, value in enumerate(chunk, offset):
+        z_score = abs((value - mean_val) / std_dev) if std_dev > 0 else 0
+        if z_score > threshold:
+            outliers.append((i, z_score))
+    return outliers
+
+
+def _range_violations(chunk, offset, min_val, max_val):
+    out_of_range = []
+    for i, value in enumerate(chunk, offset):
         if min_val is not None and value < min_val:
             out_of_range.append({
                 'index': i,
@@ -134,12 +576,7 @@ def validate_numeric_range(data, min_val=None, max_val=None):
                 'value': value,
                 'reason': 'above_max'
             })
-
-    return {
-        'valid': len(out_of_range) == 0,
-        'out_of_range_count': len(out_of_range),
-        'violations': out_of_range
-    }
+    return out_of_range
 
 
 def _get_version():
@@ -171,4 +608,16 @@ if __name__ == "__main__":
     print("\nRange Validation (10-50):")
     print(validate_numeric_range(numeric_data, min_val=10, max_val=50))
 
+    print("\nApproximate Duplicates Check:")
+    approx = check_duplicates(test_data, approximate=True, flag_positions=True)
+    print({k: v for k, v in approx.items() if k != 'sketch'})
+
+    print("\nAll Checks in One Scan:")
+    print(validate_all(test_data, {
+        'missing': True,
+        'duplicates': True,
+        'outliers': {'threshold': 2},
+        'range': {'min_val': 10, 'max_val': 50}
+    }))
+
     print("\nAll tests completed!")
@@ -2,17 +2,58 @@
 DataTools: A lightweight data analysis package.
 
 Provides utilities for:
-- Reading/writing CSV files
+- Reading/writing CSV files in chunks
 - Cleaning data (missing values, outliers)
 - Basic statistical analysis
+
+Functions accept lists and, when NumPy is installed, NumPy arrays; use
+``set_backend`` to force the pure-Python or NumPy implementation.
+``datatools.pipeline`` cleans data that does not fit in memory.
+
+Submodules (and NumPy) are imported lazily (PEP 562): ``import
+datatools`` is cheap, and ``datatools.mean`` loads the stats subpackage
+the first time it is accessed.
 """
 
+import importlib
+
 __version__ = '1.0.0'
 __author__ = 'CSPy Learning'
 
-# Expose commonly-used functions at package level
-from .cleaning.missing import fill_missing
-from .cleaning.outliers import remove_outliers
-from .stats.descriptive import mean, median, std_dev
+# Commonly-used functions exposed at package level -> defining submodule
+_LAZY_ATTRS = {
+    'get_backend': 'backend',
+    'set_backend': 'backend',
+    'use_backend': 'backend',
+    'read_csv_column': 'io',
+    'write_csv_column': 'io',
+    'fill_missing': 'cleaning.missing',
+    'remove_outliers': 'cleaning.outliers',
+    'mean': 'stats.descriptive',
+    'median': 'stats.descriptive',
+    'std_dev': 'stats.descriptive',
+}
+_SUBMODULES = ('backend', 'cleaning', 'columnar', 'io', 'parallel',
+               'pipeline', 'stats')
+
+__all__ = [
+    'fill_missing', 'remove_outliers', 'mean', 'median', 'std_dev',
+    'get_backend', 'set_backend', 'use_backend', 'read_csv_column',
+    'write_csv_column'
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(f'.{_LAZY_ATTRS[name]}', __name__)
+        value = getattr(module, name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # cache: later lookups skip __getattr__
+    return value
+
 
-__all__ = ['fill_missing', 'remove_outliers', 'mean', 'median', 'std_dev']
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS) | set(_SUBMODULES))
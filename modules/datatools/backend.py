@@ -0,0 +1,195 @@
+"""
+Backend selection for datatools.
+
+Every public function in datatools has a pure-Python implementation and,
+when NumPy is installed, a vectorized one. By default (``'auto'``) the
+NumPy path is used for NumPy arrays and for lists with at least
+``AUTO_THRESHOLD`` elements; small lists keep the original list-based
+behaviour. ``set_backend`` forces one backend for every call.
+
+Missing values are represented as ``NaN`` on the NumPy path (``None`` in a
+list becomes ``NaN`` when converted); masked arrays are also accepted and
+their masked entries count as missing. The statistics and outlier
+functions do not treat ``None`` as missing: they raise ``TypeError`` for
+it on both paths, so the outcome does not depend on the input size. For
+the same reason ``detect_missing`` and ``fill_missing`` never convert
+lists: only ``None`` is missing in a list, whatever its length.
+"""
+
+from contextlib import contextmanager
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+BACKENDS = ('auto', 'python', 'numpy')
+
+# Lists at least this long are converted to arrays once under 'auto'
+AUTO_THRESHOLD = 10_000
+
+_backend = 'auto'
+
+
+def get_backend():
+    """
+    Return the name of the active backend.
+
+    Returns
+    -------
+    str
+        One of 'auto', 'python' or 'numpy'
+    """
+    return _backend
+
+
+def set_backend(name):
+    """
+    Select the backend used by all datatools functions.
+
+    Parameters
+    ----------
+    name : str
+        'auto' (choose per call), 'python' or 'numpy'
+
+    Returns
+    -------
+    str
+        The previously active backend
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend: {name}")
+    if name == 'numpy' and np is None:
+        raise ImportError("The 'numpy' backend requires NumPy to be installed")
+    previous, _backend = _backend, name
+    return previous
+
+
+@contextmanager
+def use_backend(name):
+    """
+    Temporarily select a backend inside a ``with`` block.
+
+    Parameters
+    ----------
+    name : str
+        'auto', 'python' or 'numpy'
+    """
+    previous = set_backend(name)
+    try:
+        yield
+    finally:
+        set_backend(previous)
+
+
+def is_array(data):
+    """Return True if ``data`` is a NumPy array (including masked arrays)."""
+    return np is not None and isinstance(data, np.ndarray)
+
+
+def use_numpy(data):
+    """
+    Decide whether ``data`` should go through the NumPy backend.
+
+    Parameters
+    ----------
+    data : list, numpy.ndarray or iterable
+        Input passed to a datatools function
+
+    Returns
+    -------
+    bool
+        True if the vectorized implementation should be used
+    """
+    if _backend == 'python' or np is None:
+        return False
+    if _backend == 'numpy':
+        return True
+    if isinstance(data, np.ndarray) or hasattr(data, 'to_numpy'):
+        return True
+    return isinstance(data, (list, tuple)) and len(data) >= AUTO_THRESHOLD
+
+
+def to_array(data, allow_none=True):
+    """
+    Convert ``data`` to a numeric array, mapping ``None`` to ``NaN``.
+
+    Masked arrays are returned unchanged so their mask is preserved, and
+    objects with a ``to_numpy()`` method (such as columns of a
+    :mod:`datatools.columnar` file) supply their own zero-copy view.
+
+    Parameters
+    ----------
+    data : list, numpy.ndarray or iterable
+        Input data
+    allow_none : bool
+        If False, ``None`` in a list raises ``TypeError`` instead of
+        becoming ``NaN``, as it does on the pure-Python path of functions
+        that do not handle missing values
+
+    Returns
+    -------
+    numpy.ndarray
+        Array view of the data
+    """
+    if isinstance(data, np.ma.MaskedArray):
+        return data
+    if hasattr(data, 'to_numpy'):
+        return data.to_numpy()
+    if isinstance(data, np.ndarray) and data.dtype.kind in 'fiub':
+        return data
+    if not isinstance(data, (list, tuple, np.ndarray)):
+        data = list(data)
+    arr = np.asarray(data)
+    if arr.dtype.kind not in 'fiub':
+        if not allow_none and arr.dtype == object and any(
+                x is None for x in arr.flat):
+            raise TypeError("Missing values (None) are not supported here; "
+                            "use fill_missing first")
+        arr = np.asarray(data, dtype=float)
+    return arr
+
+
+def missing_mask(arr):
+    """
+    Boolean mask of missing entries in an array from ``to_array``.
+
+    Parameters
+    ----------
+    arr : numpy.ndarray
+        Array (possibly masked)
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean array, True where the value is missing
+    """
+    if isinstance(arr, np.ma.MaskedArray):
+        mask = np.ma.getmaskarray(arr)
+        if arr.dtype.kind == 'f':
+            mask = mask | np.isnan(arr.data)
+        return mask
+    if arr.dtype.kind == 'f':
+        return np.isnan(arr)
+    return np.zeros(arr.shape, dtype=bool)
+
+
+def valid_values(arr):
+    """Return a plain array with the missing entries dropped."""
+    mask = missing_mask(arr)
+    values = np.asarray(arr.data if isinstance(arr, np.ma.MaskedArray) else arr)
+    return values[~mask] if mask.any() else values
+
+
+def restore(result, original):
+    """
+    Match the container type of ``result`` to the caller's input.
+
+    Arrays (and array-backed columns) give arrays; lists that were
+    converted for speed are turned back into lists so the return type does
+    not depend on input size.
+    """
+    if is_array(original) or hasattr(original, 'to_numpy'):
+        return result
+    return result.tolist()
@@ -1,8 +1,12 @@
 """Data cleaning utilities."""
 
 from .missing import fill_missing, detect_missing
-from .outliers import remove_outliers, detect_outliers
+from .outliers import (remove_outliers, detect_outliers, find_outliers,
+                       outlier_bounds, chunked_outlier_bounds, outlier_fences,
+                       resolve_threshold)
 
 __all__ = [
-    'fill_missing', 'detect_missing', 'remove_outliers', 'detect_outliers'
+    'fill_missing', 'detect_missing', 'remove_outliers', 'detect_outliers',
+    'find_outliers', 'outlier_bounds', 'chunked_outlier_bounds',
+    'outlier_fences', 'resolve_threshold'
 ]
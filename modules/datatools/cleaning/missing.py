@@ -1,17 +1,33 @@
 """
 Functions for handling missing values.
+
+Missing values are ``None`` in lists and tuples and ``NaN`` (or masked
+entries) in NumPy arrays. Lists and tuples are handled element by element
+on every backend and at every size: converting them to a float array
+would also count ``NaN`` as missing and turn ints into floats, and an
+object array is slower than the list loop. See :mod:`datatools.backend`
+for how arrays are dispatched.
+Columns of a :mod:`datatools.columnar` file report their missing count
+from the file footer.
 """
 
+from .. import backend, columnar
 from ..stats.descriptive import mean, median
 
 
+def _use_numpy(data):
+    """NumPy path for arrays only; lists keep their ``None`` semantics."""
+    return (not isinstance(data, (list, tuple))
+            and backend.use_numpy(data))
+
+
 def detect_missing(data):
     """
     Detect missing values in dataset.
     
     Parameters
     ----------
-    data : list
+    data : list or numpy.ndarray
         Dataset to check
     
     Returns
@@ -19,6 +35,23 @@ def detect_missing(data):
     dict
         Information about missing values
     """
+    if isinstance(data, columnar.Column):
+        return {
+            'count': data.missing_count,
+            'percentage': (data.missing_count / len(data)) * 100,
+            'indices': data.missing_indices()
+        }
+
+    if _use_numpy(data):
+        mask = backend.missing_mask(backend.to_array(data))
+        missing_count = int(mask.sum())
+        indices = backend.np.flatnonzero(mask)
+        return {
+            'count': missing_count,
+            'percentage': (missing_count / mask.size) * 100,
+            'indices': backend.restore(indices, data)
+        }
+
     missing_count = sum(1 for x in data if x is None)
     return {
         'count': missing_count,
@@ -27,32 +60,46 @@ def detect_missing(data):
     }
 
 
+def _fill_value(valid_data, strategy):
+    """Compute the replacement value for ``strategy`` from the valid data."""
+    if strategy == 'mean':
+        return mean(valid_data)
+    elif strategy == 'median':
+        return median(valid_data)
+    elif strategy == 'zero':
+        return 0
+    raise ValueError(f"Unknown strategy: {strategy}")
+
+
 def fill_missing(data, strategy='mean'):
     """
     Fill missing values using specified strategy.
     
     Parameters
     ----------
-    data : list
-        Dataset with potential None values
+    data : list or numpy.ndarray
+        Dataset with potential None values (NaN or masked entries in an
+        array)
     strategy : str
         Strategy for filling: 'mean', 'median', or 'zero'
     
     Returns
     -------
-    list
-        Dataset with filled values
+    list or numpy.ndarray
+        Dataset with filled values; lists keep their other elements as
+        they are
     """
+    if _use_numpy(data):
+        arr = backend.to_array(data)
+        mask = backend.missing_mask(arr)
+        fill_value = _fill_value(backend.valid_values(arr), strategy)
+        values = arr.data if isinstance(arr, backend.np.ma.MaskedArray) else arr
+        if not mask.any():
+            return backend.restore(values.copy(), data)
+        return backend.restore(backend.np.where(mask, fill_value, values), data)
+
     # Get non-None values
     valid_data = [x for x in data if x is not None]
-
-    if strategy == 'mean':
-        fill_value = mean(valid_data)
-    elif strategy == 'median':
-        fill_value = median(valid_data)
-    elif strategy == 'zero':
-        fill_value = 0
-    else:
-        raise ValueError(f"Unknown strategy: {strategy}")
+    fill_value = _fill_value(valid_data, strategy)
 
     return [x if x is not None else fill_value for x in data]
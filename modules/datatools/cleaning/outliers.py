@@ -1,71 +1,438 @@
 """
 Functions for detecting and removing outliers.
+
+Three methods are available:
+
+- ``'zscore'``: distance from the mean in standard deviations (default
+  threshold 3).
+- ``'iqr'``: Tukey fences, values below ``Q1 - t * IQR`` or above
+  ``Q3 + t * IQR`` (default threshold 1.5).
+- ``'mad'``: modified z-score ``0.6745 * (x - median) / MAD`` based on the
+  median absolute deviation (default threshold 3.5, after Iglewicz and
+  Hoaglin). Robust to heavy tails, unlike the z-score.
+
+Detection runs in two stages: the statistics a method needs are
+computed first (``math.fsum`` of the values and of the squared
+deviations for the z-score, as in :func:`~datatools.stats.variance`, and
+linear-time selection for the quartiles and medians), then a final pass
+builds a compact mask. ``find_outliers`` exposes that mask, or the outlier
+positions as an ``array('q')``, without allocating per-outlier objects.
+
+NumPy arrays and large lists are handled with vectorized boolean masks
+(see :mod:`datatools.backend`). ``chunked_outlier_bounds`` fits the same
+methods over a stream of chunks.
 """
 
-from ..stats.descriptive import mean, std_dev
+import math
+from array import array
+from itertools import compress
+
+from .. import backend
+from ..stats.accumulator import RunningStats, squared_deviations
+from ..stats.selection import QuantileSketch, quantiles
+
+METHODS = ('zscore', 'iqr', 'mad')
+
+DEFAULT_THRESHOLDS = {'zscore': 3, 'iqr': 1.5, 'mad': 3.5}
+
+# Scales the MAD so it estimates the standard deviation of a normal sample
+_MAD_SCALE = 0.6745
+
+
+def resolve_threshold(method, threshold):
+    """
+    Validate ``method`` and fill in its default threshold.
+
+    Parameters
+    ----------
+    method : str
+        Method to use: 'zscore', 'iqr' or 'mad'
+    threshold : float or None
+        Requested threshold, or None for the method's default
+
+    Returns
+    -------
+    float
+        The threshold to use
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown outlier method {method!r}; expected one "
+                         f"of {', '.join(map(repr, METHODS))}")
+    return DEFAULT_THRESHOLDS[method] if threshold is None else threshold
+
+
+def _zscore_params(data):
+    """Mean and sample standard deviation of a list, via ``math.fsum``."""
+    _check_size(len(data), 'zscore')
+    center = math.fsum(data) / len(data)
+    ss = math.fsum(squared_deviations(data, center))
+    return center, (ss / (len(data) - 1)) ** 0.5
+
+
+def _to_array(data):
+    """
+    Convert for the NumPy path, rejecting ``None`` as the list path does.
+
+    ``NaN`` and masked entries in arrays still count as missing.
+    """
+    return backend.to_array(data, allow_none=False)
+
+
+def _python_mask(data, method, threshold):
+    """Outlier mask for a list, as a bytearray of 0/1 flags."""
+    if method == 'zscore':
+        m, s = _zscore_params(data)
+        if s > 0:
+            return bytearray(abs((x - m) / s) > threshold for x in data)
+        return bytearray(len(data))
+    if method == 'iqr':
+        lower, upper = _iqr_fences(*quantiles(data, [0.25, 0.75]), threshold)
+        return bytearray(x < lower or x > upper for x in data)
+    # method == 'mad'
+    med = quantiles(data, [0.5])[0]
+    mad = quantiles([abs(x - med) for x in data], [0.5])[0]
+    if mad > 0:
+        scale = _MAD_SCALE / mad
+        return bytearray(abs((x - med) * scale) > threshold for x in data)
+    return bytearray(len(data))
+
+
+def _numpy_mask(arr, method, threshold):
+    """
+    Outlier mask for an array on the NumPy backend.
+
+    The statistics are computed over the present values only; missing
+    entries (masked or NaN) are never flagged.
+    """
+    missing = backend.missing_mask(arr)
+    flags = _valid_mask(backend.valid_values(arr), method, threshold)
+    if not missing.any():
+        return flags
+    mask = backend.np.zeros(arr.shape, dtype=bool)
+    mask[~missing] = flags
+    return mask
+
+
+def _check_size(size, method):
+    """Raise the pure-Python path's error for too few values."""
+    if method == 'zscore':
+        if size == 0:
+            raise ValueError("Cannot calculate mean of empty dataset")
+        if size < 2:
+            raise ValueError("Need at least 2 values for variance")
+    elif size == 0:
+        raise ValueError("Cannot calculate quantiles of empty dataset")
+
+
+def _valid_mask(arr, method, threshold):
+    """Outlier mask for a plain array without missing values."""
+    np = backend.np
+    _check_size(arr.size, method)
+    if method == 'zscore':
+        # Reuse one temporary for deviations, scaled deviations and |z|
+        dev = arr - arr.mean()
+        s = float(np.sqrt(np.dot(dev, dev) / (arr.size - 1)))
+        if s == 0:
+            return np.zeros(arr.shape, dtype=bool)
+        np.divide(dev, s, out=dev)
+        np.abs(dev, out=dev)
+        return dev > threshold
+    if method == 'iqr':
+        # np.percentile partitions (introselect) rather than sorting
+        q1, q3 = np.percentile(arr, [25, 75])
+        lower, upper = _iqr_fences(q1, q3, threshold)
+        return (arr < lower) | (arr > upper)
+    # method == 'mad'
+    dev = np.abs(arr - np.median(arr))
+    mad = float(np.median(dev))
+    if mad == 0:
+        return np.zeros(arr.shape, dtype=bool)
+    dev *= _MAD_SCALE / mad
+    return dev > threshold
+
+
+def _iqr_fences(q1, q3, threshold):
+    """Tukey fences for the given quartiles."""
+    iqr = q3 - q1
+    return q1 - threshold * iqr, q3 + threshold * iqr
+
+
+def outlier_fences(method, threshold, center, spread):
+    """
+    Turn a location/scale estimate into ``(lower, upper)`` fences.
+
+    Parameters
+    ----------
+    method : str
+        Method to use: 'zscore', 'iqr' or 'mad'
+    threshold : float
+        Threshold, e.g. from :func:`resolve_threshold`
+    center, spread : float
+        Mean and standard deviation ('zscore'), first and third quartile
+        ('iqr'), or median and MAD ('mad')
+
+    Returns
+    -------
+    tuple
+        ``(lower, upper)``; infinite when the data has no spread
+    """
+    if method == 'iqr':
+        return _iqr_fences(center, spread, threshold)
+    if spread <= 0:
+        return float('-inf'), float('inf')
+    if method == 'mad':
+        spread /= _MAD_SCALE
+    return center - threshold * spread, center + threshold * spread
+
+
+def outlier_bounds(data, method='zscore', threshold=None):
+    """
+    Compute the fences outside which values count as outliers.
+
+    Useful to fit a method once and apply it to other data, or to a
+    stream, with a simple ``lower <= x <= upper`` comparison.
+
+    Parameters
+    ----------
+    data : list or numpy.ndarray
+        Numerical dataset
+    method : str
+        Method to use: 'zscore', 'iqr' or 'mad'
+    threshold : float, optional
+        Threshold for outlier detection (default depends on the method)
+
+    Returns
+    -------
+    tuple
+        ``(lower, upper)``; infinite when the data has no spread
+    """
+    data = _as_sequence(data)
+    threshold = resolve_threshold(method, threshold)
+    if backend.use_numpy(data):
+        arr = backend.valid_values(_to_array(data))
+        _check_size(arr.size, method)
+        if method == 'zscore':
+            return outlier_fences(method, threshold, float(arr.mean()),
+                                  float(arr.std(ddof=1)))
+        if method == 'iqr':
+            q1, q3 = backend.np.percentile(arr, [25, 75])
+            return outlier_fences(method, threshold, float(q1), float(q3))
+        med = float(backend.np.median(arr))
+        mad = float(backend.np.median(backend.np.abs(arr - med)))
+        return outlier_fences(method, threshold, med, mad)
+
+    if method == 'zscore':
+        return outlier_fences(method, threshold, *_zscore_params(data))
+    if method == 'iqr':
+        return outlier_fences(method, threshold,
+                              *quantiles(data, [0.25, 0.75]))
+    med = quantiles(data, [0.5])[0]
+    mad = quantiles([abs(x - med) for x in data], [0.5])[0]
+    return outlier_fences(method, threshold, med, mad)
 
 
-def detect_outliers(data, method='zscore', threshold=3):
+def _chunk_list(chunk):
+    """Plain list of a chunk's values, for feeding sketches."""
+    return chunk.tolist() if backend.is_array(chunk) else chunk
+
+
+def chunked_outlier_bounds(chunks, method='zscore', threshold=None, k=200,
+                           seed=None):
+    """
+    Fit outlier fences over data that arrives in chunks.
+
+    The z-score fences merge per-chunk ``RunningStats``, so they match
+    ``outlier_bounds`` on the concatenated data up to rounding.
+    The 'iqr' and 'mad' fences use a mergeable
+    :class:`~datatools.stats.selection.QuantileSketch`, so quartiles and
+    medians are approximate within the sketch's rank error (about ``2/k``).
+    Memory use is bounded by the largest chunk plus the sketch.
+
+    Parameters
+    ----------
+    chunks : iterable of list or numpy.ndarray
+        The data, split into chunks. The 'mad' method needs two passes,
+        so it requires a re-iterable (e.g. a list of chunks or an object
+        whose ``__iter__`` restarts the stream).
+    method : str
+        Method to use: 'zscore', 'iqr' or 'mad'
+    threshold : float, optional
+        Threshold for outlier detection (default depends on the method)
+    k : int
+        Sketch size for the quantile-based methods
+    seed : int, optional
+        Seed for the sketches' random compaction, for reproducible fences
+
+    Returns
+    -------
+    tuple
+        ``(lower, upper)`` fences, as from ``outlier_bounds``
+    """
+    threshold = resolve_threshold(method, threshold)
+    if method == 'zscore':
+        acc = RunningStats()
+        for chunk in chunks:
+            if backend.is_array(chunk):
+                acc.merge(RunningStats.from_array(chunk))
+            else:
+                acc.update(chunk)
+        return outlier_fences(method, threshold, acc.mean, acc.std_dev)
+
+    if method == 'mad' and iter(chunks) is chunks:
+        raise TypeError("The 'mad' method needs re-iterable chunks "
+                        "(two passes over the data)")
+    sketch = QuantileSketch(k, seed)
+    for chunk in chunks:
+        sketch.update(_chunk_list(chunk))
+    if method == 'iqr':
+        return outlier_fences(method, threshold,
+                              *sketch.quantiles([0.25, 0.75]))
+
+    med = sketch.median()
+    deviations = QuantileSketch(k, seed)
+    for chunk in chunks:
+        deviations.update(abs(x - med) for x in _chunk_list(chunk))
+    return outlier_fences(method, threshold, med, deviations.median())
+
+
+def _as_sequence(data):
+    """Materialize one-shot iterables, since detection needs two passes."""
+    if (backend.is_array(data) or isinstance(data, (list, tuple))
+            or hasattr(data, 'to_numpy')):
+        return data
+    return list(data)
+
+
+def find_outliers(data, method='zscore', threshold=None, return_mask=False):
+    """
+    Locate outliers and return them in a compact form.
+
+    Parameters
+    ----------
+    data : list or numpy.ndarray
+        Numerical dataset
+    method : str
+        Method to use: 'zscore', 'iqr' or 'mad'
+    threshold : float, optional
+        Threshold for outlier detection (default depends on the method)
+    return_mask : bool
+        If True, return a mask with one flag per element instead of the
+        outlier positions
+
+    Returns
+    -------
+    array.array, bytearray or numpy.ndarray
+        Outlier positions as ``array('q')`` (or an integer array on the
+        NumPy backend); with ``return_mask``, a ``bytearray`` of 0/1
+        flags (or a boolean array)
+    """
+    data = _as_sequence(data)
+    threshold = resolve_threshold(method, threshold)
+    if backend.use_numpy(data):
+        mask = _numpy_mask(_to_array(data), method, threshold)
+        return mask if return_mask else backend.np.flatnonzero(mask)
+
+    mask = _python_mask(data, method, threshold)
+    if return_mask:
+        return mask
+    return array('q', compress(range(len(mask)), mask))
+
+
+def detect_outliers(data, method='zscore', threshold=None):
     """
     Detect outliers in dataset.
     
     Parameters
     ----------
-    data : list
+    data : list or numpy.ndarray
         Numerical dataset
     method : str
-        Method to use: 'zscore' or 'iqr'
-    threshold : float
-        Threshold for outlier detection
+        Method to use: 'zscore', 'iqr' or 'mad'
+    threshold : float, optional
+        Threshold for outlier detection (default depends on the method)
     
     Returns
     -------
     dict
         Information about outliers
     """
-    if method == 'zscore':
-        m = mean(data)
-        s = std_dev(data)
-
-        outliers = []
-        for i, value in enumerate(data):
-            z_score = abs((value - m) / s) if s > 0 else 0
-            if z_score > threshold:
-                outliers.append({
-                    'index': i,
-                    'value': value,
-                    'z_score': z_score
-                })
-
+    data = _as_sequence(data)
+    threshold = resolve_threshold(method, threshold)
+    if backend.use_numpy(data):
+        arr = _to_array(data)
+        mask = _numpy_mask(arr, method, threshold)
+        indices = backend.np.flatnonzero(mask)
         return {
-            'count': len(outliers),
-            'indices': [o['index'] for o in outliers],
-            'values': [o['value'] for o in outliers],
-            'method': method
+            'count': int(indices.size),
+            'indices': backend.restore(indices, data),
+            'values': backend.restore(arr[mask], data),
+            'method': method,
+            'threshold': threshold
         }
-    else:
-        raise NotImplementedError(f"Method '{method}' not yet implemented")
 
+    mask = _python_mask(data, method, threshold)
+    return {
+        'count': mask.count(1),
+        'indices': list(compress(range(len(mask)), mask)),
+        'values': list(compress(data, mask)),
+        'method': method,
+        'threshold': threshold
+    }
 
-def remove_outliers(data, method='zscore', threshold=3):
+
+def remove_outliers(data, method='zscore', threshold=None, inplace=False):
     """
     Remove outliers from dataset.
     
     Parameters
     ----------
-    data : list
+    data : list or numpy.ndarray
         Numerical dataset
     method : str
-        Method to detect outliers ('zscore' or 'iqr')
-    threshold : float
-        Threshold for outlier detection
+        Method to detect outliers ('zscore', 'iqr' or 'mad')
+    threshold : float, optional
+        Threshold for outlier detection (default depends on the method)
+    inplace : bool
+        If True, compact ``data`` itself instead of building a new
+        container. Lists are truncated; for arrays the kept values are
+        moved to the front and a view of that prefix is returned.
     
     Returns
     -------
-    list
+    list or numpy.ndarray
         Data with outliers removed
     """
-    outlier_info = detect_outliers(data, method, threshold)
-    outlier_indices = set(outlier_info['indices'])
+    data = _as_sequence(data)
+    threshold = resolve_threshold(method, threshold)
+    if inplace:
+        return _remove_inplace(data, method, threshold)
+
+    if backend.use_numpy(data):
+        arr = _to_array(data)
+        return backend.restore(arr[~_numpy_mask(arr, method, threshold)],
+                               data)
+
+    mask = _python_mask(data, method, threshold)
+    return [value for value, is_outlier in zip(data, mask) if not is_outlier]
+
+
+def _remove_inplace(data, method, threshold):
+    """Compact ``data`` in place, keeping only the non-outliers."""
+    if backend.is_array(data):
+        keep = ~_numpy_mask(_to_array(data), method, threshold)
+        kept = int(keep.sum())
+        data[:kept] = data[keep]
+        return data[:kept]
 
-    return [value for i, value in enumerate(data) if i not in outlier_indices]
+    if not isinstance(data, list):
+        raise TypeError("In-place removal requires a list or NumPy array")
+    mask = find_outliers(data, method, threshold, return_mask=True)
+    if backend.is_array(mask):
+        mask = mask.tobytes()
+    write = 0
+    for value, is_outlier in zip(data, mask):
+        if not is_outlier:
+            data[write] = value
+            write += 1
+    del data[write:]
+    return data
@@ -0,0 +1,357 @@
+"""
+Memory-mapped columnar file format for datatools datasets.
+
+Parsing the same CSV before every analysis is wasteful. This module
+stores columns once in a compact binary layout and maps them back with
+``mmap``, so reading does not copy or parse anything.
+
+File layout::
+
+    b'DTCOL\\x00\\x01\\x00'              magic, 8 bytes
+    column 0 values                     contiguous array, 8-byte aligned
+    column 0 validity bitmap            1 bit per row, 1 = present
+    ...                                 further columns
+    footer                              UTF-8 JSON
+    footer length                       uint64
+    b'DTCOL\\x00\\x01\\x00'              magic again
+
+Values are stored in native byte order (recorded in the footer) with an
+``array`` typecode (``'d'`` for float64, ``'q'`` for int64); missing
+entries (``None``) occupy a zeroed slot and a cleared bit in the validity
+bitmap. The JSON footer records, for every
+column, its offsets and precomputed statistics (count, missing count,
+sum, sum of squares, M2, min, max), so ``mean``, ``std_dev``,
+``detect_missing`` and ``check_missing`` read the answer from the footer
+instead of scanning the data.
+
+Example::
+
+    write_columnar('sensors.dtc', {'temp': temps, 'rh': humidity})
+    with open_columnar('sensors.dtc') as ds:
+        mean(ds['temp'])             # O(1), from the footer
+        detect_outliers(ds['temp'])  # runs on the mapped buffer
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from . import backend
+from .stats.accumulator import RunningStats
+
+MAGIC = b'DTCOL\x00\x01\x00'
+
+_FOOTER_SIZE = struct.Struct('<Q')
+_ALIGNMENT = 8
+_WRITE_BATCH = 65_536
+_NUMPY_DTYPES = {'d': 'f8', 'q': 'i8'}
+
+
+def _padding(offset):
+    return -offset % _ALIGNMENT
+
+
+def _write_column(f, values, typecode):
+    """Stream one column to ``f`` and return its footer entry."""
+    f.write(b'\x00' * _padding(f.tell()))
+    offset = f.tell()
+    acc = RunningStats()
+    sumsq = 0
+    bitmap = bytearray()
+    length = 0
+    batch = array(typecode)
+    for value in values:
+        if length % 8 == 0:
+            bitmap.append(0)
+        if value is None:
+            batch.append(0)
+        else:
+            batch.append(value)
+            value = batch[-1]
+            acc.push(value)
+            sumsq += value * value
+            bitmap[-1] |= 1 << (length % 8)
+        length += 1
+        if len(batch) == _WRITE_BATCH:
+            batch.tofile(f)
+            batch = array(typecode)
+    batch.tofile(f)
+    bitmap_offset = f.tell()
+    f.write(bitmap)
+
+    return {
+        'typecode': typecode,
+        'offset': offset,
+        'length': length,
+        'bitmap_offset': bitmap_offset,
+        'valid': acc.count,
+        'sum': acc.sum,
+        'sumsq': sumsq,
+        'm2': acc.m2,
+        'min': acc.min,
+        'max': acc.max
+    }
+
+
+def write_columnar(path, columns, typecodes=None):
+    """
+    Write columns to a columnar file.
+
+    Each column is consumed once, so generators (for example chunks from
+    :func:`~datatools.io.read_csv_column`, flattened) can be written
+    without holding them in memory.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Destination file (overwritten)
+    columns : dict
+        Mapping from column name to an iterable of numbers or ``None``
+    typecodes : dict, optional
+        Mapping from column name to ``'d'`` (float, default) or ``'q'``
+        (64-bit integer)
+
+    Returns
+    -------
+    dict
+        Footer metadata that was written
+    """
+    typecodes = typecodes or {}
+    footer = {'version': 1, 'byteorder': sys.byteorder, 'columns': {}}
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        for name, values in columns.items():
+            typecode = typecodes.get(name, 'd')
+            if typecode not in _NUMPY_DTYPES:
+                raise ValueError(f"Unsupported typecode: {typecode}")
+            footer['columns'][name] = _write_column(f, values, typecode)
+        encoded = json.dumps(footer).encode('utf-8')
+        f.write(encoded)
+        f.write(_FOOTER_SIZE.pack(len(encoded)))
+        f.write(MAGIC)
+    return footer
+
+
+class Column:
+    """
+    One column of a mapped columnar file.
+
+    Behaves like a read-only sequence of numbers and ``None``. The raw
+    values are exposed as a zero-copy ``memoryview`` (``values``) and, with
+    NumPy, as an array over the same buffer (``to_numpy``). Summary
+    statistics come straight from the file footer.
+
+    Attributes
+    ----------
+    name : str
+        Column name
+    valid_count : int
+        Number of present (non-missing) values
+    missing_count : int
+        Number of missing values
+    sum, sumsq, min, max : float
+        Precomputed statistics over the present values
+    """
+
+    def __init__(self, name, buffer, meta):
+        self.name = name
+        self._meta = meta
+        self._length = meta['length']
+        self.valid_count = meta['valid']
+        self.missing_count = self._length - self.valid_count
+        self.sum = meta['sum']
+        self.sumsq = meta['sumsq']
+        self.min = meta['min']
+        self.max = meta['max']
+        typecode = meta['typecode']
+        itemsize = array(typecode).itemsize
+        start = meta['offset']
+        raw = buffer[start:start + self._length * itemsize]
+        self.values = raw.cast(typecode)
+        bitmap_start = meta['bitmap_offset']
+        bitmap_end = bitmap_start + (self._length + 7) // 8
+        self.validity = buffer[bitmap_start:bitmap_end]
+        self._raw = raw
+
+    def __len__(self):
+        return self._length
+
+    def is_valid(self, index):
+        """Return True if the value at ``index`` is present."""
+        return bool(self.validity[index >> 3] & (1 << (index & 7)))
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Column index out of range")
+        return self.values[index] if self.is_valid(index) else None
+
+    def __iter__(self):
+        values = self.values
+        if self.missing_count == 0:
+            yield from values
+            return
+        validity = self.validity
+        for i, value in enumerate(values):
+            yield value if validity[i >> 3] & (1 << (i & 7)) else None
+
+    @property
+    def mean(self):
+        """Mean of the present values, from the footer."""
+        if self.valid_count == 0:
+            raise ValueError("Cannot calculate mean of empty dataset")
+        return self.sum / self.valid_count
+
+    @property
+    def variance(self):
+        """Sample variance of the present values, from the footer."""
+        if self.valid_count < 2:
+            raise ValueError("Need at least 2 values for variance")
+        return self._meta['m2'] / (self.valid_count - 1)
+
+    @property
+    def std_dev(self):
+        """Sample standard deviation of the present values."""
+        return self.variance**0.5
+
+    def missing_indices(self):
+        """
+        Positions of the missing values.
+
+        Fully-present bitmap bytes are skipped without inspecting their
+        bits, so this is cheap when few values are missing.
+
+        Returns
+        -------
+        list
+            Indices of missing entries
+        """
+        if self.missing_count == 0:
+            return []
+        indices = []
+        for byte_index, byte in enumerate(self.validity):
+            if byte == 0xFF:
+                continue
+            base = byte_index << 3
+            for bit in range(8):
+                i = base + bit
+                if i < self._length and not byte & (1 << bit):
+                    indices.append(i)
+        return indices
+
+    def to_numpy(self):
+        """
+        NumPy view of the column over the mapped buffer.
+
+        Returns
+        -------
+        numpy.ndarray or numpy.ma.MaskedArray
+            Zero-copy array; when values are missing, a masked array
+            whose mask is decoded from the validity bitmap. The array
+            borrows the mapping, so drop it before closing the file.
+        """
+        np = backend.np
+        if np is None:
+            raise ImportError("to_numpy requires NumPy to be installed")
+        dtype = _NUMPY_DTYPES[self._meta['typecode']]
+        arr = np.frombuffer(self._raw, dtype=dtype)
+        if self.missing_count == 0:
+            return arr
+        bits = np.unpackbits(np.frombuffer(self.validity, dtype=np.uint8),
+                             count=self._length, bitorder='little')
+        return np.ma.masked_array(arr, mask=bits == 0)
+
+    def _release(self):
+        for view in (self.values, self.validity, self._raw):
+            view.release()
+
+    def __repr__(self):
+        return (f"Column({self.name!r}, length={self._length}, "
+                f"missing={self.missing_count})")
+
+
+class ColumnarFile:
+    """
+    A columnar file mapped into memory.
+
+    Use as a context manager, or call ``close()`` when done. Columns are
+    looked up by name with ``file[name]``.
+
+    Parameters
+    ----------
+    path : str or path-like
+        File written by :func:`write_columnar`
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        self._columns = {}
+        tail = len(MAGIC) + _FOOTER_SIZE.size
+        if (len(self._mmap) < len(MAGIC) + tail
+                or self._buffer[:len(MAGIC)] != MAGIC
+                or self._buffer[-len(MAGIC):] != MAGIC):
+            self.close()
+            raise ValueError(f"{path} is not a datatools columnar file")
+        (footer_size,) = _FOOTER_SIZE.unpack(self._buffer[-tail:-len(MAGIC)])
+        footer_start = len(self._mmap) - tail - footer_size
+        try:
+            self.footer = json.loads(bytes(self._buffer[footer_start:-tail]))
+        except ValueError:
+            self.close()
+            raise ValueError(f"{path} has a corrupt footer") from None
+        if self.footer.get('byteorder', sys.byteorder) != sys.byteorder:
+            self.close()
+            raise ValueError(f"{path} was written on a machine with "
+                             "different byte order")
+
+    @property
+    def columns(self):
+        """Names of the stored columns."""
+        return list(self.footer['columns'])
+
+    def __getitem__(self, name):
+        if name not in self._columns:
+            meta = self.footer['columns'][name]
+            self._columns[name] = Column(name, self._buffer, meta)
+        return self._columns[name]
+
+    def __contains__(self, name):
+        return name in self.footer['columns']
+
+    def close(self):
+        """Release every column view and unmap the file."""
+        for column in self._columns.values():
+            column._release()
+        self._columns.clear()
+        if self._buffer is not None:
+            self._buffer.release()
+            self._buffer = None
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_columnar(path):
+    """
+    Map a columnar file for reading.
+
+    Parameters
+    ----------
+    path : str or path-like
+        File written by :func:`write_columnar`
+
+    Returns
+    -------
+    ColumnarFile
+        Mapped file; use it as a context manager
+    """
+    return ColumnarFile(path)
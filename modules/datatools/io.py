@@ -0,0 +1,141 @@
+"""
+Chunked CSV input and output.
+
+Columns are read lazily in fixed-size chunks (lists), so files larger
+than memory can be processed one chunk at a time. Empty cells and common
+missing-value markers are returned as ``None``, matching the rest of
+datatools.
+"""
+
+import csv
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+MISSING_VALUES = frozenset({'', 'NA', 'N/A', 'NaN', 'nan', 'null', 'None'})
+
+
+class CSVColumn:
+    """
+    Re-iterable, chunked view of one column of a CSV file.
+
+    Each iteration re-opens the file and yields lists of up to
+    ``chunk_size`` values, so the same object can drive several passes
+    (e.g. computing statistics first and transforming afterwards).
+
+    Parameters
+    ----------
+    path : str or path-like
+        CSV file with a header row
+    column : str or int
+        Column name, or 0-based column position
+    chunk_size : int
+        Number of values per chunk
+    converter : callable
+        Applied to every non-missing cell (default: float)
+    delimiter : str
+        Field delimiter
+    missing_values : collection of str
+        Cell contents treated as missing
+    """
+
+    def __init__(self, path, column, chunk_size=DEFAULT_CHUNK_SIZE,
+                 converter=float, delimiter=',',
+                 missing_values=MISSING_VALUES):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.path = path
+        self.column = column
+        self.chunk_size = chunk_size
+        self.converter = converter
+        self.delimiter = delimiter
+        self.missing_values = missing_values
+
+    def _column_index(self, header):
+        if isinstance(self.column, int):
+            if not 0 <= self.column < len(header):
+                raise IndexError(f"Column {self.column} out of range")
+            return self.column
+        try:
+            return header.index(self.column)
+        except ValueError:
+            raise KeyError(f"Column '{self.column}' not found") from None
+
+    def __iter__(self):
+        with open(self.path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f, delimiter=self.delimiter)
+            header = next(reader, None)
+            if header is None:
+                return
+            index = self._column_index(header)
+            convert = self.converter
+            missing = self.missing_values
+            chunk = []
+            for row in reader:
+                cell = row[index].strip() if index < len(row) else ''
+                chunk.append(None if cell in missing else convert(cell))
+                if len(chunk) == self.chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+    def __repr__(self):
+        return (f"CSVColumn({self.path!r}, {self.column!r}, "
+                f"chunk_size={self.chunk_size})")
+
+
+def read_csv_column(path, column, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+    """
+    Read one CSV column lazily in chunks.
+
+    Parameters
+    ----------
+    path : str or path-like
+        CSV file with a header row
+    column : str or int
+        Column name, or 0-based column position
+    chunk_size : int
+        Number of values per chunk
+    **kwargs
+        Passed to :class:`CSVColumn` (``converter``, ``delimiter``,
+        ``missing_values``)
+
+    Returns
+    -------
+    CSVColumn
+        Re-iterable source of value chunks
+    """
+    return CSVColumn(path, column, chunk_size, **kwargs)
+
+
+def write_csv_column(path, chunks, header='value', delimiter=','):
+    """
+    Write chunks of values as a single-column CSV file.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Destination file (overwritten)
+    chunks : iterable of iterables
+        Values to write; ``None`` is written as an empty cell
+    header : str, optional
+        Column name for the header row (``None`` to omit it)
+    delimiter : str
+        Field delimiter
+
+    Returns
+    -------
+    int
+        Number of values written
+    """
+    written = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        if header is not None:
+            writer.writerow([header])
+        for chunk in chunks:
+            if hasattr(chunk, 'tolist'):
+                chunk = chunk.tolist()
+            writer.writerows(('' if x is None else x,) for x in chunk)
+            written += len(chunk)
+    return written
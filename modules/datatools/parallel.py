@@ -0,0 +1,250 @@
+"""
+Opt-in multi-core execution for large inputs.
+
+A ``ParallelExecutor`` splits a list into chunks, runs a kernel on each
+chunk in a process (or thread) pool and returns the per-chunk results in
+order, for the caller to merge. Kernels return mergeable partial results
+(exact sums from ``partial_sums``, counts, violation lists), and every
+merge is exact, so the output does not depend on the number of workers or
+the chunk size and matches the serial functions bit for bit. The exact
+sums are two or three ``math.fsum`` passes in C per chunk, so the kernels
+do about three times the serial work: a net speedup needs several workers
+on separate cores (``benchmarks/parallel_stats.py`` measures the
+crossover on a given machine).
+
+Pass an executor to the functions that support it::
+
+    with ParallelExecutor(workers=8, chunk_size=500_000) as ex:
+        m = mean(data, executor=ex)
+        report = data_validators.check_outliers(data, executor=ex)
+
+Processes sidestep the GIL but pickle each chunk to the workers; threads
+avoid the copy, but the kernels hold the GIL, so scaling across cores
+needs processes. Pickling a list costs about as much as summing it, so
+kernels that only read the values as floats go through
+``map_float_chunks``, which sends ``array('d')`` slices: they pickle as
+raw bytes, roughly ten times faster than the list slices.
+Inputs no larger than one chunk are processed inline.
+"""
+
+import math
+import os
+from array import array
+from itertools import chain
+
+from .stats.accumulator import partial_sums, squared_deviations
+
+DEFAULT_CHUNK_SIZE = 250_000
+
+# concurrent.futures is imported when the first pool starts
+POOL_KINDS = {'process': 'ProcessPoolExecutor',
+              'thread': 'ThreadPoolExecutor'}
+
+
+class ParallelExecutor:
+    """
+    Chunked map over a pool of workers.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Number of workers (default: number of CPUs)
+    chunk_size : int
+        Number of elements per chunk
+    kind : str
+        'process' (default) or 'thread'
+    """
+
+    def __init__(self, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                 kind='process'):
+        if kind not in POOL_KINDS:
+            raise ValueError(f"Unknown executor kind: {kind}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.kind = kind
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            import concurrent.futures
+            pool_class = getattr(concurrent.futures, POOL_KINDS[self.kind])
+            self._pool = pool_class(max_workers=self.workers)
+        return self._pool
+
+    def _runs_inline(self, data):
+        return self.workers == 1 or len(data) <= self.chunk_size
+
+    def as_floats(self, data):
+        """
+        Prepare ``data`` for several ``map_float_chunks`` calls.
+
+        Process pools get an ``array('d')`` copy, converted once, that
+        pickles as raw bytes; otherwise ``data`` is returned unchanged.
+        Values convert as in ``float()`` (huge ints raise
+        ``OverflowError``, ``None`` raises ``TypeError``), which is what
+        arithmetic with a float or ``math.fsum`` would do with them.
+
+        Parameters
+        ----------
+        data : sequence
+            Numerical input
+
+        Returns
+        -------
+        sequence
+            ``data`` or an ``array('d')`` with the same values as floats
+        """
+        if (self.kind != 'process' or self._runs_inline(data)
+                or (isinstance(data, array) and data.typecode == 'd')):
+            return data
+        return array('d', data)
+
+    def map_chunks(self, func, data, *args):
+        """
+        Apply ``func(chunk, offset, *args)`` to consecutive chunks.
+
+        Parameters
+        ----------
+        func : callable
+            Kernel; must be a module-level function for process pools
+        data : sequence
+            Input supporting ``len`` and slicing
+        *args
+            Extra arguments passed to every call
+
+        Returns
+        -------
+        list
+            One result per chunk, in chunk order
+        """
+        if self._runs_inline(data):
+            return [func(data, 0, *args)]
+        pool = self._get_pool()
+        size = self.chunk_size
+        futures = [
+            pool.submit(func, data[start:start + size], start, *args)
+            for start in range(0, len(data), size)
+        ]
+        return [future.result() for future in futures]
+
+    def map_float_chunks(self, func, data, *args):
+        """
+        ``map_chunks`` for kernels that only use the values as floats.
+
+        The chunks are slices of ``as_floats(data)``; pass data already
+        prepared with ``as_floats`` to convert once for several calls.
+        Kernels must not depend on the element type (ints arrive as
+        floats on a process pool).
+
+        Parameters
+        ----------
+        func : callable
+            Kernel; must be a module-level function for process pools
+        data : sequence
+            Numerical input supporting ``len`` and slicing
+        *args
+            Extra arguments passed to every call
+
+        Returns
+        -------
+        list
+            One result per chunk, in chunk order
+        """
+        return self.map_chunks(func, self.as_floats(data), *args)
+
+    def close(self):
+        """Shut down the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return (f"ParallelExecutor(workers={self.workers}, "
+                f"chunk_size={self.chunk_size}, kind={self.kind!r})")
+
+
+# Shared chunk kernels: module-level so they can be sent to worker
+# processes. Each receives its chunk and the chunk's offset in the data.
+
+def chunk_sum(chunk, offset):
+    """Kernel: exact sum of a chunk, as ``partial_sums``."""
+    return partial_sums(chunk)
+
+
+def chunk_squared_deviations(chunk, offset, center):
+    """Kernel: exact sum of squared deviations from ``center``."""
+    return partial_sums(squared_deviations(chunk, center))
+
+
+def merge_sums(chunk_partials):
+    """
+    Correctly rounded total of per-chunk ``partial_sums``.
+
+    Parameters
+    ----------
+    chunk_partials : iterable of list
+        Partials returned by the chunk kernels
+
+    Returns
+    -------
+    float
+        Equal to ``math.fsum`` over the concatenated chunks
+    """
+    return math.fsum(chain.from_iterable(chunk_partials))
+
+
+def parallel_mean(data, executor):
+    """
+    Mean of a list computed chunk-wise on ``executor``.
+
+    Parameters
+    ----------
+    data : list or tuple
+        Numerical dataset
+    executor : ParallelExecutor
+        Executor to run the chunks on
+
+    Returns
+    -------
+    float
+        Same value as :func:`datatools.stats.descriptive.mean`
+    """
+    if not data:
+        raise ValueError("Cannot calculate mean of empty dataset")
+    sums = executor.map_float_chunks(chunk_sum, data)
+    return merge_sums(sums) / len(data)
+
+
+def parallel_variance(data, executor):
+    """
+    Sample variance of a list computed chunk-wise on ``executor``.
+
+    Parameters
+    ----------
+    data : list or tuple
+        Numerical dataset
+    executor : ParallelExecutor
+        Executor to run the chunks on
+
+    Returns
+    -------
+    float
+        Same value as :func:`datatools.stats.descriptive.variance`
+    """
+    n = len(data)
+    if n < 2:
+        raise ValueError("Need at least 2 values for variance")
+    # Two passes, as the serial variance: the mean, then the deviations
+    values = executor.as_floats(data)
+    center = merge_sums(executor.map_float_chunks(chunk_sum, values)) / n
+    squares = executor.map_float_chunks(chunk_squared_deviations, values,
+                                        center)
+    return merge_sums(squares) / (n - 1)
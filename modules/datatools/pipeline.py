@@ -0,0 +1,247 @@
+"""
+Out-of-core cleaning pipeline: detect -> fill -> remove.
+
+Data flows as an iterable of chunks (lists or NumPy arrays), for example
+a :class:`~datatools.io.CSVColumn`. Cleaning takes two passes:
+
+1. ``fit_cleaning`` streams over the chunks once to count missing values
+   and compute the fill value and the outlier fences of the *filled* data.
+2. ``fill_missing_chunks`` and ``remove_outliers_chunks`` are lazy
+   generator stages that transform the chunks using those statistics.
+
+Only one chunk is in memory at a time, so multi-GB files clean in
+constant memory::
+
+    report = clean_csv('raw.csv', 'clean.csv', column='latency')
+
+The mean fill value and the z-score fences come from per-chunk
+:class:`~datatools.stats.accumulator.RunningStats` merged with Chan's
+formula, so they match an in-memory pass up to rounding. The median fill
+value and the 'iqr'/'mad' fences come from a
+:class:`~datatools.stats.selection.QuantileSketch` and are approximate
+(rank error about ``2/k``); their random compaction is seeded, so the
+same input and ``seed`` always give the same report. The 'mad' method
+needs two extra passes (one for the median, one for the deviations).
+"""
+
+from . import backend
+from .cleaning.outliers import (chunked_outlier_bounds, outlier_fences,
+                                resolve_threshold)
+from .io import DEFAULT_CHUNK_SIZE, read_csv_column, write_csv_column
+from .stats.accumulator import RunningStats
+from .stats.selection import QuantileSketch
+
+FILL_STRATEGIES = ('mean', 'median', 'zero')
+
+
+def _split_missing(chunk):
+    """Return the valid values of a chunk and its number of missing ones."""
+    if backend.is_array(chunk):
+        arr = backend.to_array(chunk)
+        mask = backend.missing_mask(arr)
+        return backend.valid_values(arr), int(mask.sum())
+    valid = [x for x in chunk if x is not None]
+    return valid, len(chunk) - len(valid)
+
+
+def fill_missing_chunks(chunks, fill_value):
+    """
+    Lazily replace missing values in every chunk.
+
+    Parameters
+    ----------
+    chunks : iterable of list or numpy.ndarray
+        Input chunks; ``None`` (or ``NaN``/masked entries) is missing
+    fill_value : float
+        Replacement value
+
+    Yields
+    ------
+    list or numpy.ndarray
+        Chunks with missing values filled
+    """
+    for chunk in chunks:
+        if backend.is_array(chunk):
+            arr = backend.to_array(chunk)
+            mask = backend.missing_mask(arr)
+            values = backend.np.asarray(arr)
+            yield backend.np.where(mask, fill_value, values) if mask.any() else values
+        else:
+            yield [fill_value if x is None else x for x in chunk]
+
+
+def remove_outliers_chunks(chunks, bounds):
+    """
+    Lazily drop values outside ``bounds`` from every chunk.
+
+    Parameters
+    ----------
+    chunks : iterable of list or numpy.ndarray
+        Input chunks without missing values
+    bounds : tuple
+        ``(lower, upper)`` fences, e.g. from ``fit_cleaning`` or
+        :func:`~datatools.cleaning.outliers.outlier_bounds`
+
+    Yields
+    ------
+    list or numpy.ndarray
+        Chunks with outliers removed
+    """
+    lower, upper = bounds
+    for chunk in chunks:
+        if backend.is_array(chunk):
+            yield chunk[~((chunk < lower) | (chunk > upper))]
+        else:
+            yield [x for x in chunk if not (x < lower or x > upper)]
+
+
+class _FilledChunks:
+    """Re-iterable view of ``chunks`` with missing values filled."""
+
+    def __init__(self, chunks, fill_value):
+        self.chunks = chunks
+        self.fill_value = fill_value
+
+    def __iter__(self):
+        return fill_missing_chunks(self.chunks, self.fill_value)
+
+
+def fit_cleaning(chunks, strategy='mean', method='zscore', threshold=None,
+                 k=200, seed=0):
+    """
+    Compute everything the cleaning stages need in one streaming pass.
+
+    Parameters
+    ----------
+    chunks : iterable of list or numpy.ndarray
+        Input chunks. Must be re-iterable if the stages will be run on
+        the same source afterwards (or for ``method='mad'``).
+    strategy : str
+        Fill strategy: 'mean', 'median', or 'zero'
+    method : str or None
+        Outlier method ('zscore', 'iqr' or 'mad'), or None to keep all
+        values
+    threshold : float, optional
+        Threshold for outlier detection (default depends on the method)
+    k : int
+        Sketch size for the approximate quantiles
+    seed : int
+        Seed for the sketches' random compaction
+
+    Returns
+    -------
+    dict
+        Row count, missing-value summary, fill value and outlier fences
+    """
+    if strategy not in FILL_STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    if method is not None:
+        threshold = resolve_threshold(method, threshold)
+
+    acc = RunningStats()
+    needs_sketch = strategy == 'median' or method == 'iqr'
+    sketch = QuantileSketch(k, seed) if needs_sketch else None
+    missing_count = 0
+    for chunk in chunks:
+        valid, missing = _split_missing(chunk)
+        missing_count += missing
+        if backend.is_array(valid):
+            acc.merge(RunningStats.from_array(valid))
+            valid = valid.tolist() if sketch is not None else valid
+        else:
+            acc.update(valid)
+        if sketch is not None:
+            sketch.update(valid)
+
+    total = acc.count + missing_count
+    if strategy == 'mean':
+        fill_value = acc.mean
+    elif strategy == 'median':
+        fill_value = sketch.median()
+    else:
+        fill_value = 0
+
+    bounds = None
+    if method == 'zscore':
+        filled = acc.copy().merge(RunningStats.repeat(fill_value,
+                                                      missing_count))
+        bounds = outlier_fences(method, threshold, filled.mean, filled.std_dev)
+    elif method == 'iqr':
+        for _ in range(missing_count):
+            sketch.push(fill_value)
+        bounds = outlier_fences(method, threshold,
+                                *sketch.quantiles([0.25, 0.75]))
+    elif method == 'mad':
+        bounds = chunked_outlier_bounds(_FilledChunks(chunks, fill_value),
+                                        method, threshold, k, seed)
+
+    return {
+        'count': total,
+        'missing': {
+            'count': missing_count,
+            'percentage': (missing_count / total) * 100 if total else 0
+        },
+        'strategy': strategy,
+        'fill_value': fill_value,
+        'method': method,
+        'threshold': threshold,
+        'bounds': bounds
+    }
+
+
+def clean_chunks(chunks, strategy='mean', method='zscore', threshold=None,
+                 k=200, seed=0):
+    """
+    Fit the cleaning statistics, then return the lazy cleaned stream.
+
+    Parameters
+    ----------
+    chunks : iterable of list or numpy.ndarray
+        Re-iterable source of chunks (it is read twice)
+    strategy, method, threshold, k, seed
+        As for :func:`fit_cleaning`
+
+    Returns
+    -------
+    tuple
+        ``(report, cleaned)`` where ``cleaned`` is a generator of chunks
+    """
+    if iter(chunks) is chunks:
+        raise TypeError("clean_chunks needs a re-iterable source of chunks")
+    report = fit_cleaning(chunks, strategy, method, threshold, k, seed)
+    cleaned = fill_missing_chunks(chunks, report['fill_value'])
+    if report['bounds'] is not None:
+        cleaned = remove_outliers_chunks(cleaned, report['bounds'])
+    return report, cleaned
+
+
+def clean_csv(src, dst, column, strategy='mean', method='zscore',
+              threshold=None, chunk_size=DEFAULT_CHUNK_SIZE, k=200, seed=0):
+    """
+    Clean one CSV column into a new single-column CSV file.
+
+    Parameters
+    ----------
+    src : str or path-like
+        Input CSV file with a header row
+    dst : str or path-like
+        Output CSV file (overwritten)
+    column : str or int
+        Column to clean (name or position)
+    strategy, method, threshold, k, seed
+        As for :func:`fit_cleaning`
+    chunk_size : int
+        Values held in memory at a time
+
+    Returns
+    -------
+    dict
+        Report from :func:`fit_cleaning`, plus 'written' and 'removed'
+    """
+    source = read_csv_column(src, column, chunk_size)
+    report, cleaned = clean_chunks(source, strategy, method, threshold, k,
+                                   seed)
+    header = column if isinstance(column, str) else 'value'
+    report['written'] = write_csv_column(dst, cleaned, header=header)
+    report['removed'] = report['count'] - report['written']
+    return report
@@ -1,5 +1,42 @@
-"""Statistical functions."""
+"""
+Statistical functions.
 
-from .descriptive import mean, median, std_dev, variance
+Names are imported lazily (PEP 562), like the package-level shortcuts
+of :mod:`datatools`, so importing one submodule (e.g. the NumPy-free
+:mod:`.accumulator`) does not load the others or NumPy.
+"""
+
+import importlib
+
+# Public name -> defining submodule
+_LAZY_ATTRS = {
+    'RunningStats': 'accumulator',
+    'mean': 'descriptive',
+    'median': 'descriptive',
+    'std_dev': 'descriptive',
+    'variance': 'descriptive',
+    'QuantileSketch': 'selection',
+    'quantile': 'selection',
+    'quantiles': 'selection',
+    'select_kth': 'selection',
+    'select_ranks': 'selection',
+}
+
+__all__ = [
+    'RunningStats', 'QuantileSketch', 'mean', 'median', 'std_dev',
+    'variance', 'quantile', 'quantiles', 'select_kth', 'select_ranks'
+]
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f'.{_LAZY_ATTRS[name]}', __name__)
+    value = getattr(module, name)
+    globals()[name] = value  # cache: later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
-__all__ = ['mean', 'median', 'std_dev', 'variance']
@@ -0,0 +1,306 @@
+"""
+Streaming accumulator for descriptive statistics.
+
+A ``RunningStats`` object consumes values one at a time and keeps only a
+handful of numbers, so it works on generators and feeds that never fit in
+a list. Partial accumulators built over separate shards can be combined
+with ``merge()``.
+
+Where shards must combine to exactly the serial result (the chunk kernels
+of :mod:`datatools.parallel` and :mod:`data_validators`), ``partial_sums``
+gives each shard's sum as a few floats whose ``math.fsum`` merge is
+correctly rounded, and ``squared_deviations`` yields the terms of the
+two-pass variance. The module imports nothing beyond :mod:`math` and
+:mod:`itertools`, so it stays cheap to import.
+"""
+
+import math
+from itertools import chain
+
+
+def partial_sums(values):
+    """
+    Exact sum of a sequence as a short list of partials, mergeable across shards.
+
+    Each pass is a ``math.fsum`` (in C) over ``values`` and the negated
+    partials found so far, so it returns the correctly rounded remainder
+    of the sum; the loop stops when the remainder is exactly zero, usually
+    after two or three passes. ``math.fsum`` of the partials of several
+    shards is therefore the correctly rounded total of all of them, equal
+    to ``math.fsum`` over the concatenated data.
+
+    Parameters
+    ----------
+    values : iterable
+        Numbers to add; iterators are materialized first, sequences such
+        as ``array('d')`` are read in place
+
+    Returns
+    -------
+    list
+        Floats whose exact sum is the sum of ``values``
+    """
+    if iter(values) is values:
+        values = list(values)
+    partials = []
+    remainder = math.fsum(values)
+    while remainder:
+        partials.append(remainder)
+        if not math.isfinite(remainder):
+            break  # inf and NaN propagate as in a plain sum
+        remainder = math.fsum(chain(values, [-p for p in partials]))
+    return partials
+
+
+def squared_deviations(values, center):
+    """
+    Lazily yield the squared deviation of every value from ``center``.
+
+    The serial two-pass variance and the chunk kernels all square the
+    deviations through this generator, so every path rounds each term
+    identically. Multiplying the deviation by itself is also faster than
+    ``** 2``.
+    """
+    return ((x - center) * (x - center) for x in values)
+
+
+class RunningStats:
+    """
+    One-pass accumulator for count, mean, variance, min and max.
+
+    The sum is kept with Neumaier (improved Kahan) compensation and the
+    sum of squared deviations with Welford's update, so results stay
+    accurate over long streams while memory use is O(1). Welford's update
+    works on deviations from the running mean, so it does not overflow
+    for values whose squares would.
+
+    Parameters
+    ----------
+    data : iterable, optional
+        Values to consume immediately
+
+    Examples
+    --------
+    >>> acc = RunningStats([2, 4, 4, 4, 5, 5, 7, 9])
+    >>> acc.mean
+    5.0
+    >>> acc.count, acc.min, acc.max
+    (8, 2, 9)
+    """
+
+    __slots__ = ('count', 'min', 'max', '_sum', '_comp', '_mean', '_m2')
+
+    def __init__(self, data=None):
+        self.count = 0
+        self.min = None
+        self.max = None
+        self._sum = 0
+        self._comp = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        if data is not None:
+            self.update(data)
+
+    def push(self, value):
+        """
+        Add a single value.
+
+        Parameters
+        ----------
+        value : float
+            Value to add
+        """
+        self.count += 1
+        if self.count == 1:
+            self.min = self.max = value
+        elif value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+
+        # Neumaier-compensated running sum
+        t = self._sum + value
+        if abs(self._sum) >= abs(value):
+            self._comp += (self._sum - t) + value
+        else:
+            self._comp += (value - t) + self._sum
+        self._sum = t
+
+        # Welford update of mean and sum of squared deviations
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+
+    def update(self, data):
+        """
+        Add every value from an iterable.
+
+        Parameters
+        ----------
+        data : iterable
+            Values to add
+
+        Returns
+        -------
+        RunningStats
+            The accumulator itself, to allow chaining
+        """
+        push = self.push
+        for value in data:
+            push(value)
+        return self
+
+    def merge(self, other):
+        """
+        Combine another accumulator into this one.
+
+        Uses Chan et al.'s pairwise formula, so merging accumulators built
+        over disjoint shards gives the same moments as a single pass over
+        the concatenated data (up to floating-point rounding).
+
+        Parameters
+        ----------
+        other : RunningStats
+            Accumulator to fold in
+
+        Returns
+        -------
+        RunningStats
+            The accumulator itself, to allow chaining
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count = other.count
+            self.min, self.max = other.min, other.max
+            self._sum, self._comp = other._sum, other._comp
+            self._mean, self._m2 = other._mean, other._m2
+            return self
+
+        n = self.count + other.count
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / n
+        self._mean += delta * other.count / n
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        t = self._sum + other._sum
+        if abs(self._sum) >= abs(other._sum):
+            self._comp += (self._sum - t) + other._sum
+        else:
+            self._comp += (other._sum - t) + self._sum
+        self._sum = t
+        self._comp += other._comp
+        return self
+
+    @classmethod
+    def from_array(cls, arr):
+        """
+        Build an accumulator from a NumPy array with vectorized reductions.
+
+        Parameters
+        ----------
+        arr : numpy.ndarray
+            Numerical values (flattened)
+
+        Returns
+        -------
+        RunningStats
+            Accumulator equivalent to pushing every element of ``arr``
+        """
+        acc = cls()
+        if arr.size == 0:
+            return acc
+        values = arr.ravel().astype(float, copy=False)
+        acc.count = int(values.size)
+        acc.min = arr.min().item()
+        acc.max = arr.max().item()
+        acc._sum = float(values.sum())
+        acc._mean = acc._sum / acc.count
+        dev = values - acc._mean
+        acc._m2 = float(dev.dot(dev))
+        return acc
+
+    @classmethod
+    def repeat(cls, value, count):
+        """
+        Build an accumulator for ``count`` copies of ``value`` in O(1).
+
+        Parameters
+        ----------
+        value : float
+            The repeated value
+        count : int
+            Number of copies
+
+        Returns
+        -------
+        RunningStats
+            Accumulator equivalent to pushing ``value`` ``count`` times
+        """
+        acc = cls()
+        if count > 0:
+            acc.count = count
+            acc.min = acc.max = value
+            acc._sum = value * count
+            acc._mean = value
+            # Pushing inf or NaN leaves m2 undefined, as here
+            acc._m2 = 0.0 if math.isfinite(value) else math.nan
+        return acc
+
+    def copy(self):
+        """Return an independent copy of the accumulator."""
+        clone = RunningStats()
+        clone.merge(self)
+        return clone
+
+    @property
+    def sum(self):
+        """Compensated sum of all values."""
+        return self._sum + self._comp
+
+    @property
+    def m2(self):
+        """Sum of squared deviations from the mean."""
+        return self._m2
+
+    @property
+    def mean(self):
+        """Arithmetic mean of the values seen so far."""
+        if self.count == 0:
+            raise ValueError("Cannot calculate mean of empty dataset")
+        return self.sum / self.count
+
+    @property
+    def variance(self):
+        """Sample variance (``n - 1`` denominator)."""
+        if self.count < 2:
+            raise ValueError("Need at least 2 values for variance")
+        return self._m2 / (self.count - 1)
+
+    @property
+    def pvariance(self):
+        """Population variance (``n`` denominator)."""
+        if self.count == 0:
+            raise ValueError("Cannot calculate variance of empty dataset")
+        return self._m2 / self.count
+
+    @property
+    def std_dev(self):
+        """Sample standard deviation."""
+        return self.variance**0.5
+
+    @property
+    def pstd_dev(self):
+        """Population standard deviation."""
+        return self.pvariance**0.5
+
+    def __add__(self, other):
+        if not isinstance(other, RunningStats):
+            return NotImplemented
+        return self.copy().merge(other)
+
+    def __repr__(self):
+        return (f"RunningStats(count={self.count}, mean={self._mean!r}, "
+                f"min={self.min!r}, max={self.max!r})")
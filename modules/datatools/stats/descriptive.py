@@ -1,25 +1,79 @@
 """
 Descriptive statistics functions.
+
+For lists and tuples, ``mean`` is ``math.fsum(data) / n`` and
+``variance`` the two-pass ``math.fsum`` of squared deviations from that
+mean, on every backend: ``math.fsum`` runs in C, is faster than
+converting the list to an array, and gives a correctly rounded result
+that a :class:`~datatools.parallel.ParallelExecutor` reproduces exactly
+chunk by chunk. Other iterables, such as generators, are consumed in a
+single pass by :class:`~datatools.stats.accumulator.RunningStats`.
+NumPy arrays use NumPy's own reductions, and columns of a
+:mod:`datatools.columnar` file answer ``mean``, ``variance`` and
+``std_dev`` from their precomputed footer statistics.
+``median`` uses linear-time selection from :mod:`.selection` instead of
+sorting a full copy; NumPy arrays and large lists are dispatched to
+``numpy.median`` (see :mod:`datatools.backend`).
+
+:mod:`datatools.backend` (and with it NumPy), :mod:`datatools.columnar`
+and :mod:`datatools.parallel` are imported on first use, so importing
+this module stays cheap.
 """
 
+import math
+
+from .accumulator import RunningStats, squared_deviations
+from .selection import select_ranks
+
+
+def _as_array(data):
+    """Convert for the NumPy backend, returning the array and its size."""
+    from .. import backend
+    arr = backend.to_array(data, allow_none=False)
+    size = arr.count() if isinstance(arr, backend.np.ma.MaskedArray) else arr.size
+    return arr, size
+
+
+def _native_array(data):
+    """True for arrays (and array-backed inputs) on the NumPy backend."""
+    from .. import backend
+    return ((backend.is_array(data) or hasattr(data, 'to_numpy'))
+            and backend.use_numpy(data))
+
 
-def mean(data):
+def mean(data, executor=None):
     """
     Calculate arithmetic mean.
     
     Parameters
     ----------
-    data : list
+    data : iterable or numpy.ndarray
         Numerical dataset
+    executor : datatools.parallel.ParallelExecutor, optional
+        Split lists and tuples into chunks processed in parallel, with
+        the same result as without it (NumPy arrays ignore it)
     
     Returns
     -------
     float
         Mean value
     """
-    if not data:
-        raise ValueError("Cannot calculate mean of empty dataset")
-    return sum(data) / len(data)
+    if isinstance(data, (list, tuple)):
+        if not data:
+            raise ValueError("Cannot calculate mean of empty dataset")
+        if executor is not None:
+            from .. import parallel
+            return parallel.parallel_mean(data, executor)
+        return math.fsum(data) / len(data)
+    from .. import columnar
+    if isinstance(data, columnar.Column):
+        return data.mean
+    if _native_array(data):
+        arr, size = _as_array(data)
+        if size == 0:
+            raise ValueError("Cannot calculate mean of empty dataset")
+        return float(arr.mean())
+    return RunningStats(data).mean
 
 
 def median(data):
@@ -28,56 +82,87 @@ def median(data):
     
     Parameters
     ----------
-    data : list
+    data : iterable or numpy.ndarray
         Numerical dataset
     
     Returns
     -------
     float
-        Median value
+        Median value (NaN if the data contains NaN)
     """
-    if not data:
+    from .. import backend
+    if backend.use_numpy(data):
+        arr, size = _as_array(data)
+        if size == 0:
+            raise ValueError("Cannot calculate median of empty dataset")
+        if isinstance(arr, backend.np.ma.MaskedArray):
+            return float(backend.np.ma.median(arr))
+        return float(backend.np.median(arr))
+    values = data if isinstance(data, list) else list(data)
+    if not values:
         raise ValueError("Cannot calculate median of empty dataset")
-    sorted_data = sorted(data)
-    n = len(sorted_data)
+    if any(x != x for x in values):
+        return math.nan  # as numpy.median; selection would return any value
+    n = len(values)
     mid = n // 2
     if n % 2 == 0:
-        return (sorted_data[mid - 1] + sorted_data[mid]) / 2
-    return sorted_data[mid]
+        found = select_ranks(values, [mid - 1, mid])
+        return (found[mid - 1] + found[mid]) / 2
+    return select_ranks(values, [mid])[mid]
 
 
-def variance(data):
+def variance(data, executor=None):
     """
     Calculate sample variance.
     
     Parameters
     ----------
-    data : list
+    data : iterable or numpy.ndarray
         Numerical dataset
+    executor : datatools.parallel.ParallelExecutor, optional
+        Split lists and tuples into chunks processed in parallel, with
+        the same result as without it (NumPy arrays ignore it)
     
     Returns
     -------
     float
         Sample variance
     """
-    if len(data) < 2:
-        raise ValueError("Need at least 2 values for variance")
-    m = mean(data)
-    return sum((x - m)**2 for x in data) / (len(data) - 1)
+    if isinstance(data, (list, tuple)):
+        if len(data) < 2:
+            raise ValueError("Need at least 2 values for variance")
+        if executor is not None:
+            from .. import parallel
+            return parallel.parallel_variance(data, executor)
+        center = math.fsum(data) / len(data)
+        return (math.fsum(squared_deviations(data, center))
+                / (len(data) - 1))
+    from .. import columnar
+    if isinstance(data, columnar.Column):
+        return data.variance
+    if _native_array(data):
+        arr, size = _as_array(data)
+        if size < 2:
+            raise ValueError("Need at least 2 values for variance")
+        return float(arr.var(ddof=1))
+    return RunningStats(data).variance
 
 
-def std_dev(data):
+def std_dev(data, executor=None):
     """
     Calculate sample standard deviation.
     
     Parameters
     ----------
-    data : list
+    data : iterable or numpy.ndarray
         Numerical dataset
+    executor : datatools.parallel.ParallelExecutor, optional
+        Split lists and tuples into chunks processed in parallel, with
+        the same result as without it (NumPy arrays ignore it)
     
     Returns
     -------
     float
         Standard deviation
     """
-    return variance(data)**0.5
+    return variance(data, executor)**0.5
@@ -0,0 +1,389 @@
+"""
+Quantile functions based on selection instead of sorting.
+
+Exact quantiles use an introselect-style quickselect: expected O(n) time,
+with a fallback to sorting the remaining slice if partitioning degenerates,
+so the worst case stays O(n log n). Several ranks are selected together in
+one recursive partitioning (``select_ranks``), so
+``quantiles(data, [0.25, 0.5, 0.75])`` does not cost three separate passes.
+
+For streams that do not fit in memory, ``QuantileSketch`` keeps a
+bounded-size KLL-style summary and answers approximate quantiles.
+NumPy arrays and large lists go through ``numpy.partition``/``quantile``
+(see :mod:`datatools.backend`, imported on first use).
+"""
+
+import math
+import random
+
+
+def _pick_pivot(values):
+    """Median of three sampled elements."""
+    n = len(values)
+    a, b, c = values[0], values[n // 2], values[-1]
+    if a < b:
+        if b < c:
+            return b
+        return c if a < c else a
+    if a < c:
+        return a
+    return c if b < c else b
+
+
+def select_ranks(values, ranks):
+    """
+    Find the values at several 0-based ranks of an unsorted list.
+
+    All ranks are selected in one recursive partitioning, which is what
+    ``median``, ``quantiles`` and ``select_kth`` build on.
+
+    Parameters
+    ----------
+    values : list
+        Data to select from (not modified)
+    ranks : iterable of int
+        Ranks to select, each in ``range(len(values))``
+
+    Returns
+    -------
+    dict
+        Mapping from rank to value
+    """
+    ranks = sorted(set(ranks))
+    found = {}
+    if not ranks:
+        return found
+    if ranks[0] < 0 or ranks[-1] >= len(values):
+        bad = ranks[0] if ranks[0] < 0 else ranks[-1]
+        raise IndexError(f"Rank {bad} out of range for {len(values)} values")
+    depth_limit = 2 * max(1, len(values)).bit_length()
+    # Work items: (slice of data, ranks wanted in it, offset of the slice, depth)
+    stack = [(values, ranks, 0, 0)]
+    while stack:
+        chunk, wanted, offset, depth = stack.pop()
+        if len(chunk) <= 16 or depth > depth_limit:
+            ordered = sorted(chunk)
+            for k in wanted:
+                found[k] = ordered[k - offset]
+            continue
+
+        pivot = _pick_pivot(chunk)
+        lows = [x for x in chunk if x < pivot]
+        highs = [x for x in chunk if x > pivot]
+        n_low = len(lows)
+        n_eq = len(chunk) - n_low - len(highs)
+
+        low_ranks, high_ranks = [], []
+        for k in wanted:
+            local = k - offset
+            if local < n_low:
+                low_ranks.append(k)
+            elif local < n_low + n_eq:
+                found[k] = pivot
+            else:
+                high_ranks.append(k)
+        if low_ranks:
+            stack.append((lows, low_ranks, offset, depth + 1))
+        if high_ranks:
+            stack.append((highs, high_ranks, offset + n_low + n_eq, depth + 1))
+    return found
+
+
+def _check_q(q):
+    if not 0 <= q <= 1:
+        raise ValueError(f"Quantile must be between 0 and 1, got {q}")
+
+
+def _rank_positions(n, q):
+    """Return (lower rank, upper rank, fraction) for linear interpolation."""
+    h = (n - 1) * q
+    lo = math.floor(h)
+    hi = min(lo + 1, n - 1)
+    return lo, hi, h - lo
+
+
+def _interpolate(lower, upper, frac):
+    if frac == 0:
+        return lower
+    return lower + (upper - lower) * frac
+
+
+def select_kth(data, k):
+    """
+    Return the k-th smallest value (0-based) in expected linear time.
+
+    Parameters
+    ----------
+    data : iterable
+        Numerical dataset
+    k : int
+        Rank to select; negative values count from the end
+
+    Returns
+    -------
+    float
+        Value that would be at position ``k`` after sorting
+    """
+    from .. import backend
+    if backend.use_numpy(data):
+        arr = backend.to_array(data, allow_none=False)
+        n = arr.size
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError(f"Rank {k} out of range for {n} values")
+        return backend.np.partition(arr, k)[k].item()
+    values = data if isinstance(data, list) else list(data)
+    n = len(values)
+    if k < 0:
+        k += n
+    if not 0 <= k < n:
+        raise IndexError(f"Rank {k} out of range for {n} values")
+    return select_ranks(values, [k])[k]
+
+
+def quantiles(data, qs):
+    """
+    Calculate several quantiles with a single selection pass.
+
+    Uses linear interpolation between the two closest ranks (the same
+    definition as NumPy's default ``'linear'`` method).
+
+    Parameters
+    ----------
+    data : iterable
+        Numerical dataset
+    qs : iterable of float
+        Quantiles to compute, each between 0 and 1
+
+    Returns
+    -------
+    list
+        Quantile values in the same order as ``qs``
+    """
+    from .. import backend
+    if backend.use_numpy(data):
+        arr = backend.valid_values(
+            backend.to_array(data, allow_none=False))
+        if arr.size == 0:
+            raise ValueError("Cannot calculate quantiles of empty dataset")
+        qs = list(qs)
+        for q in qs:
+            _check_q(q)
+        return backend.np.quantile(arr, qs).tolist()
+    values = data if isinstance(data, list) else list(data)
+    if not values:
+        raise ValueError("Cannot calculate quantiles of empty dataset")
+    qs = list(qs)
+    positions = []
+    for q in qs:
+        _check_q(q)
+        positions.append(_rank_positions(len(values), q))
+
+    needed = set()
+    for lo, hi, frac in positions:
+        needed.add(lo)
+        if frac:
+            needed.add(hi)
+    found = select_ranks(values, needed)
+    return [
+        _interpolate(found[lo], found.get(hi), frac)
+        for lo, hi, frac in positions
+    ]
+
+
+def quantile(data, q):
+    """
+    Calculate a single quantile.
+
+    Parameters
+    ----------
+    data : iterable
+        Numerical dataset
+    q : float
+        Quantile to compute, between 0 and 1
+
+    Returns
+    -------
+    float
+        Quantile value
+    """
+    return quantiles(data, [q])[0]
+
+
+class QuantileSketch:
+    """
+    Bounded-memory approximate quantile summary (KLL-style).
+
+    Values are kept in a hierarchy of compactors; when a level overflows
+    it is sorted and every other element (starting at a random offset) is
+    promoted to the next level with double weight. Level capacities shrink
+    geometrically towards the bottom, so about ``3 * k`` items are retained
+    however long the stream is.
+
+    Error bound: the rank of the value returned by ``quantile(q)`` differs
+    from ``q * n`` by at most about ``2 / k * n`` with high probability,
+    i.e. roughly 1% of ``n`` for the default ``k=200``; doubling ``k``
+    halves the error. Merged sketches keep the same bound. ``min`` and
+    ``max`` are tracked exactly.
+
+    Parameters
+    ----------
+    k : int
+        Accuracy parameter; larger is more accurate and uses more memory
+    seed : int, optional
+        Seed for the compaction coin flips, for reproducible results
+    """
+
+    _DECAY = 2 / 3
+
+    def __init__(self, k=200, seed=None):
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.count = 0
+        self.min = None
+        self.max = None
+        self._levels = [[]]
+        self._size = 0
+        self._rng = random.Random(seed)
+        self._update_max_size()
+
+    def _capacity(self, level):
+        height = len(self._levels)
+        return max(2, int(self.k * self._DECAY**(height - level - 1)) + 1)
+
+    def push(self, value):
+        """Add a single value to the sketch."""
+        if self.count == 0:
+            self.min = self.max = value
+        elif value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+        self.count += 1
+        self._levels[0].append(value)
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def update(self, data):
+        """Add every value from an iterable; returns the sketch."""
+        push = self.push
+        for value in data:
+            push(value)
+        return self
+
+    def _update_max_size(self):
+        self._max_size = sum(
+            self._capacity(level) for level in range(len(self._levels)))
+
+    def _compress(self):
+        # Like KLL, levels may overflow individually as long as the sketch
+        # as a whole is within budget; compact the lowest full level only.
+        while self._size >= self._max_size:
+            for level, items in enumerate(self._levels):
+                if len(items) >= self._capacity(level):
+                    break
+            else:
+                return
+            if level + 1 == len(self._levels):
+                self._levels.append([])
+                self._update_max_size()
+            items.sort()
+            # Keep one item back when the count is odd so nothing is lost
+            leftover = [items.pop()] if len(items) % 2 else []
+            start = self._rng.randrange(2)
+            promoted = items[start::2]
+            self._levels[level + 1].extend(promoted)
+            self._levels[level] = leftover
+            self._size -= len(items) - len(promoted)
+
+    def merge(self, other):
+        """
+        Combine another sketch into this one.
+
+        Parameters
+        ----------
+        other : QuantileSketch
+            Sketch built over a different shard of the data
+
+        Returns
+        -------
+        QuantileSketch
+            The sketch itself, to allow chaining
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.min, self.max = other.min, other.max
+        else:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        self.count += other.count
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        self._update_max_size()
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+        self._size += other._size
+        self._compress()
+        return self
+
+    def _weighted_items(self):
+        pairs = []
+        for level, items in enumerate(self._levels):
+            weight = 1 << level
+            pairs.extend((x, weight) for x in items)
+        pairs.sort(key=lambda pair: pair[0])
+        return pairs
+
+    def quantiles(self, qs):
+        """
+        Approximate several quantiles.
+
+        Parameters
+        ----------
+        qs : iterable of float
+            Quantiles to compute, each between 0 and 1
+
+        Returns
+        -------
+        list
+            Approximate quantile values in the same order as ``qs``
+        """
+        if self.count == 0:
+            raise ValueError("Cannot calculate quantiles of empty sketch")
+        pairs = self._weighted_items()
+        total = sum(weight for _, weight in pairs)
+        results = []
+        for q in qs:
+            _check_q(q)
+            if q == 0:
+                results.append(self.min)
+                continue
+            if q == 1:
+                results.append(self.max)
+                continue
+            target = q * total
+            cumulative = 0
+            value = pairs[-1][0]
+            for x, weight in pairs:
+                cumulative += weight
+                if cumulative >= target:
+                    value = x
+                    break
+            results.append(value)
+        return results
+
+    def quantile(self, q):
+        """Approximate a single quantile."""
+        return self.quantiles([q])[0]
+
+    def median(self):
+        """Approximate median."""
+        return self.quantile(0.5)
+
+    def __len__(self):
+        """Number of items currently retained (not the stream length)."""
+        return self._size
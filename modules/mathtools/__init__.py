@@ -3,17 +3,48 @@ Mathematical tools package.
 
 A simple package demonstrating Python package structure.
 Provides basic and advanced mathematical operations.
-"""
 
-# Import functions to package level
-from .basic import add, subtract
-from .advanced import power, factorial
+Submodules are imported lazily (PEP 562): ``import mathtools`` only runs
+this file, and ``mathtools.factorial`` loads ``mathtools.advanced`` the
+first time it is accessed. Element-wise versions of the operations live
+in ``mathtools.vectorized``.
+"""
 
-# Define what's available with 'from mathtools import *'
-__all__ = ['add', 'subtract', 'power', 'factorial']
+import importlib
 
 # Package metadata
 __version__ = '1.0.0'
 __author__ = 'CSPy Learning'
 
-print("Initializing mathtools package")
+# Public name -> submodule that defines it
+_LAZY_ATTRS = {
+    'add': 'basic',
+    'subtract': 'basic',
+    'power': 'advanced',
+    'factorial': 'advanced',
+    'perm': 'advanced',
+    'comb': 'advanced',
+    'factorial_mod': 'advanced',
+}
+_SUBMODULES = ('basic', 'advanced', 'vectorized')
+
+# Define what's available with 'from mathtools import *'
+__all__ = [
+    'add', 'subtract', 'power', 'factorial', 'perm', 'comb', 'factorial_mod'
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(f'.{_LAZY_ATTRS[name]}', __name__)
+        value = getattr(module, name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # cache: later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS) | set(_SUBMODULES))
@@ -1,27 +1,223 @@
 """
 Advanced mathematical operations.
+
+The factorial family (``factorial``, ``perm``, ``comb``,
+``factorial_mod``) shares one engine: small results come from a
+precomputed table, and large products are split in halves recursively so
+the big-integer multiplications stay balanced. That keeps the recursion
+depth at O(log n) and computes 100000! in a fraction of a second.
 """
 
+import math
+import operator
+
+# Results up to 20! fit in 64 bits; the table is tiny and built once.
+SMALL_LIMIT = 20
+_table = [1]
+for _i in range(1, SMALL_LIMIT + 1):
+    _table.append(_table[-1] * _i)
+SMALL_FACTORIALS = tuple(_table)  # SMALL_FACTORIALS[n] == n!
+del _i, _table
+
+# Below this many factors, a plain loop beats further splitting.
+_SPLIT_THRESHOLD = 16
+
+# Above this k, comb() builds the result from its prime factorization
+# rather than dividing two huge products.
+_COMB_PRIME_THRESHOLD = 64
+
 
 def power(base, exponent):
     """Calculate base raised to the power of exponent."""
     return base**exponent
 
 
+def _check_natural(n, name='n'):
+    """Return ``n`` as an int, rejecting non-integers and negatives."""
+    n = operator.index(n)
+    if n < 0:
+        raise ValueError(f"{name} must be a non-negative integer")
+    return n
+
+
+def _range_product(lo, hi, step=1):
+    """Product of ``range(lo, hi, step)`` by binary splitting."""
+    count = (hi - lo + step - 1) // step
+    if count <= _SPLIT_THRESHOLD:
+        result = 1
+        for i in range(lo, hi, step):
+            result *= i
+        return result
+    mid = lo + (count // 2) * step
+    return _range_product(lo, mid, step) * _range_product(mid, hi, step)
+
+
+def _product(values):
+    """Product of a list of ints by binary splitting."""
+    if len(values) <= _SPLIT_THRESHOLD:
+        result = 1
+        for value in values:
+            result *= value
+        return result
+    mid = len(values) // 2
+    return _product(values[:mid]) * _product(values[mid:])
+
+
+def _primes(n):
+    """Primes up to and including n (sieve of Eratosthenes)."""
+    sieve = bytearray([1]) * (n + 1)
+    sieve[:2] = b'\x00\x00'[:n + 1]
+    for i in range(2, math.isqrt(n) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, n + 1, i)))
+    return [i for i, flag in enumerate(sieve) if flag]
+
+
+def _factorial_odd_part(n):
+    """
+    Odd part of n!, i.e. n! with every factor of two removed.
+
+    Walks the levels ``n >> i`` from the top: the odd numbers in
+    ``(n >> (i + 1), n >> i]`` appear in n! once per level below them, so
+    each level's product is multiplied into a running ``inner`` product,
+    which is multiplied into the result once per level.
+    """
+    inner = outer = 1
+    upper = 3
+    for i in range(n.bit_length() - 2, -1, -1):
+        lower = upper
+        upper = ((n >> i) + 1) | 1
+        inner *= _range_product(lower, upper, 2)
+        outer *= inner
+    return outer
+
+
 def factorial(n):
     """
     Calculate factorial of n.
-    
+
+    Values up to 20! come from a precomputed table. Larger ones multiply
+    the odd factors by binary splitting and add the factors of two with a
+    single shift, so there is no deep recursion and the big-integer
+    products stay balanced.
+
     Parameters
     ----------
     n : int
         Non-negative integer
-    
+
     Returns
     -------
     int
         Factorial of n
+
+    Raises
+    ------
+    ValueError
+        If n is negative
+    """
+    n = _check_natural(n)
+    if n <= SMALL_LIMIT:
+        return SMALL_FACTORIALS[n]
+    # n! holds n - popcount(n) factors of two (Legendre's formula)
+    return _factorial_odd_part(n) << (n - bin(n).count('1'))
+
+
+def perm(n, k=None):
+    """
+    Number of ordered arrangements of k items chosen from n.
+
+    Parameters
+    ----------
+    n : int
+        Number of items
+    k : int, optional
+        Number chosen (default: n, giving n!)
+
+    Returns
+    -------
+    int
+        n! / (n - k)!, or 0 when k > n
+    """
+    n = _check_natural(n)
+    if k is None:
+        return factorial(n)
+    k = _check_natural(k, 'k')
+    if k > n:
+        return 0
+    return _range_product(n - k + 1, n + 1)
+
+
+def comb(n, k):
+    """
+    Number of ways to choose k items from n without order.
+
+    For large k the result is assembled from its prime factorization
+    (the exponent of each prime p is the number of carries when adding k
+    and n - k in base p, counted with Legendre's formula), which avoids
+    dividing one huge product by another.
+
+    Parameters
+    ----------
+    n : int
+        Number of items
+    k : int
+        Number chosen
+
+    Returns
+    -------
+    int
+        n! / (k! (n - k)!), or 0 when k > n
+    """
+    n = _check_natural(n)
+    k = _check_natural(k, 'k')
+    if k > n:
+        return 0
+    k = min(k, n - k)
+    if k <= _COMB_PRIME_THRESHOLD:
+        return _range_product(n - k + 1, n + 1) // factorial(k)
+    rest = n - k
+    factors = []
+    for p in _primes(n):
+        exponent = 0
+        q = p
+        while q <= n:
+            exponent += n // q - k // q - rest // q
+            q *= p
+        if exponent:
+            factors.append(p if exponent == 1 else p**exponent)
+    return _product(factors)
+
+
+def factorial_mod(n, p):
+    """
+    Calculate n! modulo p without building the full factorial.
+
+    Every intermediate product is reduced, so memory and time stay small
+    even when n! itself would have millions of digits.
+
+    Parameters
+    ----------
+    n : int
+        Non-negative integer
+    p : int
+        Positive modulus
+
+    Returns
+    -------
+    int
+        n! % p
     """
-    if n <= 1:
-        return 1
-    return n * factorial(n - 1)
+    n = _check_natural(n)
+    p = operator.index(p)
+    if p < 1:
+        raise ValueError("p must be a positive integer")
+    if n >= p:
+        # p is one of the factors of n!
+        return 0
+    if n <= SMALL_LIMIT:
+        return SMALL_FACTORIALS[n] % p
+    result = SMALL_FACTORIALS[SMALL_LIMIT] % p
+    for i in range(SMALL_LIMIT + 1, n + 1):
+        result = result * i % p
+    return result
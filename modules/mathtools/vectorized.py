@@ -0,0 +1,301 @@
+"""
+Element-wise versions of the mathtools operations.
+
+``add``, ``subtract``, ``power`` and ``factorial`` here take scalars,
+NumPy arrays, ``array.array`` objects or any iterable, broadcast their
+arguments against each other and can write into a preallocated ``out``
+buffer, so a whole column is processed in one call instead of one Python
+call per element::
+
+    from mathtools import vectorized as vec
+    vec.add([1, 2, 3], 10)                 # [11, 12, 13]
+    vec.power(array('q', [2, 3]), 10, mod=1000)
+    vec.factorial(np.arange(10))           # int64 array
+
+When any argument (or ``out``) is a NumPy array the operation runs as a
+NumPy ufunc with NumPy's broadcasting rules. Otherwise inputs are treated
+as one-dimensional sequences: scalars and length-1 sequences broadcast
+to the common length. The result is a list, or an ``array.array`` when
+the first sequence argument is one (widened to ``'q'`` or ``'d'`` if the
+results do not fit its typecode).
+"""
+
+import operator
+from array import array
+from itertools import repeat
+
+from . import advanced
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# Largest modulus for which (mod - 1)**2 fits in int64, so the vectorized
+# square-and-multiply never overflows.
+_MODPOW_LIMIT = 3_037_000_499
+
+
+def _is_array(x):
+    return np is not None and isinstance(x, np.ndarray)
+
+
+def _is_scalar(x):
+    return isinstance(x, (str, bytes)) or not hasattr(x, '__iter__')
+
+
+def _broadcast(operands, out=None):
+    """
+    Line up 1-D operands for an element-wise loop.
+
+    Returns
+    -------
+    tuple
+        ``(iterables, like)``; ``iterables`` is None when every operand is
+        a scalar and there is no ``out``; ``like`` is the first sequence
+        operand, used to pick the result container
+    """
+    sequences = []
+    like = None
+    for x in operands:
+        if _is_scalar(x):
+            sequences.append(x)
+            continue
+        if not isinstance(x, (list, tuple, array)):
+            x = list(x)
+        if like is None:
+            like = x
+        sequences.append(x)
+
+    lengths = {len(x) for x in sequences if not _is_scalar(x)}
+    if out is not None:
+        if lengths - {1, len(out)}:
+            raise ValueError(f"operands with lengths {sorted(lengths)} "
+                             f"cannot be written to out of length "
+                             f"{len(out)}")
+        n = len(out)
+    elif not lengths:
+        return None, None
+    else:
+        n = max(lengths)
+        if lengths - {1, n}:
+            raise ValueError("operands could not be broadcast together "
+                             f"with lengths {sorted(lengths)}")
+
+    iterables = []
+    for x in sequences:
+        if _is_scalar(x):
+            iterables.append(repeat(x, n))
+        elif len(x) == 1 and n != 1:
+            iterables.append(repeat(x[0], n))
+        else:
+            iterables.append(x)
+    return iterables, like
+
+
+def _store(values, out):
+    """Copy computed values into the caller's ``out`` buffer."""
+    if isinstance(out, array):
+        out[:] = array(out.typecode, values)
+    elif _is_array(out):
+        out[...] = values
+    else:
+        out[:] = values
+    return out
+
+
+def _pack(values, like):
+    """Return ``values`` in a container matching the input ``like``."""
+    if not isinstance(like, array):
+        return values
+    typecodes = [like.typecode, 'q']
+    if any(isinstance(v, float) for v in values):
+        typecodes.append('d')
+    for typecode in typecodes:
+        try:
+            return array(typecode, values)
+        except (TypeError, OverflowError):
+            continue
+    return values
+
+
+def _apply(func, operands, out):
+    """Pure-Python element-wise loop shared by every operation."""
+    iterables, like = _broadcast(operands, out)
+    if iterables is None:
+        return func(*operands)
+    values = list(map(func, *iterables))
+    if out is not None:
+        return _store(values, out)
+    return _pack(values, like)
+
+
+def _uses_numpy(*args):
+    return any(_is_array(x) for x in args)
+
+
+def _numpy_result(result, out):
+    """Finish a NumPy computation, honouring a non-NumPy ``out``."""
+    if out is None:
+        return result
+    if _is_array(out):
+        out[...] = result
+        return out
+    return _store(np.ravel(result).tolist(), out)
+
+
+def add(a, b, out=None):
+    """
+    Add two numbers or sequences element-wise.
+
+    Parameters
+    ----------
+    a, b : number, numpy.ndarray, array.array or iterable
+        Operands, broadcast against each other
+    out : list, numpy.ndarray or array.array, optional
+        Buffer to write the result into
+
+    Returns
+    -------
+    number, list, array.array or numpy.ndarray
+        Element-wise sum (``out`` itself when given)
+    """
+    if _uses_numpy(a, b, out):
+        if out is None or _is_array(out):
+            return np.add(a, b, out=out)
+        return _numpy_result(np.add(a, b), out)
+    return _apply(operator.add, (a, b), out)
+
+
+def subtract(a, b, out=None):
+    """
+    Subtract b from a element-wise.
+
+    Parameters
+    ----------
+    a, b : number, numpy.ndarray, array.array or iterable
+        Operands, broadcast against each other
+    out : list, numpy.ndarray or array.array, optional
+        Buffer to write the result into
+
+    Returns
+    -------
+    number, list, array.array or numpy.ndarray
+        Element-wise difference (``out`` itself when given)
+    """
+    if _uses_numpy(a, b, out):
+        if out is None or _is_array(out):
+            return np.subtract(a, b, out=out)
+        return _numpy_result(np.subtract(a, b), out)
+    return _apply(operator.sub, (a, b), out)
+
+
+def _numpy_modpow(base, exponent, mod):
+    """
+    Element-wise ``pow(base, exponent, mod)`` on integer arrays.
+
+    Uses square-and-multiply over whole arrays (one step per exponent
+    bit) while every intermediate product fits in int64, and falls back
+    to Python's ``pow`` per element otherwise.
+    """
+    base, exponent, mod = (np.asarray(x) for x in (base, exponent, mod))
+    if any(x.dtype.kind not in 'iub' for x in (base, exponent, mod)):
+        raise TypeError("power() with mod requires integer operands")
+    if (mod <= 0).any():
+        raise ValueError("mod must be positive")
+    if (exponent >= 0).all() and mod.max(initial=1) <= _MODPOW_LIMIT:
+        base, exponent, mod = np.broadcast_arrays(
+            base.astype(np.int64), exponent.astype(np.int64),
+            mod.astype(np.int64))
+        base = base % mod
+        exponent = exponent.copy()
+        result = np.ones(base.shape, dtype=np.int64) % mod
+        while exponent.any():
+            odd = (exponent & 1).astype(bool)
+            result = np.where(odd, result * base % mod, result)
+            exponent >>= 1
+            base = base * base % mod
+        return result
+    result = np.frompyfunc(pow, 3, 1)(base.astype(object),
+                                      exponent.astype(object),
+                                      mod.astype(object))
+    return result.astype(np.uint64 if mod.dtype.kind == 'u' else np.int64)
+
+
+def power(base, exponent, mod=None, out=None):
+    """
+    Raise base to the power of exponent element-wise.
+
+    Parameters
+    ----------
+    base, exponent : number, numpy.ndarray, array.array or iterable
+        Operands, broadcast against each other
+    mod : int or sequence of int, optional
+        Modulus for modular exponentiation, like ``pow(b, e, mod)``.
+        Integer NumPy inputs then use a vectorized square-and-multiply.
+    out : list, numpy.ndarray or array.array, optional
+        Buffer to write the result into
+
+    Returns
+    -------
+    number, list, array.array or numpy.ndarray
+        Element-wise power (``out`` itself when given). As in NumPy,
+        integer arrays cannot be raised to negative integer powers.
+    """
+    if _uses_numpy(base, exponent, mod, out):
+        if mod is not None:
+            return _numpy_result(_numpy_modpow(base, exponent, mod), out)
+        if out is None or _is_array(out):
+            return np.power(base, exponent, out=out)
+        return _numpy_result(np.power(base, exponent), out)
+    if mod is None:
+        return _apply(pow, (base, exponent), out)
+    return _apply(pow, (base, exponent, mod), out)
+
+
+def factorial(n, out=None):
+    """
+    Factorial of every element of n.
+
+    Each distinct value is computed once. On the NumPy path, arrays whose
+    values are all at most 20 are answered from a lookup table as int64;
+    larger values give an object array of Python ints.
+
+    Parameters
+    ----------
+    n : int, numpy.ndarray, array.array or iterable
+        Non-negative integers
+    out : list, numpy.ndarray or array.array, optional
+        Buffer to write the result into
+
+    Returns
+    -------
+    int, list, array.array or numpy.ndarray
+        Element-wise factorials (``out`` itself when given)
+    """
+    if _uses_numpy(n, out):
+        n = np.asarray(n)
+        if n.dtype.kind not in 'iub':
+            raise TypeError("factorial() requires integer values")
+        if n.dtype.kind == 'b':
+            # As with math.factorial(True); a bool array would index as a mask
+            n = n.astype(np.intp)
+        if n.size and n.min() < 0:
+            raise ValueError("n must be a non-negative integer")
+        if n.size == 0 or n.max() <= advanced.SMALL_LIMIT:
+            table = np.array(advanced.SMALL_FACTORIALS, dtype=np.int64)
+            result = table[n]
+        else:
+            distinct, inverse = np.unique(n, return_inverse=True)
+            values = [advanced.factorial(v) for v in distinct.tolist()]
+            result = np.array(values, dtype=object)[inverse].reshape(n.shape)
+        return _numpy_result(result, out)
+
+    cache = {}
+
+    def cached_factorial(value):
+        if value not in cache:
+            cache[value] = advanced.factorial(value)
+        return cache[value]
+
+    return _apply(cached_factorial, (n,), out)
@@ -0,0 +1,57 @@
+"""
+Test suite for the factorial family in mathtools.advanced, checked
+against the standard library.
+"""
+
+import math
+
+import pytest
+
+from mathtools import advanced
+
+# Covers the lookup table, plain loops, binary splitting and, for comb,
+# the prime-factorization path (k above 64)
+SIZES = [0, 1, 2, 19, 20, 21, 63, 64, 65, 200, 1000, 3001]
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_factorial_matches_math(n):
+    """Test factorial(n) equals math.factorial(n)."""
+    assert advanced.factorial(n) == math.factorial(n)
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_comb_and_perm_match_math(n):
+    """Test comb and perm for k across the whole range, and k > n."""
+    for k in sorted({0, 1, n // 3, n // 2, n - 1, n, n + 1} - {-1}):
+        assert advanced.comb(n, k) == math.comb(n, k)
+        assert advanced.perm(n, k) == math.perm(n, k)
+    assert advanced.perm(n) == math.perm(n)
+
+
+def test_factorial_mod_matches_math():
+    """Test factorial_mod against the reduced full factorial."""
+    for n, p in [(0, 7), (20, 1000), (100, 10**9 + 7), (50, 13), (30, 1)]:
+        assert advanced.factorial_mod(n, p) == math.factorial(n) % p
+
+
+@pytest.mark.parametrize('call', [
+    lambda: advanced.factorial(-1),
+    lambda: advanced.perm(-1, 2),
+    lambda: advanced.perm(5, -2),
+    lambda: advanced.comb(-3, 1),
+    lambda: advanced.comb(3, -1),
+    lambda: advanced.factorial_mod(-1, 5),
+])
+def test_negative_arguments_raise_value_error(call):
+    """Test negative n or k raise ValueError, as in the math module."""
+    with pytest.raises(ValueError):
+        call()
+
+
+def test_non_integers_raise_type_error():
+    """Test floats are rejected instead of truncated."""
+    with pytest.raises(TypeError):
+        advanced.factorial(5.0)
+    with pytest.raises(TypeError):
+        advanced.comb(5, 2.0)
@@ -0,0 +1,65 @@
+"""
+Test suite for backend dispatch: results must not depend on whether a
+call took the pure-Python or the NumPy path.
+"""
+
+import pytest
+
+from datatools import backend
+from datatools.cleaning.missing import detect_missing, fill_missing
+from datatools.cleaning.outliers import (detect_outliers, find_outliers,
+                                         outlier_bounds, remove_outliers)
+from datatools.stats import mean, median, variance
+
+
+@pytest.mark.parametrize('size', [10, backend.AUTO_THRESHOLD + 10])
+def test_none_rejected_on_both_paths(size):
+    """Test None raises TypeError for small and large lists alike."""
+    data = [1.0] * size + [None]
+    for func in (mean, median, variance):
+        with pytest.raises(TypeError):
+            func(data)
+
+
+@pytest.mark.parametrize('size', [10, backend.AUTO_THRESHOLD + 10])
+@pytest.mark.parametrize('method', ['zscore', 'iqr', 'mad'])
+def test_outliers_reject_none_on_both_paths(size, method):
+    """Test None raises TypeError in the outlier functions at any size."""
+    data = [float(i % 7) for i in range(size)] + [None]
+    for func in (detect_outliers, find_outliers, outlier_bounds,
+                 remove_outliers):
+        with pytest.raises(TypeError):
+            func(data, method)
+    with pytest.raises(TypeError):
+        remove_outliers(data, method, inplace=True)
+
+
+def test_to_array_maps_none_to_nan_by_default():
+    """Test cleaning functions still see None as a missing value."""
+    pytest.importorskip('numpy')
+    arr = backend.to_array([1.0, None, 3.0])
+    assert backend.missing_mask(arr).tolist() == [False, True, False]
+    with pytest.raises(TypeError):
+        backend.to_array([1.0, None], allow_none=False)
+
+
+@pytest.mark.parametrize('size', [10, backend.AUTO_THRESHOLD + 10])
+def test_missing_values_same_on_both_backends(size):
+    """Test only None is missing in a list, and ints stay ints, anywhere."""
+    pytest.importorskip('numpy')
+    nan = float('nan')
+    data = [1, None, 2.5, nan, 4] * (size // 5)
+    results = {}
+    for name in ('python', 'numpy', 'auto'):
+        with backend.use_backend(name):
+            detected = detect_missing(data)
+            filled = {strategy: fill_missing(data, strategy)
+                      for strategy in ('mean', 'median', 'zero')}
+        results[name] = (detected, {k: [repr(x) for x in v]
+                                    for k, v in filled.items()})
+
+    assert results['python'] == results['numpy'] == results['auto']
+    detected, filled = results['python']
+    assert detected['count'] == size // 5
+    assert detected['indices'] == list(range(1, size, 5))
+    assert filled['zero'][:5] == ['1', '0', '2.5', 'nan', '4']
@@ -0,0 +1,30 @@
+"""
+Test suite for the columnar file format.
+"""
+
+import pytest
+
+from datatools.columnar import open_columnar, write_columnar
+
+
+def test_round_trip_with_missing_values(tmp_path):
+    """Test values, missing entries and footer statistics survive."""
+    path = tmp_path / 'data.col'
+    write_columnar(path, {'x': [1.0, None, 3.0], 'n': [1, 2, 3]},
+                   typecodes={'n': 'q'})
+    with open_columnar(path) as f:
+        assert f.columns == ['x', 'n']
+        assert list(f['x']) == [1.0, None, 3.0]
+        assert list(f['n']) == [1, 2, 3]
+        assert f['x'].missing_count == 1
+        assert f['x'].mean == 2.0
+
+
+@pytest.mark.parametrize('content', [b'', b'not columnar',
+                                     b'x' * 100])
+def test_non_columnar_file_raises_value_error(tmp_path, content):
+    """Test opening something else raises ValueError, not AttributeError."""
+    path = tmp_path / 'other.bin'
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        open_columnar(path)
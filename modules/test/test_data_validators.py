@@ -0,0 +1,90 @@
+"""
+Test suite for data_validators: approximate duplicate checks and the
+fused validate_all report.
+"""
+
+import random
+
+import pytest
+
+import data_validators
+
+
+def test_equal_numbers_count_once():
+    """Test 1, True and 1.0 are one value in both modes, as in a set."""
+    data = [1, True, 1.0, 2.5, 2.5]
+    exact = data_validators.check_duplicates(data)
+    approximate = data_validators.check_duplicates(data, approximate=True)
+    assert exact['unique'] == approximate['unique'] == 2
+
+
+def test_flag_positions_of_generator_needs_capacity():
+    """Test a generator needs an explicit capacity for the Bloom filter."""
+    values = [3, 1, 3, 2, 1]
+    with pytest.raises(ValueError, match='capacity'):
+        data_validators.check_duplicates(iter(values), approximate=True,
+                                         flag_positions=True)
+
+    result = data_validators.check_duplicates(
+        iter(values), approximate=True, flag_positions=True, capacity=100)
+    assert result['total'] == 5
+    assert result['probable_duplicate_indices'] == [2, 4]
+
+
+@pytest.fixture
+def gappy():
+    """Values with missing entries, repeats and two far outliers."""
+    data = [float(i % 17) for i in range(200)]
+    data[50], data[120] = 400.0, -350.0
+    for i in range(3, 200, 11):
+        data[i] = None
+    return data
+
+
+def _with_positions(report, positions):
+    """Map the indices of a report on the present values back to data."""
+    return [dict(entry, index=positions[entry['index']]) for entry in report]
+
+
+def test_validate_all_matches_individual_checks(gappy):
+    """Test the fused report equals the separate checks, indexed into data."""
+    positions = [i for i, x in enumerate(gappy) if x is not None]
+    present = [gappy[i] for i in positions]
+    rules = {'missing': True, 'duplicates': True, 'outliers': True,
+             'range': {'min_val': 0, 'max_val': 16}}
+
+    report = data_validators.validate_all(gappy, rules)
+
+    assert report['missing'] == data_validators.check_missing(gappy)
+    assert report['duplicates'] == data_validators.check_duplicates(present)
+    expected = data_validators.check_outliers(present)
+    assert report['outliers'] == dict(
+        expected, outliers=_with_positions(expected['outliers'], positions))
+    expected = data_validators.validate_numeric_range(present, 0, 16)
+    assert report['range'] == dict(
+        expected, violations=_with_positions(expected['violations'],
+                                             positions))
+
+
+def test_validate_all_agrees_on_the_fence():
+    """Test a value right at the z-score fence gets the same verdict."""
+    rng = random.Random(7)
+    data = [rng.uniform(-1, 1) * 10**rng.randint(-3, 6) for _ in range(999)]
+    check = data_validators.check_outliers(data)
+    scores = sorted(o['z_score'] for o in check['outliers'])
+    # Put the threshold exactly on an observed z-score
+    threshold = scores[0] if scores else 1.0
+    report = data_validators.validate_all(
+        data, {'outliers': {'threshold': threshold}})
+    assert report['outliers'] == data_validators.check_outliers(data,
+                                                                threshold)
+
+
+def test_validate_all_runs_only_requested_checks(gappy):
+    """Test the default rules skip 'range' and explicit rules are honoured."""
+    assert set(data_validators.validate_all(gappy)) == {
+        'missing', 'duplicates', 'outliers'}
+    report = data_validators.validate_all(
+        gappy, {'outliers': {'threshold': 100}})
+    assert report == {'outliers': {'count': 0, 'outliers': [],
+                                   'threshold': 100}}
@@ -0,0 +1,85 @@
+"""
+Test suite for the descriptive statistics: the mean of a list is
+correctly rounded and neither statistic depends on the input order;
+streaming and array inputs agree to rounding.
+"""
+
+import random
+from fractions import Fraction
+
+import pytest
+
+from datatools.stats import RunningStats, mean, std_dev, variance
+
+
+def exact_variance(values):
+    """Correctly rounded sample variance, from exact rational arithmetic."""
+    exact = [Fraction(x) for x in values]
+    m = sum(exact) / len(exact)
+    return float(sum((x - m)**2 for x in exact) / (len(exact) - 1))
+
+
+@pytest.fixture
+def values():
+    """Floats of very different magnitudes around a large offset."""
+    rng = random.Random(3)
+    return [1e9 + rng.uniform(-1, 1) * 10**rng.randint(-6, 3)
+            for _ in range(500)]
+
+
+def test_mean_is_correctly_rounded():
+    """Test cancelling terms do not swallow small ones."""
+    assert mean([1e16, 1.0, -1e16]) == 1 / 3
+    assert mean([0.1] * 10) == 0.1
+
+
+def test_variance_matches_exact_reference(values):
+    """Test the two-pass variance is accurate to the last bits."""
+    expected = exact_variance(values)
+    assert variance(values) == pytest.approx(expected, rel=1e-14)
+    assert std_dev(values) == variance(values)**0.5
+
+
+def test_result_does_not_depend_on_order(values):
+    """Test shuffling a list gives identical statistics."""
+    shuffled = values[:]
+    random.Random(4).shuffle(shuffled)
+    assert (mean(shuffled), variance(shuffled)) == (mean(values),
+                                                     variance(values))
+
+
+def test_merged_accumulators_match_a_single_pass(values):
+    """Test shards merged with Chan's formula agree with one pass."""
+    merged = RunningStats()
+    for start in range(0, len(values), 37):
+        merged.merge(RunningStats(values[start:start + 37]))
+    single = RunningStats(values)
+    assert merged.count == single.count
+    assert merged.mean == pytest.approx(single.mean, rel=1e-15)
+    assert merged.variance == pytest.approx(single.variance, rel=1e-9)
+
+
+def test_iterables_and_arrays_agree(values):
+    """Test generators and from_array agree with the list result."""
+    np = pytest.importorskip('numpy')
+    # The offset of 1e9 makes the streaming variance lose a few digits
+    expected = pytest.approx((mean(values), variance(values)), rel=1e-9)
+    assert (mean(iter(values)), variance(x for x in values)) == expected
+    acc = RunningStats.from_array(np.array(values))
+    assert (acc.mean, acc.variance) == expected
+
+
+def test_huge_values_do_not_overflow():
+    """Test squares beyond the float range do not turn variance into nan."""
+    data = [1e155, 1.1e155]
+    assert variance(data) == pytest.approx(5e307)
+    assert RunningStats(data).variance == pytest.approx(5e307)
+    assert variance(iter(data)) == pytest.approx(5e307)
+
+
+def test_too_few_values():
+    """Test empty and single-value inputs raise ValueError."""
+    with pytest.raises(ValueError):
+        mean([])
+    with pytest.raises(ValueError):
+        variance([2.0])
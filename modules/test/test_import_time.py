@@ -0,0 +1,39 @@
+"""
+Test suite for import-time side effects (see benchmarks/import_time.py).
+
+Each check imports in a fresh interpreter, so modules already loaded by
+other tests do not matter.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.import_time import (MODULES_DIR, PACKAGES, check_side_effects,
+                                    import_time)
+
+# Far below NumPy's own import time, with room for slow machines
+BUDGET_US = 100_000
+
+
+@pytest.mark.parametrize('package', PACKAGES)
+def test_import_is_lazy_and_silent(package):
+    """Test importing prints nothing and loads neither NumPy nor submodules."""
+    assert check_side_effects(package) == []
+
+
+@pytest.mark.parametrize('package', PACKAGES)
+def test_import_is_quick(package):
+    """Test importing each package stays within the time budget."""
+    assert import_time(package, runs=3) < BUDGET_US
+
+
+def test_descriptive_stats_skip_numpy_for_lists():
+    """Test the stats modules load NumPy only when an array needs it."""
+    probe = ("import sys; from datatools.stats import mean, variance; "
+             "mean([1, 2]); variance([1, 2]); print('numpy' in sys.modules)")
+    proc = subprocess.run([sys.executable, '-c', probe], cwd=MODULES_DIR,
+                          capture_output=True, text=True, check=True)
+    assert proc.stdout.strip() == 'False'
+    assert import_time('datatools.stats.descriptive', runs=3) < BUDGET_US
@@ -0,0 +1,139 @@
+"""
+Test suite for outlier detection.
+"""
+
+import random
+from array import array
+
+import pytest
+
+from datatools import backend
+from datatools.cleaning.outliers import (chunked_outlier_bounds,
+                                         detect_outliers, find_outliers,
+                                         outlier_bounds, remove_outliers)
+from datatools.columnar import open_columnar, write_columnar
+
+
+def test_unknown_method_lists_valid_methods():
+    """Test an unknown method raises ValueError naming the valid ones."""
+    for func in (detect_outliers, outlier_bounds,
+                 lambda data, method: chunked_outlier_bounds([data], method)):
+        with pytest.raises(ValueError, match="'zscore', 'iqr', 'mad'"):
+            func([1.0, 2.0, 3.0], method='median')
+
+
+@pytest.fixture
+def column_with_gaps(tmp_path):
+    """A columnar column with missing values, and its present values."""
+    pytest.importorskip('numpy')
+    rng = random.Random(1)
+    values = [rng.gauss(50, 5) for _ in range(200)]
+    values[::10] = [500.0, -400.0] * 10
+    gappy = [None if i % 7 == 3 else x for i, x in enumerate(values)]
+    write_columnar(tmp_path / 'data.col', {'x': gappy})
+    with open_columnar(tmp_path / 'data.col') as f:
+        yield f['x'], gappy
+
+
+@pytest.mark.parametrize('method', ['zscore', 'iqr', 'mad'])
+def test_column_missing_values_are_ignored(column_with_gaps, method):
+    """Test statistics skip the masked slots of a column."""
+    column, gappy = column_with_gaps
+    positions = [i for i, x in enumerate(gappy) if x is not None]
+    present = [gappy[i] for i in positions]
+    with backend.use_backend('python'):
+        expected_bounds = outlier_bounds(present, method)
+        expected = [positions[i] for i in detect_outliers(
+            present, method)['indices']]
+
+    assert outlier_bounds(column, method) == pytest.approx(expected_bounds)
+    found = detect_outliers(column, method)
+    assert found['count'] == len(expected) > 0
+    assert found['indices'].tolist() == expected
+
+    masked = column.to_numpy()
+    assert find_outliers(masked, method).tolist() == expected
+
+
+@pytest.mark.parametrize('method, data', [
+    ('zscore', []), ('zscore', [1.0]), ('iqr', []), ('mad', [])])
+def test_bounds_too_few_values_raise_on_both_backends(method, data):
+    """Test both backends raise the same ValueError for too few values."""
+    pytest.importorskip('numpy')
+    errors = []
+    for name in ('python', 'numpy'):
+        with backend.use_backend(name):
+            with pytest.raises(ValueError) as info:
+                outlier_bounds(data, method)
+            errors.append(str(info.value))
+    assert errors[0] == errors[1]
+
+
+def data_with_outliers(size):
+    """Gaussian values with two planted outliers at known positions."""
+    rng = random.Random(size)
+    values = [rng.gauss(50, 5) for _ in range(size)]
+    values[3], values[-2] = 500.0, -400.0
+    return values
+
+
+@pytest.mark.parametrize('size', [40, backend.AUTO_THRESHOLD + 10])
+@pytest.mark.parametrize('method', ['zscore', 'iqr', 'mad'])
+def test_find_outliers_result_types(size, method):
+    """Test positions and masks come back in the backend's container."""
+    data = data_with_outliers(size)
+    expected = detect_outliers(data, method)['indices']
+    assert {3, size - 2} <= set(expected)
+
+    indices = find_outliers(data, method)
+    mask = find_outliers(data, method, return_mask=True)
+    if backend.use_numpy(data):
+        np = backend.np
+        assert indices.dtype.kind == 'i'
+        assert mask.dtype == np.bool_ and mask.shape == (size,)
+    else:
+        assert isinstance(indices, array) and indices.typecode == 'q'
+        assert isinstance(mask, bytearray) and len(mask) == size
+        assert set(mask) <= {0, 1}
+    assert list(indices) == expected
+    assert [i for i, flag in enumerate(mask) if flag] == expected
+
+
+def test_find_outliers_numpy_array_input():
+    """Test an ndarray gives an index array and a boolean mask."""
+    np = pytest.importorskip('numpy')
+    data = np.array(data_with_outliers(40))
+    assert find_outliers(data).tolist() == [3, 38]
+    mask = find_outliers(data, return_mask=True)
+    assert mask.dtype == np.bool_
+    assert np.flatnonzero(mask).tolist() == [3, 38]
+
+
+@pytest.mark.parametrize('size', [40, backend.AUTO_THRESHOLD + 10])
+@pytest.mark.parametrize('method', ['zscore', 'iqr', 'mad'])
+def test_remove_outliers_inplace_list(size, method):
+    """Test in-place removal truncates and returns the caller's list."""
+    data = data_with_outliers(size)
+    expected = remove_outliers(list(data), method)
+    result = remove_outliers(data, method, inplace=True)
+    assert result is data
+    assert data == expected
+    assert 500.0 not in data and -400.0 not in data
+
+
+@pytest.mark.parametrize('method', ['zscore', 'iqr', 'mad'])
+def test_remove_outliers_inplace_numpy(method):
+    """Test in-place removal compacts the caller's array into a view."""
+    np = pytest.importorskip('numpy')
+    data = np.array(data_with_outliers(40))
+    expected = remove_outliers(data.copy(), method)
+    result = remove_outliers(data, method, inplace=True)
+    assert np.shares_memory(result, data)
+    assert result.tolist() == expected.tolist()
+    assert data[:result.size].tolist() == expected.tolist()
+
+
+def test_remove_outliers_inplace_rejects_other_containers():
+    """Test tuples cannot be compacted in place."""
+    with pytest.raises(TypeError, match="list or NumPy array"):
+        remove_outliers(tuple(data_with_outliers(40)), inplace=True)
@@ -0,0 +1,117 @@
+"""
+Test suite for the opt-in parallel execution of datatools and
+data_validators.
+
+Small chunk sizes force several chunks, so the merges are exercised
+without needing large inputs.
+"""
+
+import math
+import random
+
+import pytest
+
+import data_validators
+from datatools import backend
+from datatools.parallel import ParallelExecutor
+from datatools.stats.accumulator import partial_sums
+from datatools.stats import mean, std_dev, variance
+
+
+@pytest.fixture
+def values():
+    """12000 floats of very different magnitudes."""
+    rng = random.Random(0)
+    return [rng.uniform(-1, 1) * 10**rng.randint(-5, 8)
+            for _ in range(12_000)]
+
+
+@pytest.fixture
+def executor():
+    with ParallelExecutor(workers=4, chunk_size=1000, kind='thread') as ex:
+        yield ex
+
+
+def test_partial_sums_merge_to_fsum(values):
+    """Test merging shard partials gives fsum of the whole list."""
+    data = values + [1e300, 1.0, -1e300, 1e-300]
+    shards = [partial_sums(data[start:start + 777])
+              for start in range(0, len(data), 777)]
+    assert math.fsum(p for shard in shards for p in shard) == math.fsum(data)
+    assert partial_sums([]) == []
+    assert partial_sums([math.inf, 1.0]) == [math.inf]
+
+
+def test_auto_backend_matches_serial(values, executor):
+    """Test results with and without an executor agree under 'auto'."""
+    with backend.use_backend('auto'):
+        assert mean(values, executor=executor) == mean(values)
+        assert variance(values, executor=executor) == variance(values)
+        assert std_dev(values, executor=executor) == std_dev(values)
+
+
+def test_python_backend_matches_serial(values, executor):
+    """Test the chunked pure-Python path against a single pass."""
+    with backend.use_backend('python'):
+        assert mean(values, executor=executor) == mean(values)
+        assert variance(values, executor=executor) == variance(values)
+
+
+def test_backends_agree_exactly(values, executor):
+    """Test the Python, NumPy and chunked paths give the same floats."""
+    pytest.importorskip('numpy')
+    with backend.use_backend('python'):
+        expected = mean(values), variance(values)
+    with backend.use_backend('numpy'):
+        assert (mean(values), variance(values)) == expected
+        assert (mean(values, executor=executor),
+                variance(values, executor=executor)) == expected
+
+
+def test_check_outliers_matches_serial(values, executor):
+    """Test chunked outlier detection gives the serial report."""
+    assert (data_validators.check_outliers(values, executor=executor)
+            == data_validators.check_outliers(values))
+
+
+def test_process_pool_matches_serial(values):
+    """Test the kernels also give the serial results in worker processes."""
+    with ParallelExecutor(workers=2, chunk_size=5000) as ex:
+        assert mean(values, executor=ex) == mean(values)
+        assert variance(values, executor=ex) == variance(values)
+        assert (data_validators.check_outliers(values, executor=ex)
+                == data_validators.check_outliers(values))
+
+
+def test_small_inputs_run_inline(executor):
+    """Test inputs within one chunk give exactly the serial result."""
+    data = [1.5, 2.25, 3.0, 10.0]
+    with backend.use_backend('python'):
+        assert variance(data, executor=executor) == variance(data)
+    with pytest.raises(ValueError):
+        variance([1.0], executor=executor)
+
+
+def test_process_pool_sends_floats_but_reports_caller_values():
+    """Test ints go to workers as floats and come back as the caller's."""
+    rng = random.Random(1)
+    data = [rng.randint(-50, 50) for _ in range(12_000)]
+    data[123] = 10**6
+    with ParallelExecutor(workers=2, chunk_size=5000) as ex:
+        prepared = ex.as_floats(data)
+        assert prepared.typecode == 'd' and list(prepared) == data
+        assert ex.as_floats(prepared) is prepared
+        assert mean(data, executor=ex) == mean(data)
+        assert variance(data, executor=ex) == variance(data)
+        report = data_validators.check_outliers(data, executor=ex)
+    assert report == data_validators.check_outliers(data)
+    assert [(o['index'], o['value']) for o in report['outliers']] == [
+        (123, 10**6)]
+    assert type(report['outliers'][0]['value']) is int
+
+
+def test_as_floats_only_converts_for_process_pools(values, executor):
+    """Test threads and inline runs keep the caller's list."""
+    assert executor.as_floats(values) is values
+    with ParallelExecutor(workers=2, chunk_size=len(values)) as ex:
+        assert ex.as_floats(values) is values
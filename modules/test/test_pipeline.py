@@ -0,0 +1,170 @@
+"""
+Test suite for the out-of-core cleaning pipeline.
+"""
+
+import random
+
+import pytest
+
+from datatools.cleaning.missing import fill_missing
+from datatools.cleaning.outliers import outlier_bounds
+from datatools.io import read_csv_column, write_csv_column
+from datatools.pipeline import (clean_chunks, clean_csv, fill_missing_chunks,
+                                fit_cleaning, remove_outliers_chunks)
+from datatools.stats.descriptive import mean
+
+
+@pytest.mark.parametrize('method', ['iqr', 'mad'])
+def test_sketch_fences_are_reproducible(method):
+    """Test the same seed gives the same approximate fences."""
+    rng = random.Random(0)
+    chunks = [[rng.gauss(0, 1) for _ in range(2000)] for _ in range(10)]
+
+    first = fit_cleaning(chunks, 'median', method, k=20)
+    second = fit_cleaning(chunks, 'median', method, k=20)
+
+    assert first == second
+    assert fit_cleaning(chunks, 'median', method, k=20, seed=5) != first
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    """A two-column CSV with missing markers and planted outliers."""
+    rng = random.Random(2)
+    values = [round(rng.gauss(100, 10), 3) for _ in range(500)]
+    values[7], values[300] = 900.0, -700.0
+    cells = [str(x) for x in values]
+    for i, marker in zip(range(5, 500, 50), ['', 'NA', 'NaN', 'null', ' ']
+                         * 2):
+        cells[i] = marker
+        values[i] = None
+    path = tmp_path / 'raw.csv'
+    lines = ['id,latency'] + [f'{i},{c}' for i, c in enumerate(cells)]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path, values
+
+
+def test_csv_column_reads_chunks_and_missing(raw_csv):
+    """Test chunking, missing markers and column lookup by name or index."""
+    path, values = raw_csv
+    column = read_csv_column(path, 'latency', chunk_size=64)
+    chunks = list(column)
+    assert [len(c) for c in chunks] == [64] * 7 + [52]
+    assert [x for c in chunks for x in c] == values
+    # Re-iterable: a second pass reads the file again
+    assert list(column) == chunks
+    by_index = read_csv_column(path, 1, chunk_size=1000)
+    assert list(by_index) == [values]
+    ids = read_csv_column(path, 'id', converter=int)
+    assert next(iter(ids))[:3] == [0, 1, 2]
+
+
+def test_csv_column_errors(raw_csv, tmp_path):
+    """Test bad columns, bad chunk sizes and an empty file."""
+    path, _ = raw_csv
+    with pytest.raises(KeyError, match='missing'):
+        list(read_csv_column(path, 'missing'))
+    with pytest.raises(IndexError):
+        list(read_csv_column(path, 2))
+    with pytest.raises(ValueError):
+        read_csv_column(path, 'latency', chunk_size=0)
+    empty = tmp_path / 'empty.csv'
+    empty.write_text('', encoding='utf-8')
+    assert list(read_csv_column(empty, 'latency')) == []
+
+
+def test_csv_write_read_round_trip(tmp_path):
+    """Test written chunks read back unchanged, None included."""
+    path = tmp_path / 'out.csv'
+    chunks = [[1.5, None, -2.25], [], [1e-300, 123456789.125]]
+    assert write_csv_column(path, chunks, header='x') == 5
+    assert path.read_text(encoding='utf-8').splitlines()[:2] == ['x', '1.5']
+    back = [x for c in read_csv_column(path, 'x', chunk_size=2) for x in c]
+    assert back == [x for c in chunks for x in c]
+
+    assert write_csv_column(path, [[1.0, 2.0]], header=None) == 2
+    assert path.read_text(encoding='utf-8').splitlines() == ['1.0', '2.0']
+
+
+def test_csv_write_numpy_chunks(tmp_path):
+    """Test NumPy chunks are written as plain numbers."""
+    np = pytest.importorskip('numpy')
+    path = tmp_path / 'out.csv'
+    assert write_csv_column(path, [np.array([1.0, 2.5]), np.arange(2.0)]) == 4
+    assert list(read_csv_column(path, 'value')) == [[1.0, 2.5, 0.0, 1.0]]
+
+
+def test_fill_and_remove_stages_on_lists():
+    """Test the lazy stages fill None and drop values outside the fences."""
+    chunks = [[1.0, None, 3.0], [None], [10.0, -5.0]]
+    filled = fill_missing_chunks(chunks, 2.0)
+    assert iter(filled) is filled
+    assert list(filled) == [[1.0, 2.0, 3.0], [2.0], [10.0, -5.0]]
+    kept = remove_outliers_chunks(fill_missing_chunks(chunks, 2.0), (0, 5))
+    assert list(kept) == [[1.0, 2.0, 3.0], [2.0], []]
+    # Values on a fence are kept
+    assert list(remove_outliers_chunks([[0, 5, 5.5]], (0, 5))) == [[0, 5]]
+
+
+def test_fill_and_remove_stages_on_arrays():
+    """Test NaN is missing in array chunks and the stages return arrays."""
+    np = pytest.importorskip('numpy')
+    chunks = [np.array([1.0, np.nan, 3.0]), np.array([10.0, -5.0])]
+    filled = list(fill_missing_chunks(chunks, 2.0))
+    assert [c.tolist() for c in filled] == [[1.0, 2.0, 3.0], [10.0, -5.0]]
+    kept = list(remove_outliers_chunks(filled, (0, 5)))
+    assert all(isinstance(c, np.ndarray) for c in kept)
+    assert [c.tolist() for c in kept] == [[1.0, 2.0, 3.0], []]
+
+
+def test_clean_csv_matches_in_memory_cleaning(raw_csv, tmp_path):
+    """Test mean fill and z-score fences agree with an in-memory pass."""
+    path, values = raw_csv
+    dst = tmp_path / 'clean.csv'
+    report = clean_csv(path, dst, 'latency', chunk_size=64)
+
+    filled = fill_missing(values, 'mean')
+    lower, upper = outlier_bounds(filled, 'zscore')
+    expected = [x for x in filled if lower <= x <= upper]
+    assert report['count'] == 500
+    assert report['missing'] == {'count': 10, 'percentage': 2.0}
+    assert report['fill_value'] == pytest.approx(mean(
+        [x for x in values if x is not None]))
+    assert report['bounds'] == pytest.approx((lower, upper))
+    assert report['written'] == len(expected) == 498
+    assert report['removed'] == 2
+
+    written = [x for c in read_csv_column(dst, 'latency') for x in c]
+    assert written == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('method', ['iqr', 'mad'])
+def test_clean_csv_sketch_methods_drop_planted_outliers(raw_csv, tmp_path,
+                                                        method):
+    """Test the approximate fences still remove the planted outliers."""
+    path, values = raw_csv
+    dst = tmp_path / 'clean.csv'
+    report = clean_csv(path, dst, 1, strategy='median', method=method,
+                       chunk_size=64)
+    lower, upper = report['bounds']
+    assert lower > -700.0 and upper < 900.0
+    written = [x for c in read_csv_column(dst, 'value') for x in c]
+    assert len(written) == report['written']
+    assert all(lower <= x <= upper for x in written)
+    assert written.count(report['fill_value']) >= 10
+
+
+def test_clean_csv_without_outlier_method(raw_csv, tmp_path):
+    """Test method=None only fills, keeping every row."""
+    path, _ = raw_csv
+    dst = tmp_path / 'clean.csv'
+    report = clean_csv(path, dst, 'latency', strategy='zero', method=None)
+    assert report['bounds'] is None and report['removed'] == 0
+    written = [x for c in read_csv_column(dst, 'latency') for x in c]
+    assert len(written) == 500 and written.count(0.0) == 10
+
+
+def test_clean_chunks_rejects_one_shot_iterators():
+    """Test a generator cannot feed both passes."""
+    with pytest.raises(TypeError, match='re-iterable'):
+        clean_chunks(iter([[1.0, 2.0]]))
@@ -0,0 +1,78 @@
+"""
+Test suite for selection-based quantiles and the quantile sketch.
+"""
+
+import random
+
+import pytest
+
+from datatools import backend
+from datatools.stats import QuantileSketch, quantiles, select_kth, select_ranks
+
+
+@pytest.fixture
+def values():
+    """Random floats with many repeated values."""
+    rng = random.Random(5)
+    return [rng.choice([rng.random(), float(rng.randint(0, 9))])
+            for _ in range(1001)]
+
+
+def sorted_quantile(values, q):
+    """Reference: linear interpolation on a sorted copy."""
+    ordered = sorted(values)
+    h = (len(ordered) - 1) * q
+    lo = int(h)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (h - lo)
+
+
+def test_select_kth_matches_sorted(values):
+    """Test every rank, including negative ones, against sorted()."""
+    ordered = sorted(values)
+    with backend.use_backend('python'):
+        for k in list(range(0, len(values), 50)) + [-1, -len(values)]:
+            assert select_kth(values, k) == ordered[k]
+        assert select_ranks(values, range(len(values))) == dict(
+            enumerate(ordered))
+        with pytest.raises(IndexError):
+            select_kth(values, len(values))
+
+
+def test_quantiles_match_sorted(values):
+    """Test several quantiles from one pass against a sorted reference."""
+    qs = [0, 0.1, 0.25, 0.5, 0.75, 0.999, 1]
+    expected = [sorted_quantile(values, q) for q in qs]
+    with backend.use_backend('python'):
+        assert quantiles(values, qs) == pytest.approx(expected)
+        with pytest.raises(ValueError):
+            quantiles(values, [1.5])
+    pytest.importorskip('numpy')
+    with backend.use_backend('numpy'):
+        assert quantiles(values, qs) == pytest.approx(expected)
+
+
+def test_sketch_rank_error_is_bounded():
+    """Test the sketch's answers are within about 2/k of the true rank."""
+    n, k = 20_000, 200
+    stream = list(range(n))
+    random.Random(6).shuffle(stream)
+    halves = [QuantileSketch(k, seed=1), QuantileSketch(k, seed=2)]
+    halves[0].update(stream[:n // 2])
+    halves[1].update(stream[n // 2:])
+    merged = halves[0].merge(halves[1])
+
+    qs = [i / 20 for i in range(1, 20)]
+    for q, value in zip(qs, merged.quantiles(qs)):
+        # Values are their own ranks
+        assert abs(value - q * n) <= 2 / k * n
+    assert (merged.count, merged.min, merged.max) == (n, 0, n - 1)
+
+
+def test_submodule_and_function_names_do_not_clash():
+    """Test the selection module imports as a module next to quantiles()."""
+    import datatools.stats
+    import datatools.stats.selection as selection
+
+    assert selection.__name__ == 'datatools.stats.selection'
+    assert datatools.stats.quantiles is selection.quantiles
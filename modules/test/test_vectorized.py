@@ -0,0 +1,204 @@
+"""
+Test suite for the element-wise mathtools operations.
+"""
+
+import math
+import operator
+from array import array
+
+import pytest
+
+from mathtools import advanced
+from mathtools import vectorized as vec
+
+
+def test_factorial_list_matches_math():
+    """Test list and array.array inputs against math.factorial."""
+    values = [0, 1, 5, 20, 21, 5, 30]
+    expected = [math.factorial(v) for v in values]
+    assert vec.factorial(values) == expected
+    assert vec.factorial(7) == math.factorial(7)
+    assert list(vec.factorial(array('q', values))) == expected
+
+
+def test_factorial_numpy_table_and_object_paths():
+    """Test small arrays use the int64 table and large ones exact ints."""
+    np = pytest.importorskip('numpy')
+    small = np.arange(advanced.SMALL_LIMIT + 1).reshape(3, 7)
+    result = vec.factorial(small)
+    assert result.dtype == np.int64 and result.shape == (3, 7)
+    assert result.ravel().tolist() == list(advanced.SMALL_FACTORIALS)
+
+    large = np.array([[25, 3], [25, 0]])
+    assert vec.factorial(large).tolist() == [
+        [math.factorial(25), 6], [math.factorial(25), 1]]
+
+
+def test_factorial_numpy_bool_counts_as_int():
+    """Test a bool array gives 0! and 1! instead of indexing as a mask."""
+    np = pytest.importorskip('numpy')
+    assert vec.factorial(np.array([True, False, True])).tolist() == [1, 1, 1]
+
+
+def test_factorial_numpy_rejects_bad_input():
+    """Test negative and non-integer arrays raise like the scalar version."""
+    np = pytest.importorskip('numpy')
+    with pytest.raises(ValueError):
+        vec.factorial(np.array([3, -1]))
+    with pytest.raises(TypeError):
+        vec.factorial(np.array([1.5]))
+
+
+def test_factorial_writes_into_out():
+    """Test results land in a preallocated buffer, which is returned."""
+    np = pytest.importorskip('numpy')
+    out = np.zeros(4, dtype=np.int64)
+    assert vec.factorial(np.arange(4), out=out) is out
+    assert out.tolist() == [1, 1, 2, 6]
+
+
+@pytest.mark.parametrize("func, op", [
+    (vec.add, operator.add),
+    (vec.subtract, operator.sub),
+    (vec.power, pow),
+])
+def test_list_operations_match_operator(func, op):
+    """Test lists, scalars and length-1 sequences against the operator."""
+    a, b = [3, -2, 7, 0], [2, 5, 1, 3]
+    assert func(a, b) == [op(x, y) for x, y in zip(a, b)]
+    assert func(a, 4) == [op(x, 4) for x in a]
+    assert func(4, b) == [op(4, y) for y in b]
+    assert func(a, [3]) == [op(x, 3) for x in a]
+    assert func(5, 2) == op(5, 2)
+    assert func(iter(a), tuple(b)) == [op(x, y) for x, y in zip(a, b)]
+
+
+@pytest.mark.parametrize("func, op", [
+    (vec.add, operator.add),
+    (vec.subtract, operator.sub),
+    (vec.power, pow),
+])
+def test_numpy_operations_match_operator(func, op):
+    """Test the ufunc path broadcasts like NumPy and matches the operator."""
+    np = pytest.importorskip('numpy')
+    a = np.array([[3, -2, 7], [0, 4, 1]])
+    b = np.array([2, 3, 1])
+    expected = [[op(x, y) for x, y in zip(row, b.tolist())]
+                for row in a.tolist()]
+    assert func(a, b).tolist() == expected
+    assert func(a.tolist(), b).tolist() == expected
+
+
+def test_power_mod_lists_match_builtin_pow():
+    """Test modular power on plain sequences, including a sequence mod."""
+    bases, exponents = [2, 3, 10, 123456789], [10, 0, 18, 65537]
+    assert vec.power(bases, exponents, mod=1000) == [
+        pow(b, e, 1000) for b, e in zip(bases, exponents)]
+    mods = [7, 11, 13, 10**9 + 7]
+    assert vec.power(bases, exponents, mod=mods) == [
+        pow(b, e, m) for b, e, m in zip(bases, exponents, mods)]
+
+
+def test_power_mod_numpy_int64_path_matches_builtin_pow():
+    """Test square-and-multiply up to the largest int64-safe modulus."""
+    np = pytest.importorskip('numpy')
+    rng = np.random.default_rng(12)
+    mod = vec._MODPOW_LIMIT
+    bases = rng.integers(-10**12, 10**12, size=200)
+    exponents = rng.integers(0, 2**40, size=200)
+    result = vec.power(bases, exponents, mod=mod)
+    assert result.dtype == np.int64
+    assert result.tolist() == [
+        pow(b, e, mod) for b, e in zip(bases.tolist(), exponents.tolist())]
+
+    mods = np.array([1, 2, 97, mod])
+    assert vec.power(3, 5, mod=mods).tolist() == [
+        pow(3, 5, m) for m in mods.tolist()]
+
+
+def test_power_mod_numpy_object_fallback_matches_builtin_pow():
+    """Test moduli past the int64 limit and negative exponents use pow."""
+    np = pytest.importorskip('numpy')
+    mod = 2**61 - 1
+    assert mod > vec._MODPOW_LIMIT
+    bases = np.array([2, 3, 2**40 + 5, mod - 1])
+    exponents = np.array([100, 2**50, 12345, 3])
+    result = vec.power(bases, exponents, mod=mod)
+    assert result.dtype == np.int64
+    assert result.tolist() == [
+        pow(b, e, mod) for b, e in zip(bases.tolist(), exponents.tolist())]
+
+    # A negative exponent is a modular inverse, as with pow(b, -1, mod)
+    assert vec.power(np.array([3, 4]), -1, mod=11).tolist() == [
+        pow(3, -1, 11), pow(4, -1, 11)]
+
+
+def test_power_mod_numpy_rejects_bad_input():
+    """Test float operands and non-positive moduli raise."""
+    np = pytest.importorskip('numpy')
+    with pytest.raises(TypeError):
+        vec.power(np.array([2.0]), 3, mod=5)
+    with pytest.raises(ValueError):
+        vec.power(np.array([2]), 3, mod=np.array([5, 0]))
+
+
+def test_broadcast_errors():
+    """Test mismatched lengths raise, with and without out."""
+    with pytest.raises(ValueError, match="broadcast"):
+        vec.add([1, 2, 3], [1, 2])
+    with pytest.raises(ValueError, match="out of length 2"):
+        vec.add([1, 2, 3], 1, out=[0, 0])
+    with pytest.raises(ValueError, match="out of length 3"):
+        vec.subtract([1, 2], [1, 2, 3], out=[0, 0, 0])
+
+
+def test_out_list_and_array():
+    """Test list and array.array buffers are filled and returned."""
+    out = [None] * 3
+    assert vec.add([1, 2, 3], 10, out=out) is out
+    assert out == [11, 12, 13]
+
+    out = array('q', [0, 0, 0])
+    assert vec.power([2, 3, 4], 2, mod=5, out=out) is out
+    assert out == array('q', [4, 4, 1])
+
+    # Scalars broadcast to the length of out
+    out = [0, 0]
+    assert vec.subtract(5, 2, out=out) == [3, 3]
+
+
+def test_out_list_and_array_from_numpy():
+    """Test NumPy results are copied into non-NumPy buffers."""
+    np = pytest.importorskip('numpy')
+    out = [0, 0, 0]
+    assert vec.add(np.arange(3), 1, out=out) is out
+    assert out == [1, 2, 3]
+
+    out = array('d', [0.0, 0.0])
+    assert vec.power(np.array([2.0, 3.0]), 2, out=out) is out
+    assert out == array('d', [4.0, 9.0])
+
+    out = array('q', [0, 0])
+    assert vec.power(np.array([2, 3]), 10, mod=7, out=out) is out
+    assert out == array('q', [pow(2, 10, 7), pow(3, 10, 7)])
+
+
+def test_array_results_keep_or_widen_typecode():
+    """Test array.array results keep the typecode or widen to 'q'/'d'."""
+    small = array('b', [100, 120])
+    result = vec.add(small, 1)
+    assert result.typecode == 'b' and list(result) == [101, 121]
+
+    result = vec.add(small, 100)
+    assert result.typecode == 'q' and list(result) == [200, 220]
+
+    result = vec.add(array('i', [1, 2]), 0.5)
+    assert result.typecode == 'd' and list(result) == [1.5, 2.5]
+
+    # Past int64 there is no typecode left, so a list comes back
+    result = vec.power(array('q', [2, 3]), 70)
+    assert result == [2**70, 3**70]
+
+    # The container follows the first sequence operand
+    assert isinstance(vec.add([1, 2], array('q', [1, 1])), list)
+    assert isinstance(vec.add(1, array('q', [1, 1])), array)
@@ -0,0 +1,143 @@
+"""
+Benchmark: per-image transformations vs. the batched `mnist_transforms`.
+
+Applies each transformation to the training set twice, once calling a
+per-image function in a Python loop (as the notebook does) and once with
+the batched version, checks that both give identical results and prints
+the times.
+
+Usage:
+
+    python benchmark_transforms.py               # MNIST via mnist_loader
+    python benchmark_transforms.py --synthetic   # random digits, offline
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import mnist_transforms
+
+
+# Per-image versions, one 28x28 image per call
+
+def binarize_image(image, threshold=128):
+    return (image > threshold).astype(np.uint8)
+
+
+def shift_image(image, dx, dy):
+    height, width = image.shape
+    shifted = np.zeros_like(image)
+    if abs(dx) >= width or abs(dy) >= height:
+        return shifted
+    shifted[max(dy, 0):height + min(dy, 0), max(dx, 0):width + min(dx, 0)] = \
+        image[max(-dy, 0):height - max(dy, 0), max(-dx, 0):width - max(dx, 0)]
+    return shifted
+
+
+def find_limits(image):
+    rows = np.flatnonzero(image.any(axis=1))
+    cols = np.flatnonzero(image.any(axis=0))
+    return rows[0], rows[-1], cols[0], cols[-1]
+
+
+def crop_image_limits(image):
+    top, bottom, left, right = find_limits(image)
+    return image[top:bottom + 1, left:right + 1]
+
+
+def resize_image(image, size):
+    # Nearest neighbour, pixel by pixel: output pixel (i, j) takes the
+    # source pixel under its center, ((i + 1/2) * height / size, ...)
+    height, width = image.shape
+    resized = np.empty((size, size), image.dtype)
+    for i in range(size):
+        for j in range(size):
+            resized[i, j] = image[(2 * i + 1) * height // (2 * size),
+                                  (2 * j + 1) * width // (2 * size)]
+    return resized
+
+
+def synthetic_digits(n, seed=0):
+    """Random blocks of ink at random places, for offline runs."""
+    rng = np.random.default_rng(seed)
+    images = np.zeros((n, 28, 28), np.uint8)
+    tops = rng.integers(2, 10, n)
+    lefts = rng.integers(2, 12, n)
+    heights = rng.integers(10, 19, n)
+    widths = rng.integers(5, 15, n)
+    for i in range(n):
+        images[i, tops[i]:tops[i] + heights[i],
+               lefts[i]:lefts[i] + widths[i]] = rng.integers(
+                   1, 256, (heights[i], widths[i]))
+    return images
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def run(images, seed=0):
+    """Time and compare every transformation; returns a list of rows."""
+    rng = np.random.default_rng(seed)
+    n = len(images)
+    dx = rng.integers(-5, 6, n)
+    dy = rng.integers(-5, 6, n)
+    cases = [
+        ("binarize",
+         lambda: np.stack([binarize_image(image) for image in images]),
+         lambda: mnist_transforms.binarize(images)),
+        ("shift (per-image offsets)",
+         lambda: np.stack([shift_image(image, int(x), int(y))
+                           for image, x, y in zip(images, dx, dy)]),
+         lambda: mnist_transforms.shift(images, dx, dy)),
+        ("shift right 10",
+         lambda: np.stack([shift_image(image, 10, 0) for image in images]),
+         lambda: mnist_transforms.shift(images, 10, 0)),
+        ("find_limits",
+         lambda: np.array([find_limits(image) for image in images]).T,
+         lambda: np.array(mnist_transforms.find_limits(images))),
+        ("crop + resize to 20x20",
+         lambda: np.stack([resize_image(crop_image_limits(image), 20)
+                           for image in images]),
+         lambda: mnist_transforms.crop_resize(images, 20)),
+    ]
+    rows = []
+    for name, per_image, batched in cases:
+        expected, loop_time = timed(per_image)
+        result, batch_time = timed(batched)
+        rows.append((name, loop_time, batch_time,
+                     np.array_equal(expected, result)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--synthetic", action="store_true",
+                        help="use random digits instead of MNIST")
+    parser.add_argument("-n", type=int, default=60000,
+                        help="number of images (default: 60000)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        images = synthetic_digits(args.n)
+    else:
+        from mnist_loader import load_data
+        (images, _), _ = load_data()
+        images = np.asarray(images[:args.n])
+    # The per-image find_limits needs some ink in every image
+    images = images[images.reshape(len(images), -1).any(axis=1)]
+
+    print(f"{len(images)} images of {images.shape[1]}x{images.shape[2]}")
+    print(f"{'transformation':28}{'per image':>11}{'batched':>11}"
+          f"{'speedup':>10}  identical")
+    for name, loop_time, batch_time, same in run(images):
+        print(f"{name:28}{loop_time:10.3f}s{batch_time:10.3f}s"
+              f"{loop_time / batch_time:9.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Makes the project modules (e.g. mnist_loader) importable from test/
@@ -0,0 +1,237 @@
+"""
+Lazy data augmentation for MNIST-like image batches.
+
+Building an augmented training set by concatenating augmented copies
+multiplies the memory used: the notebook's five variants of 60000
+images are a (300000, 28, 28) array, eight times larger again once
+converted to float64. This module generates augmented images only when
+they are needed, one mini-batch at a time, from the original array
+(which can itself be a memory map, see `mnist_loader`).
+
+Augmentations are small classes applied to a whole (N, H, W) uint8
+batch, with a NumPy random generator passed in:
+
+    Noise(sigma)          Gaussian noise, clipped to [0, 255]
+    Binarize(threshold)   1 where the pixel is > threshold, else 0
+    Shift(max_shift)      random shift that keeps the digit visible
+    Crop(size)            crop to the digit, resize to size x size and
+                          center it in the frame
+
+`Pipeline` chains them, and `AugmentedDataset` presents the original
+images under several pipelines as one virtual dataset, in the same order
+as the notebook's concatenation:
+
+    dataset = AugmentedDataset(X_train, y_train, NOTEBOOK_VARIANTS, seed=0)
+    for X_batch, y_batch in dataset.batches(256, shuffle=True, epoch=0):
+        ...
+
+All randomness comes from `seed`: the same seed and epoch always give
+the same batches. `dataset.materialize(path)` writes the whole augmented
+set to a memory-mapped `.npy` file, block by block, when a fixed copy is
+needed.
+"""
+
+import numpy as np
+
+import mnist_transforms
+
+DEFAULT_BLOCK_SIZE = 4096
+
+
+class Pipeline:
+    """A sequence of augmentations applied one after another."""
+
+    def __init__(self, *steps):
+        self.steps = steps
+
+    def __call__(self, images, rng):
+        for step in self.steps:
+            images = step(images, rng)
+        return images
+
+    def __repr__(self):
+        return f"Pipeline({', '.join(map(repr, self.steps))})"
+
+
+class Noise:
+    """Add Gaussian noise with standard deviation `sigma`."""
+
+    def __init__(self, sigma=25.0):
+        self.sigma = sigma
+
+    def __call__(self, images, rng):
+        noise = rng.normal(0.0, self.sigma, images.shape).astype(np.float32)
+        noisy = images + noise
+        return np.clip(np.rint(noisy), 0, 255).astype(np.uint8)
+
+    def __repr__(self):
+        return f"Noise(sigma={self.sigma})"
+
+
+class Binarize:
+    """Set pixels above `threshold` to 1 and the rest to 0."""
+
+    def __init__(self, threshold=128):
+        self.threshold = threshold
+
+    def __call__(self, images, rng):
+        return mnist_transforms.binarize(images, self.threshold)
+
+    def __repr__(self):
+        return f"Binarize(threshold={self.threshold})"
+
+
+class Shift:
+    """
+    Shift each image by a random number of pixels in each direction.
+
+    Offsets are drawn from [-max_shift, max_shift] and then limited so
+    that the digit (its non-zero bounding box) stays inside the frame.
+    """
+
+    def __init__(self, max_shift=5):
+        self.max_shift = max_shift
+
+    def __call__(self, images, rng):
+        n, height, width = images.shape
+        top, bottom, left, right = mnist_transforms.find_limits(images)
+        dy = rng.integers(-self.max_shift, self.max_shift + 1, n)
+        dx = rng.integers(-self.max_shift, self.max_shift + 1, n)
+        dy = np.clip(dy, -top, height - 1 - bottom)
+        dx = np.clip(dx, -left, width - 1 - right)
+        return mnist_transforms.shift(images, dx, dy)
+
+    def __repr__(self):
+        return f"Shift(max_shift={self.max_shift})"
+
+
+class Crop:
+    """
+    Crop each image to its digit, resize it to `size` x `size` and
+    center it in the original frame (like the 20x20 digits of MNIST).
+    """
+
+    def __init__(self, size=20):
+        self.size = size
+
+    def __call__(self, images, rng):
+        n, height, width = images.shape
+        if not 0 < self.size <= min(height, width):
+            raise ValueError(f"Crop size {self.size} does not fit in "
+                             f"{height}x{width} images")
+        cropped = mnist_transforms.crop_resize(images, self.size)
+        out = np.zeros_like(images)
+        y0 = (height - self.size) // 2
+        x0 = (width - self.size) // 2
+        out[:, y0:y0 + self.size, x0:x0 + self.size] = cropped
+        return out
+
+    def __repr__(self):
+        return f"Crop(size={self.size})"
+
+
+# The notebook's augmented set: original, noisy, binarized, noisy and
+# binarized, and shifted images
+NOTEBOOK_VARIANTS = (
+    Pipeline(),
+    Pipeline(Noise()),
+    Pipeline(Binarize()),
+    Pipeline(Noise(), Binarize()),
+    Pipeline(Shift()),
+)
+
+
+class AugmentedDataset:
+    """
+    The images under several augmentation pipelines, as one dataset.
+
+    Item `i` is base image `i % N` under pipeline `i // N`, where N is
+    the number of base images, so the order matches concatenating the
+    augmented copies. Nothing is computed until a batch is requested.
+
+    Parameters:
+        images: (N, H, W) uint8 array (a memory map is fine)
+        labels: optional (N,) array of labels, repeated for each variant
+        variants: sequence of pipelines (callables taking a batch and a
+            random generator)
+        seed: seed for every random choice
+    """
+
+    def __init__(self, images, labels=None, variants=NOTEBOOK_VARIANTS,
+                 seed=0):
+        if labels is not None and len(labels) != len(images):
+            raise ValueError("images and labels must have the same length")
+        self.images = images
+        self.labels = labels
+        self.variants = tuple(variants)
+        self.seed = seed
+
+    def __len__(self):
+        return len(self.images) * len(self.variants)
+
+    @property
+    def shape(self):
+        return (len(self),) + self.images.shape[1:]
+
+    def _apply(self, indices, rng):
+        # Augment the items at `indices`, grouped by variant
+        base = len(self.images)
+        variant_of = indices // base
+        out = np.empty((len(indices),) + self.images.shape[1:], np.uint8)
+        for variant in np.unique(variant_of):
+            where = np.flatnonzero(variant_of == variant)
+            originals = self.images[indices[where] % base]
+            out[where] = self.variants[variant](originals, rng)
+        return out
+
+    def _labels(self, indices):
+        if self.labels is None:
+            return None
+        return np.asarray(self.labels)[indices % len(self.images)]
+
+    def batches(self, batch_size, shuffle=False, epoch=0):
+        """
+        Generate (images, labels) mini-batches over the whole dataset.
+
+        Parameters:
+            batch_size: number of items per batch (the last may be
+                smaller)
+            shuffle: visit the items in a random order
+            epoch: together with the seed, selects the order and the
+                random augmentations, so each epoch can differ while
+                staying reproducible
+
+        Yields:
+            (images, labels) tuples; labels is None without labels
+        """
+        order_rng = np.random.default_rng([self.seed, epoch])
+        if shuffle:
+            order = order_rng.permutation(len(self))
+        else:
+            order = np.arange(len(self))
+        for number, start in enumerate(range(0, len(self), batch_size)):
+            indices = order[start:start + batch_size]
+            rng = np.random.default_rng([self.seed, epoch, number])
+            yield self._apply(indices, rng), self._labels(indices)
+
+    def materialize(self, path, epoch=0, block_size=DEFAULT_BLOCK_SIZE):
+        """
+        Write the whole augmented set, in order, to a memory-mapped file.
+
+        The file is a `.npy` file with a uint8 array of `self.shape`,
+        computed block by block, so memory use stays at one block
+        whatever the size. Its content is the same as concatenating
+        `batches(block_size, shuffle=False, epoch=epoch)`.
+
+        Returns:
+            The data as a read-only np.memmap
+        """
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8,
+                                        shape=self.shape)
+        for number, start in enumerate(range(0, len(self), block_size)):
+            indices = np.arange(start, min(start + block_size, len(self)))
+            rng = np.random.default_rng([self.seed, epoch, number])
+            out[start:start + len(indices)] = self._apply(indices, rng)
+        out.flush()
+        del out
+        return np.load(path, mmap_mode="r")
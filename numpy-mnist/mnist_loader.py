@@ -0,0 +1,297 @@
+"""
+Load MNIST with NumPy only, without Keras or TensorFlow.
+
+The dataset is distributed as four gzipped files in the IDX format: a
+small header (magic number, element type, dimension sizes) followed by
+the raw uint8 pixels or labels. The first time, `load_data` downloads
+the archives (or takes them from a local directory or a Keras
+`mnist.npz` file), checks their MD5 checksums and decompresses them into
+a cache directory. After that, every load just maps the cached files
+into memory with `np.memmap`: no parsing, no copying and no network, so
+it takes a few milliseconds.
+
+Only the gzipped archives have published checksums. Data taken from a
+Keras `mnist.npz` file or from uncompressed IDX files in `source` is
+checked for the expected shapes and dtype (see `SHAPES`), but its
+content is not verified; use the archives when that matters.
+
+Usage:
+
+    from mnist_loader import load_data
+    (X_train, y_train), (X_test, y_test) = load_data()
+
+The arrays are copy-on-write memory maps: they can be modified in
+place, but the changes stay in memory and never reach the cached files.
+"""
+
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+MIRRORS = [
+    "https://ossci-datasets.s3.amazonaws.com/mnist/",
+    "https://storage.googleapis.com/cvdf-datasets/mnist/",
+]
+
+# Archive name and MD5 checksum of each part of the dataset
+FILES = {
+    "train_images": ("train-images-idx3-ubyte.gz",
+                     "f68b3c2dcbeaaa9fbdd348bbdeb94873"),
+    "train_labels": ("train-labels-idx1-ubyte.gz",
+                     "d53e105ee54ea40749a09fcbcd1e9432"),
+    "test_images": ("t10k-images-idx3-ubyte.gz",
+                    "9fb629c4189551a2d022fa330f9573f3"),
+    "test_labels": ("t10k-labels-idx1-ubyte.gz",
+                    "ec29112dd5afa0611ce80d1b7f02629c"),
+}
+
+# Shape of each part of the dataset; every part is uint8
+SHAPES = {
+    "train_images": (60000, 28, 28),
+    "train_labels": (60000,),
+    "test_images": (10000, 28, 28),
+    "test_labels": (10000,),
+}
+
+# Keras keeps the same data as a single .npz file
+KERAS_NPZ = Path.home() / ".keras" / "datasets" / "mnist.npz"
+KERAS_KEYS = {
+    "train_images": "x_train",
+    "train_labels": "y_train",
+    "test_images": "x_test",
+    "test_labels": "y_test",
+}
+
+# IDX element type codes
+IDX_TYPES = {
+    0x08: np.uint8,
+    0x09: np.int8,
+    0x0B: np.dtype(">i2"),
+    0x0C: np.dtype(">i4"),
+    0x0D: np.dtype(">f4"),
+    0x0E: np.dtype(">f8"),
+}
+
+
+def default_cache_dir():
+    """Cache directory: $MNIST_CACHE_DIR or ~/.cache/numpy-mnist."""
+    return Path(
+        os.environ.get("MNIST_CACHE_DIR",
+                       Path.home() / ".cache" / "numpy-mnist"))
+
+
+def parse_idx_header(header):
+    """
+    Parse the header of an IDX file.
+
+    Returns a tuple (dtype, shape, offset), where offset is the size of
+    the header in bytes, i.e. where the data starts.
+    """
+    if len(header) < 4 or header[0] != 0 or header[1] != 0:
+        raise ValueError("Not an IDX file (bad magic number)")
+    type_code, ndim = header[2], header[3]
+    if type_code not in IDX_TYPES:
+        raise ValueError(f"Unknown IDX element type: {type_code:#04x}")
+    offset = 4 + 4 * ndim
+    if len(header) < offset:
+        raise ValueError("Truncated IDX header")
+    shape = tuple(int.from_bytes(header[4 + 4 * i:8 + 4 * i], "big")
+                  for i in range(ndim))
+    return np.dtype(IDX_TYPES[type_code]), shape, offset
+
+
+def read_idx(path):
+    """
+    Read an IDX file into a NumPy array.
+
+    Uncompressed files are memory-mapped copy-on-write (writable, but
+    changes are never written back to the file); gzipped files (`.gz`)
+    are decompressed into memory.
+    """
+    path = Path(path)
+    if path.suffix == ".gz":
+        with gzip.open(path, "rb") as f:
+            data = f.read()
+        dtype, shape, offset = parse_idx_header(data)
+        return np.frombuffer(data, dtype, count=int(np.prod(shape)),
+                             offset=offset).reshape(shape)
+    with open(path, "rb") as f:
+        header = f.read(4 + 4 * 255)
+    dtype, shape, offset = parse_idx_header(header)
+    expected = offset + int(np.prod(shape)) * dtype.itemsize
+    if path.stat().st_size < expected:
+        raise ValueError(f"Truncated IDX file: {path}")
+    return np.memmap(path, dtype=dtype, mode="c", offset=offset, shape=shape)
+
+
+def write_idx(path, array):
+    """Write an array as an uncompressed IDX file."""
+    array = np.asarray(array)
+    big_endian = array.dtype.newbyteorder(">")
+    codes = [code for code, dtype in IDX_TYPES.items()
+             if np.dtype(dtype) == big_endian]
+    if not codes:
+        raise ValueError(f"Unsupported dtype for IDX: {array.dtype}")
+    code = codes[0]
+    with open(path, "wb") as f:
+        f.write(bytes([0, 0, code, array.ndim]))
+        for size in array.shape:
+            f.write(size.to_bytes(4, "big"))
+        f.write(np.ascontiguousarray(array, dtype=big_endian).tobytes())
+
+
+def md5sum(path, chunk_size=1 << 20):
+    """MD5 checksum of a file, as a hex string."""
+    digest = hashlib.md5(usedforsecurity=False)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cached_name(archive):
+    # train-images-idx3-ubyte.gz -> train-images-idx3-ubyte
+    return archive[:-len(".gz")]
+
+
+def _atomic_write(target, write):
+    # Write to a temporary file and rename it, so an interrupted run never
+    # leaves a partial file that looks complete
+    fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".part")
+    os.close(fd)
+    try:
+        write(Path(tmp))
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _verified(archive, checksum):
+    actual = md5sum(archive)
+    if actual != checksum:
+        raise ValueError(f"Checksum mismatch for {archive}: "
+                         f"expected {checksum}, got {actual}")
+    return archive
+
+
+def _download(archive, checksum, cache_dir):
+    import urllib.request  # Only needed on a cold cache; slow to import
+
+    target = cache_dir / archive
+    errors = []
+    for mirror in MIRRORS:
+        try:
+            _atomic_write(
+                target, lambda tmp: urllib.request.urlretrieve(
+                    mirror + archive, tmp))
+            return _verified(target, checksum)
+        except (OSError, ValueError) as exc:
+            target.unlink(missing_ok=True)
+            errors.append(f"{mirror}: {exc}")
+    raise OSError(f"Could not download {archive}:\n  " + "\n  ".join(errors))
+
+
+def _check_shape(name, array, origin):
+    # Unverified sources (no published checksum) must at least look right
+    if array.dtype != np.uint8 or array.shape != SHAPES[name]:
+        raise ValueError(f"Unexpected data for {name} in {origin}: "
+                         f"expected uint8 {SHAPES[name]}, got "
+                         f"{array.dtype} {array.shape}")
+    return array
+
+
+def _find_local(name, archive, checksum, source):
+    # A verified archive, or an uncompressed IDX file, in `source`
+    gz = source / archive
+    if gz.exists():
+        return _verified(gz, checksum)
+    raw = source / _cached_name(archive)
+    if raw.exists():
+        _check_shape(name, read_idx(raw), raw)  # Also checks the size
+        return raw
+    return None
+
+
+def _fill_cache(cache_dir, source, download):
+    missing = [name for name, (archive, _) in FILES.items()
+               if not (cache_dir / _cached_name(archive)).exists()]
+    if not missing:
+        return
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    npz = None
+    if source is not None and Path(source).suffix == ".npz":
+        npz = Path(source)
+    elif source is None and KERAS_NPZ.exists():
+        npz = KERAS_NPZ
+    if npz is not None:
+        with np.load(npz) as data:
+            for name in missing:
+                target = cache_dir / _cached_name(FILES[name][0])
+                array = _check_shape(name, data[KERAS_KEYS[name]], npz)
+                _atomic_write(target, lambda tmp: write_idx(tmp, array))
+        return
+
+    for name in missing:
+        archive, checksum = FILES[name]
+        found = None
+        if source is not None:
+            found = _find_local(name, archive, checksum, Path(source))
+        if found is None and (cache_dir / archive).exists():
+            found = _verified(cache_dir / archive, checksum)
+        if found is None:
+            if not download:
+                raise FileNotFoundError(
+                    f"{archive} not found in the cache ({cache_dir})"
+                    + (f" or in {source}" if source is not None else "")
+                    + " and download=False")
+            found = _download(archive, checksum, cache_dir)
+        target = cache_dir / _cached_name(archive)
+        if found.suffix == ".gz":
+            def extract(tmp, found=found):
+                with gzip.open(found, "rb") as src, open(tmp, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                read_idx(tmp)  # Checks the header and the size
+            _atomic_write(target, extract)
+        elif found != target:
+            _atomic_write(target, lambda tmp: shutil.copyfile(found, tmp))
+
+
+def load_data(source=None, cache_dir=None, download=True):
+    """
+    Load MNIST as ((X_train, y_train), (X_test, y_test)).
+
+    Same shapes and dtypes as `keras.datasets.mnist.load_data()`:
+    uint8 images of shape (N, 28, 28) and uint8 labels of shape (N,),
+    with N = 60000 for training and 10000 for test. The arrays are
+    copy-on-write memory maps of the cached files: writable, but changes
+    are never saved to the cache.
+
+    Parameters:
+        source: where to take the data from when the cache is empty:
+            a directory with the IDX files (gzipped or not), or a Keras
+            `mnist.npz` file. By default, Keras' own cache is used if it
+            exists (Keras verified it when downloading it), otherwise the
+            files are downloaded. Gzipped archives are checked against
+            their MD5 checksums; `.npz` and uncompressed IDX files only
+            against the expected shapes and dtype.
+        cache_dir: where the decompressed files are kept (default:
+            `default_cache_dir()`).
+        download: set to False to fail instead of using the network.
+    """
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    cache_dir = Path(cache_dir)
+    _fill_cache(cache_dir, source, download)
+    arrays = {
+        name: read_idx(cache_dir / _cached_name(archive))
+        for name, (archive, _) in FILES.items()
+    }
+    return ((arrays["train_images"], arrays["train_labels"]),
+            (arrays["test_images"], arrays["test_labels"]))
@@ -0,0 +1,154 @@
+"""
+Image transformations on whole batches of MNIST-like images.
+
+The notebook's `binarize_image`, `shift_image`, `find_limits` and
+`crop_image_limits` take one 28x28 image at a time, so transforming the
+training set costs 60000 Python calls. The functions here take a batch
+of shape (N, H, W) and do the same work with a few array operations:
+
+    binarize(images, threshold)   -> (N, H, W) array of 0 and 1
+    shift(images, dx, dy)         -> (N, H, W), per-image offsets allowed
+    find_limits(images)           -> (top, bottom, left, right) arrays
+    crop_resize(images, size)     -> (N, size, size) cropped digits
+
+Their results are identical to applying the per-image versions to each
+image (see `benchmark_transforms.py`, which compares both).
+`find_limits` and `crop_resize` work through large inputs in chunks, so
+memory maps can be transformed without loading them whole.
+"""
+
+import numpy as np
+
+CHUNK_SIZE = 8192
+
+
+def _as_batch(images):
+    images = np.asarray(images)
+    if images.ndim != 3:
+        raise ValueError(f"Expected a batch of shape (N, H, W), got "
+                         f"{images.shape}")
+    return images
+
+
+def _per_image(values, n):
+    # A scalar or one value per image, as an int array of length n
+    values = np.asarray(values, dtype=np.intp)
+    if values.ndim == 0:
+        return np.full(n, values)
+    if values.shape != (n,):
+        raise ValueError(f"Expected a scalar or {n} offsets, got "
+                         f"{values.shape}")
+    return values
+
+
+def binarize(images, threshold=128):
+    """1 where a pixel is greater than `threshold`, 0 elsewhere (uint8)."""
+    return (_as_batch(images) > threshold).astype(np.uint8)
+
+
+def shift(images, dx, dy):
+    """
+    Shift images `dx` pixels right and `dy` pixels down.
+
+    Negative values shift left and up; pixels moved out of the frame are
+    lost and the uncovered area is filled with zeros. `dx` and `dy` are
+    either numbers, applied to every image, or arrays with one offset
+    per image.
+    """
+    images = _as_batch(images)
+    n, height, width = images.shape
+    if np.ndim(dx) == 0 and np.ndim(dy) == 0:
+        return _shift_all(images, int(dx), int(dy))
+    # Offsets beyond the frame size all give a blank image
+    dx = np.clip(_per_image(dx, n), -width, width)
+    dy = np.clip(_per_image(dy, n), -height, height)
+    # Group the images by offset and shift each group with one slice
+    # assignment: there are few distinct offsets, and slicing is much
+    # faster than gathering every pixel through index arrays
+    key = (dy + height) * (2 * width + 1) + (dx + width)
+    order = np.argsort(key, kind="stable")
+    groups = np.split(order, np.flatnonzero(np.diff(key[order])) + 1)
+    out = np.empty_like(images)
+    for group in groups:
+        if len(group):
+            first = group[0]
+            out[group] = _shift_all(images[group], int(dx[first]),
+                                    int(dy[first]))
+    return out
+
+
+def _shift_all(images, dx, dy):
+    # Same offset for every image: a single slice assignment
+    n, height, width = images.shape
+    out = np.zeros_like(images)
+    if abs(dx) >= width or abs(dy) >= height:
+        return out
+    out[:, max(dy, 0):height + min(dy, 0), max(dx, 0):width + min(dx, 0)] = \
+        images[:, max(-dy, 0):height - max(dy, 0),
+               max(-dx, 0):width - max(dx, 0)]
+    return out
+
+
+def find_limits(images):
+    """
+    Bounding box of the non-zero pixels of each image.
+
+    Returns a tuple of four int arrays (top, bottom, left, right) with
+    the first and last non-zero row and column of each image. An image
+    with no ink gets the whole frame, (0, H - 1, 0, W - 1).
+    """
+    images = _as_batch(images)
+    n, height, width = images.shape
+    rows = np.empty((n, height), bool)
+    cols = np.empty((n, width), bool)
+    for start in range(0, n, CHUNK_SIZE):
+        chunk = images[start:start + CHUNK_SIZE]
+        rows[start:start + CHUNK_SIZE] = chunk.any(axis=2)
+        cols[start:start + CHUNK_SIZE] = chunk.any(axis=1)
+    # argmax gives the first True; on the reversed axis, the last one
+    top = rows.argmax(axis=1)
+    bottom = height - 1 - rows[:, ::-1].argmax(axis=1)
+    left = cols.argmax(axis=1)
+    right = width - 1 - cols[:, ::-1].argmax(axis=1)
+    empty = ~rows.any(axis=1)
+    top[empty], bottom[empty] = 0, height - 1
+    left[empty], right[empty] = 0, width - 1
+    return top, bottom, left, right
+
+
+def resize_indices(extent, size):
+    """
+    Source indices for nearest-neighbour resizing of `extent` pixels to
+    `size` pixels: the pixel under the center of each output pixel.
+
+    `extent` may be an array (one extent per image); the result then has
+    one row per image. Integer arithmetic keeps it exact.
+    """
+    extent = np.asarray(extent)
+    centers = 2 * np.arange(size) + 1
+    return (centers * extent[..., None]) // (2 * size)
+
+
+def crop_resize(images, size=20):
+    """
+    Crop each image to its bounding box and resize it to `size` x `size`.
+
+    Equivalent to cropping each image to `find_limits` and resizing the
+    crop with nearest-neighbour sampling (see `resize_indices`), but for
+    the whole batch at once.
+
+    Returns:
+        (N, size, size) array with the dtype of `images`
+    """
+    images = _as_batch(images)
+    n = images.shape[0]
+    top, bottom, left, right = find_limits(images)
+    rows = top[:, None] + resize_indices(bottom - top + 1, size)
+    cols = left[:, None] + resize_indices(right - left + 1, size)
+    out = np.empty((n, size, size), images.dtype)
+    for start in range(0, n, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, n)
+        out[start:stop] = images[start:stop][
+            np.arange(stop - start)[:, None, None],
+            rows[start:stop, :, None], cols[start:stop, None, :]]
+    return out
@@ -0,0 +1,115 @@
+"""
+Test suite for the lazy augmentation pipeline.
+
+Uses small synthetic "digits" (random blocks of ink on a blank frame),
+so no dataset is needed.
+"""
+
+import numpy as np
+import pytest
+
+from mnist_augment import (AugmentedDataset, Binarize, Crop, Noise,
+                           NOTEBOOK_VARIANTS, Pipeline, Shift)
+
+
+@pytest.fixture
+def digits():
+    """200 synthetic 28x28 uint8 images and their labels."""
+    rng = np.random.default_rng(0)
+    images = np.zeros((200, 28, 28), np.uint8)
+    for i, (top, left) in enumerate(rng.integers(2, 12, (200, 2))):
+        ink = rng.integers(1, 256, (14, 10))
+        images[i, top:top + 14, left:left + 10] = ink
+    labels = rng.integers(0, 10, 200).astype(np.uint8)
+    return images, labels
+
+
+def test_dataset_matches_notebook_layout(digits):
+    """Test the virtual dataset has the size and order of the concatenation."""
+    images, labels = digits
+    dataset = AugmentedDataset(images, labels, NOTEBOOK_VARIANTS, seed=0)
+
+    assert len(dataset) == 5 * len(images)
+    assert dataset.shape == (1000, 28, 28)
+
+    batches = list(dataset.batches(len(images)))
+    original, noisy, binarized, noisy_binarized, shifted = batches
+    assert np.array_equal(original[0], images)
+    assert all(np.array_equal(y, labels) for _, y in batches)
+    assert noisy[0].dtype == np.uint8
+    assert set(np.unique(binarized[0])) <= {0, 1}
+    assert set(np.unique(noisy_binarized[0])) <= {0, 1}
+    assert shifted[0].shape == images.shape
+
+
+def test_batches_are_reproducible(digits):
+    """Test the same seed and epoch give the same shuffled batches."""
+    images, labels = digits
+    first = AugmentedDataset(images, labels, seed=7)
+    second = AugmentedDataset(images, labels, seed=7)
+
+    for (xa, ya), (xb, yb) in zip(first.batches(64, shuffle=True, epoch=1),
+                                  second.batches(64, shuffle=True, epoch=1)):
+        assert np.array_equal(xa, xb)
+        assert np.array_equal(ya, yb)
+
+    other_epoch = next(first.batches(64, shuffle=True, epoch=2))
+    assert not np.array_equal(other_epoch[0],
+                              next(first.batches(64, shuffle=True,
+                                                 epoch=1))[0])
+
+
+def test_shift_keeps_digit_visible(digits):
+    """Test random shifts move the digit without cutting it."""
+    images, _ = digits
+    rng = np.random.default_rng(0)
+
+    shifted = Shift(max_shift=10)(images, rng)
+
+    totals = images.reshape(len(images), -1).sum(axis=1, dtype=np.int64)
+    assert np.array_equal(
+        shifted.reshape(len(images), -1).sum(axis=1, dtype=np.int64), totals)
+    assert not np.array_equal(shifted, images)
+
+
+def test_crop_centers_digit(digits):
+    """Test cropping resizes every digit to a centered size x size box."""
+    images, _ = digits
+    cropped = Crop(size=20)(images, np.random.default_rng(0))
+
+    assert cropped.shape == images.shape
+    assert not cropped[:, :4].any() and not cropped[:, 24:].any()
+    assert not cropped[:, :, :4].any() and not cropped[:, :, 24:].any()
+
+
+def test_crop_larger_than_frame_fails_clearly(digits):
+    """Test a crop size that does not fit the frame raises ValueError."""
+    images, _ = digits
+    with pytest.raises(ValueError, match="does not fit"):
+        Crop(size=30)(images, np.random.default_rng(0))
+
+
+def test_noise_and_binarize_ranges(digits):
+    """Test noise stays in [0, 255] and binarization gives 0 or 1."""
+    images, _ = digits
+    pipeline = Pipeline(Noise(sigma=50), Binarize(threshold=128))
+
+    noisy = Noise(sigma=50)(images, np.random.default_rng(0))
+    binary = pipeline(images, np.random.default_rng(0))
+
+    assert noisy.dtype == np.uint8
+    assert not np.array_equal(noisy, images)
+    assert set(np.unique(binary)) <= {0, 1}
+
+
+def test_materialize_matches_batches(digits, tmp_path):
+    """Test materializing writes exactly the lazily generated batches."""
+    images, labels = digits
+    dataset = AugmentedDataset(images, labels, seed=3)
+
+    stored = dataset.materialize(tmp_path / "augmented.npy", block_size=128)
+
+    assert isinstance(stored, np.memmap)
+    assert stored.shape == dataset.shape
+    expected = np.concatenate([x for x, _ in dataset.batches(128)])
+    assert np.array_equal(stored, expected)
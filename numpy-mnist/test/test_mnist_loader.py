@@ -0,0 +1,152 @@
+"""
+Test suite for the NumPy-only MNIST loader.
+
+The tests build small fake datasets in the IDX format, so they run
+offline and do not need the real MNIST files.
+"""
+
+import gzip
+
+import numpy as np
+import pytest
+
+import mnist_loader
+
+
+@pytest.fixture
+def fake_mnist(tmp_path, monkeypatch):
+    """A directory with small gzipped IDX files and matching checksums."""
+    rng = np.random.default_rng(0)
+    arrays = {
+        "train_images": rng.integers(0, 256, (60, 28, 28), dtype=np.uint8),
+        "train_labels": rng.integers(0, 10, 60, dtype=np.uint8),
+        "test_images": rng.integers(0, 256, (10, 28, 28), dtype=np.uint8),
+        "test_labels": rng.integers(0, 10, 10, dtype=np.uint8),
+    }
+    source = tmp_path / "source"
+    source.mkdir()
+    files = {}
+    for name, (archive, _) in mnist_loader.FILES.items():
+        raw = tmp_path / "raw"
+        mnist_loader.write_idx(raw, arrays[name])
+        with gzip.open(source / archive, "wb") as f:
+            f.write(raw.read_bytes())
+        files[name] = (archive, mnist_loader.md5sum(source / archive))
+    monkeypatch.setattr(mnist_loader, "FILES", files)
+    monkeypatch.setattr(mnist_loader, "SHAPES",
+                        {name: array.shape for name, array in arrays.items()})
+    monkeypatch.setattr(mnist_loader, "KERAS_NPZ", tmp_path / "missing.npz")
+    return source, arrays
+
+
+def test_idx_round_trip(tmp_path):
+    """Test write_idx and read_idx preserve dtype, shape and values."""
+    for dtype in [np.uint8, np.int16, np.float32]:
+        array = np.arange(24, dtype=dtype).reshape(2, 3, 4)
+        mnist_loader.write_idx(tmp_path / "a", array)
+        result = mnist_loader.read_idx(tmp_path / "a")
+        assert result.dtype.type is np.dtype(dtype).type
+        assert result.shape == (2, 3, 4)
+        assert np.array_equal(result, array)
+
+
+def test_read_idx_rejects_bad_files(tmp_path):
+    """Test that non-IDX and truncated files raise ValueError."""
+    (tmp_path / "bad").write_bytes(b"\x01\x02\x08\x01")
+    with pytest.raises(ValueError):
+        mnist_loader.read_idx(tmp_path / "bad")
+
+    mnist_loader.write_idx(tmp_path / "short", np.zeros((10, 5), np.uint8))
+    data = (tmp_path / "short").read_bytes()
+    (tmp_path / "short").write_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        mnist_loader.read_idx(tmp_path / "short")
+
+
+def test_load_data_from_local_files(fake_mnist, tmp_path):
+    """Test loading offline from a directory fills the cache with memmaps."""
+    source, arrays = fake_mnist
+    cache = tmp_path / "cache"
+
+    (X_train, y_train), (X_test, y_test) = mnist_loader.load_data(
+        source, cache, download=False)
+
+    assert isinstance(X_train, np.memmap)
+    assert X_train.dtype == np.uint8
+    assert np.array_equal(X_train, arrays["train_images"])
+    assert np.array_equal(y_train, arrays["train_labels"])
+    assert np.array_equal(X_test, arrays["test_images"])
+    assert np.array_equal(y_test, arrays["test_labels"])
+
+    # Once cached, no source is needed
+    (X_train, _), _ = mnist_loader.load_data(cache_dir=cache, download=False)
+    assert np.array_equal(X_train, arrays["train_images"])
+
+
+def test_loaded_arrays_are_copy_on_write(fake_mnist, tmp_path):
+    """Test the arrays are writable without changing the cached files."""
+    source, arrays = fake_mnist
+    cache = tmp_path / "cache"
+    (X_train, _), _ = mnist_loader.load_data(source, cache, download=False)
+
+    X_train[0] = 0
+    del X_train
+
+    (X_train, _), _ = mnist_loader.load_data(cache_dir=cache, download=False)
+    assert np.array_equal(X_train, arrays["train_images"])
+
+
+def test_load_data_checks_checksums(fake_mnist, tmp_path, monkeypatch):
+    """Test that a corrupted archive is rejected."""
+    source, _ = fake_mnist
+    archive, _ = mnist_loader.FILES["train_labels"]
+    files = dict(mnist_loader.FILES, train_labels=(archive, "0" * 32))
+    monkeypatch.setattr(mnist_loader, "FILES", files)
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        mnist_loader.load_data(source, tmp_path / "cache", download=False)
+
+
+def test_load_data_from_keras_npz(fake_mnist, tmp_path):
+    """Test loading offline from a Keras mnist.npz file."""
+    _, arrays = fake_mnist
+    npz = tmp_path / "mnist.npz"
+    np.savez(npz,
+             x_train=arrays["train_images"],
+             y_train=arrays["train_labels"],
+             x_test=arrays["test_images"],
+             y_test=arrays["test_labels"])
+
+    (X_train, _), (_, y_test) = mnist_loader.load_data(
+        npz, tmp_path / "cache", download=False)
+
+    assert np.array_equal(X_train, arrays["train_images"])
+    assert np.array_equal(y_test, arrays["test_labels"])
+
+
+def test_unverified_sources_must_have_mnist_shapes(fake_mnist, tmp_path):
+    """Test .npz and raw IDX sources with the wrong shape are rejected."""
+    _, arrays = fake_mnist
+    npz = tmp_path / "mnist.npz"
+    np.savez(npz,
+             x_train=arrays["train_images"][:5],
+             y_train=arrays["train_labels"],
+             x_test=arrays["test_images"],
+             y_test=arrays["test_labels"])
+    with pytest.raises(ValueError, match="train_images"):
+        mnist_loader.load_data(npz, tmp_path / "cache", download=False)
+
+    raw = tmp_path / "raw-source"
+    raw.mkdir()
+    for name, (archive, _) in mnist_loader.FILES.items():
+        mnist_loader.write_idx(raw / archive[:-len(".gz")],
+                               arrays[name].astype(np.int16))
+    with pytest.raises(ValueError, match="expected uint8"):
+        mnist_loader.load_data(raw, tmp_path / "cache2", download=False)
+
+
+def test_load_data_offline_without_files(fake_mnist, tmp_path):
+    """Test that a missing dataset fails clearly when download=False."""
+    with pytest.raises(FileNotFoundError):
+        mnist_loader.load_data(tmp_path / "empty", tmp_path / "cache",
+                               download=False)
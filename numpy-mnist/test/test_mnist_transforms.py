@@ -0,0 +1,85 @@
+"""
+Test suite for the batched image transformations.
+
+Each batched function must give exactly the same result as the
+per-image version (from benchmark_transforms) applied image by image.
+"""
+
+import numpy as np
+import pytest
+
+import mnist_transforms
+from benchmark_transforms import (binarize_image, crop_image_limits,
+                                  find_limits, resize_image, shift_image,
+                                  synthetic_digits)
+
+
+@pytest.fixture
+def images():
+    """300 synthetic 28x28 digits of varied size and position."""
+    return synthetic_digits(300, seed=1)
+
+
+def test_binarize_matches_per_image(images):
+    """Test batched binarization equals per-image binarization."""
+    for threshold in [80, 128, 180]:
+        expected = np.stack([binarize_image(image, threshold)
+                             for image in images])
+        result = mnist_transforms.binarize(images, threshold)
+        assert result.dtype == np.uint8
+        assert np.array_equal(result, expected)
+
+
+def test_shift_matches_per_image(images):
+    """Test shifting by one offset and by per-image offsets."""
+    for dx, dy in [(10, 0), (0, 10), (-10, 0), (0, -10), (3, -4), (0, 0)]:
+        expected = np.stack([shift_image(image, dx, dy) for image in images])
+        assert np.array_equal(mnist_transforms.shift(images, dx, dy),
+                              expected)
+
+    rng = np.random.default_rng(0)
+    dx = rng.integers(-30, 31, len(images))
+    dy = rng.integers(-30, 31, len(images))
+    expected = np.stack([shift_image(image, int(x), int(y))
+                         for image, x, y in zip(images, dx, dy)])
+    assert np.array_equal(mnist_transforms.shift(images, dx, dy), expected)
+
+
+def test_shift_rejects_wrong_offsets(images):
+    """Test that offset arrays must have one value per image."""
+    with pytest.raises(ValueError):
+        mnist_transforms.shift(images, np.zeros(3, int), 0)
+    with pytest.raises(ValueError):
+        mnist_transforms.shift(images[0], 1, 1)
+
+
+def test_find_limits_matches_per_image(images):
+    """Test batched bounding boxes equal per-image find_limits."""
+    top, bottom, left, right = mnist_transforms.find_limits(images)
+    expected = np.array([find_limits(image) for image in images])
+
+    assert np.array_equal(np.stack([top, bottom, left, right], axis=1),
+                          expected)
+
+
+def test_find_limits_of_empty_image():
+    """Test an image without ink gets the whole frame."""
+    limits = mnist_transforms.find_limits(np.zeros((1, 28, 28), np.uint8))
+    assert [int(value[0]) for value in limits] == [0, 27, 0, 27]
+
+
+def test_crop_resize_matches_per_image(images):
+    """Test batched crop-and-resize equals cropping and resizing each image."""
+    for size in [20, 28, 8]:
+        expected = np.stack([resize_image(crop_image_limits(image), size)
+                             for image in images])
+        result = mnist_transforms.crop_resize(images, size)
+        assert result.shape == (len(images), size, size)
+        assert np.array_equal(result, expected)
+
+
+def test_chunked_processing(images, monkeypatch):
+    """Test results do not depend on the chunk size."""
+    expected = mnist_transforms.crop_resize(images, 20)
+    monkeypatch.setattr(mnist_transforms, "CHUNK_SIZE", 7)
+    assert np.array_equal(mnist_transforms.crop_resize(images, 20), expected)